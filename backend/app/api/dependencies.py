@@ -1,16 +1,111 @@
 """
 Common dependencies for API routes
 """
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.config import settings
+from app.core.admission import admission_controllers
+from app.core.database import get_db, get_async_session
+from app.core.replicas import bind_user
+from app.core.exceptions import AuthenticationException, AuthorizationException
+from app.models.user import UserRole
+from app.services.auth_service import AuthService
+from app.services.revocation import revocation_list
+from app.services.user_cache import UserSnapshot
+from app.utils.jwt_utils import decode_access_token
+
+bearer_scheme = HTTPBearer(auto_error=False)
 
 
 def get_db_session() -> Generator[Session, None, None]:
-    """Get database session dependency"""
-    yield from get_db()
+    """
+    Get database session dependency
+    
+    Raises:
+        ServiceUnavailableException: If the connection pool is saturated
+    """
+    if not settings.DB_ADMISSION_ENABLED:
+        yield from get_db()
+        return
+    
+    with admission_controllers["sync"].admit():
+        yield from get_db()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session dependency
+    
+    Raises:
+        ServiceUnavailableException: If the connection pool is saturated
+    """
+    if not settings.DB_ADMISSION_ENABLED:
+        async for db in get_async_session():
+            yield db
+        return
+    
+    with admission_controllers["async"].admit():
+        async for db in get_async_session():
+            yield db
+
+
+def get_token_payload(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Dict[str, Any]:
+    """
+    Get the verified claims of the bearer access token
+    
+    Raises:
+        AuthenticationException: If the token is missing, invalid or revoked
+    """
+    if credentials is None:
+        raise AuthenticationException("Not authenticated")
+    
+    payload = decode_access_token(credentials.credentials)
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise AuthenticationException("Token has been revoked")
+    
+    return payload
+
+
+def get_current_user(
+    payload: Dict[str, Any] = Depends(get_token_payload),
+    db: Session = Depends(get_db_session)
+) -> UserSnapshot:
+    """
+    Get the authenticated user from the bearer token
+    
+    Raises:
+        AuthenticationException: If the token is missing, invalid or revoked,
+            or the user no longer exists or is inactive
+    """
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise AuthenticationException("Invalid token subject")
+    
+    # Reads stay on the primary for a user who just wrote
+    bind_user(db, user_id, payload.get("iat"))
+    
+    user = AuthService.get_user_by_id(db, user_id)
+    if not user or not user.is_active:
+        raise AuthenticationException("User not found or inactive")
+    
+    return user
 
 
-# Add more dependencies as needed
-# Example: get_current_user, verify_token, etc.
+def get_current_admin(
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
+    """
+    Get the authenticated user and require the admin role
+    
+    Raises:
+        AuthorizationException: If the user is not an admin
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise AuthorizationException("Admin access required")
+    return current_user
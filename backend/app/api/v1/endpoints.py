@@ -2,7 +2,7 @@
 API v1 router that combines all route modules
 """
 from fastapi import APIRouter
-from .routes import health, auth
+from .routes import health, metrics, auth, admin
 
 api_router = APIRouter()
 
@@ -13,11 +13,23 @@ api_router.include_router(
     tags=["Health"]
 )
 
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
 api_router.include_router(
     auth.router,
     prefix="/auth",
     tags=["Authentication"]
 )
 
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["Admin"]
+)
+
 # Add more routers as you create them
 # api_router.include_router(users.router, prefix="/users", tags=["Users"])
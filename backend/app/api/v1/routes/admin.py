@@ -0,0 +1,48 @@
+"""
+Administrative routes
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from app.api.dependencies import get_current_admin
+from app.models.user import User
+from app.schemas.auth import UserResponse
+from app.services.base_service import BaseService
+from app.services.export_service import EXPORT_FORMATS, stream_export
+from app.services.user_cache import UserSnapshot
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+user_service = BaseService(User)
+
+# Export the same public fields as the API, never the password hash
+USER_EXPORT_FIELDS = list(UserResponse.model_fields)
+
+
+@router.get(
+    "/users/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export users",
+    description="Stream all users as NDJSON or CSV",
+    response_class=StreamingResponse,
+)
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    role: Optional[str] = Query(None, pattern="^(student|mentor|admin)$"),
+    admin: UserSnapshot = Depends(get_current_admin)
+):
+    """
+    Export users incrementally with constant memory
+    
+    - **format**: `ndjson` (default) or `csv`
+    - **role**: Optional role filter
+    """
+    logger.info("User export (%s) requested by admin %s", format, admin.id)
+    filters = {"role": role} if role else None
+    return StreamingResponse(
+        stream_export(user_service, USER_EXPORT_FIELDS, format, filters=filters),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
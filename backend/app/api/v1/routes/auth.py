@@ -1,13 +1,17 @@
 """
-Authentication routes for signup and login
+Authentication routes for signup, login, token refresh and logout
 """
-from fastapi import APIRouter, Depends, status
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.orm import Session
-from app.api.dependencies import get_db_session
-from app.schemas.auth import SignUpRequest, LoginRequest, AuthResponse, UserResponse
+from app.api.dependencies import get_db_session, get_current_user, get_token_payload
+from app.schemas.auth import SignUpRequest, LoginRequest, AuthResponse, UserResponse, TokenRefreshRequest, TokenResponse, LogoutRequest
 from app.schemas.base_schema import ResponseSchema
+from app.core.responses import SchemaResponse
+from app.services.user_cache import UserSnapshot
 from app.services.auth_service import AuthService
-from app.core.exceptions import AuthenticationException, ValidationException
+from app.core.exceptions import AuthenticationException, ValidationException, TooManyRequestsException
+from app.core.rate_limit import get_client_ip, login_limiter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,10 +41,10 @@ async def signup(
     """
     try:
         # Create user
-        user = auth_service.create_user(db, signup_data)
+        user = await auth_service.create_user(db, signup_data)
         
         # Generate tokens
-        tokens = auth_service.generate_tokens(user)
+        tokens = auth_service.generate_tokens(db, user)
         
         # Prepare response
         user_response = UserResponse.model_validate(user)
@@ -50,19 +54,22 @@ async def signup(
             message="Account created successfully"
         )
         
-        logger.info(f"New user registered: {user.email}")
+        logger.info("New user registered: %s", user.email)
         
-        return ResponseSchema(
-            success=True,
-            message="Account created successfully",
-            data=auth_response
+        return SchemaResponse(
+            ResponseSchema(
+                success=True,
+                message="Account created successfully",
+                data=auth_response
+            ),
+            status_code=status.HTTP_201_CREATED
         )
         
     except ValidationException as e:
-        logger.warning(f"Signup validation error: {str(e)}")
+        logger.warning("Signup validation error: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Signup error: {str(e)}")
+        logger.error("Signup error: %s", e)
         raise
 
 
@@ -71,10 +78,12 @@ async def signup(
     response_model=ResponseSchema[AuthResponse],
     status_code=status.HTTP_200_OK,
     summary="User login",
-    description="Authenticate user and get access tokens"
+    description="Authenticate user and get access tokens",
+    responses={429: {"description": "Too many login attempts"}}
 )
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: Session = Depends(get_db_session)
 ):
     """
@@ -83,17 +92,23 @@ async def login(
     - **email**: User's email address
     - **password**: User's password
     
-    Returns user data and JWT tokens
+    Returns user data and JWT tokens. Repeated attempts per email or client IP
+    are throttled with 429 and a Retry-After header.
     """
     try:
+        # Throttle before spending a bcrypt round on the attempt
+        login_limiter.check(login_data.email, get_client_ip(request))
+        
         # Authenticate user
-        user = auth_service.authenticate_user(db, login_data)
+        user = await auth_service.authenticate_user(db, login_data)
         
         if not user:
             raise AuthenticationException("Invalid email or password")
         
+        login_limiter.reset(login_data.email)
+        
         # Generate tokens
-        tokens = auth_service.generate_tokens(user)
+        tokens = auth_service.generate_tokens(db, user)
         
         # Prepare response
         user_response = UserResponse.model_validate(user)
@@ -103,22 +118,95 @@ async def login(
             message="Login successful"
         )
         
-        logger.info(f"User logged in: {user.email}")
+        logger.info("User logged in: %s", user.email)
         
-        return ResponseSchema(
-            success=True,
-            message="Login successful",
-            data=auth_response
+        return SchemaResponse(
+            ResponseSchema(
+                success=True,
+                message="Login successful",
+                data=auth_response
+            ),
+            status_code=status.HTTP_200_OK
         )
         
     except AuthenticationException as e:
-        logger.warning(f"Login failed: {str(e)}")
+        logger.warning("Login failed: %s", e)
+        raise
+    except TooManyRequestsException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", e)
+        raise
+
+
+@router.post(
+    "/refresh",
+    response_model=ResponseSchema[TokenResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Refresh tokens",
+    description="Exchange a refresh token for a new access and refresh token pair",
+    responses={401: {"description": "Refresh token invalid, expired, revoked or reused"}}
+)
+async def refresh_tokens(
+    refresh_data: TokenRefreshRequest,
+    db: Session = Depends(get_db_session)
+):
+    """
+    Rotate a refresh token
+    
+    - **refresh_token**: Refresh token from login, signup or a previous refresh
+    
+    Each refresh token can be used once. Reusing a spent token revokes every
+    token descended from the same login.
+    """
+    try:
+        tokens = auth_service.refresh_tokens(db, refresh_data.refresh_token)
+        
+        return SchemaResponse(
+            ResponseSchema(
+                success=True,
+                message="Tokens refreshed",
+                data=tokens
+            ),
+            status_code=status.HTTP_200_OK
+        )
+        
+    except AuthenticationException as e:
+        logger.warning("Token refresh failed: %s", e)
         raise
 
 
+@router.post(
+    "/logout",
+    response_model=ResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Logout",
+    description="Revoke the current access token and, if given, its refresh token"
+)
+async def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    payload: Dict[str, Any] = Depends(get_token_payload),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Logout the current session
+    
+    - **refresh_token**: Optional refresh token of the same login to revoke as well
+    
+    The access token is rejected from then on, on every worker within
+    REVOCATION_SYNC_INTERVAL seconds.
+    """
+    auth_service.logout(db, payload, logout_data.refresh_token if logout_data else None)
+    
+    return SchemaResponse(
+        ResponseSchema(
+            success=True,
+            message="Logged out"
+        ),
+        status_code=status.HTTP_200_OK
+    )
+
+
 @router.get(
     "/me",
     response_model=ResponseSchema[UserResponse],
@@ -127,17 +215,18 @@ async def login(
     description="Get current authenticated user information"
 )
 async def get_current_user_info(
-    db: Session = Depends(get_db_session)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Get current user information
     
-    Note: This endpoint will require authentication middleware
-    which we'll add in the next step
+    Requires a valid access token in the `Authorization: Bearer` header
     """
-    # TODO: Add authentication dependency to get current user from token
-    return ResponseSchema(
-        success=True,
-        message="User information retrieved",
-        data=None
+    return SchemaResponse(
+        ResponseSchema(
+            success=True,
+            message="User information retrieved",
+            data=UserResponse.model_validate(current_user)
+        ),
+        status_code=status.HTTP_200_OK
     )
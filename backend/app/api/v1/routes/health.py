@@ -1,12 +1,18 @@
 """
 Health check routes
+
+Database status comes from the background health probe, so these endpoints
+never touch the database themselves.
 """
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.api.dependencies import get_db_session
+from fastapi import APIRouter, status
+from app.config import settings
 from app.schemas.base_schema import ResponseSchema
-from app.core.exceptions import DatabaseException
+from app.core.responses import SchemaResponse
+from app.core.admission import admission_controllers
+from app.core.database import get_pool_status, replicas
+from app.core.exceptions import DatabaseException, ServiceUnavailableException
+from app.core.health_probe import STATUS_CONNECTED, health_probe
+from app.services.revocation import revocation_list
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,10 +29,65 @@ router = APIRouter()
 )
 async def health_check():
     """Basic health check endpoint"""
-    return ResponseSchema(
-        success=True,
-        message="API is healthy",
-        data={"status": "ok"}
+    return SchemaResponse(
+        ResponseSchema(
+            success=True,
+            message="API is healthy",
+            data={"status": "ok"}
+        ),
+        status_code=status.HTTP_200_OK
+    )
+
+
+@router.get(
+    "/live",
+    response_model=ResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Liveness probe",
+    description="Check that the process is serving requests (no I/O)"
+)
+async def liveness_check():
+    """Liveness endpoint for orchestrator probes"""
+    return SchemaResponse(
+        ResponseSchema(
+            success=True,
+            message="API is alive",
+            data={"status": "ok"}
+        ),
+        status_code=status.HTTP_200_OK
+    )
+
+
+@router.get(
+    "/ready",
+    response_model=ResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Readiness probe",
+    description="Check that the last database probe succeeded recently",
+    responses={503: {"description": "Database unavailable or probe result stale"}}
+)
+async def readiness_check():
+    """
+    Readiness endpoint for load balancer probes
+    
+    Raises:
+        ServiceUnavailableException: If the last probe failed or is too old
+    """
+    result = health_probe.result
+    if not health_probe.ready:
+        raise ServiceUnavailableException(
+            "API is not ready",
+            details=result.as_dict(),
+            retry_after=max(1, int(health_probe.interval))
+        )
+    
+    return SchemaResponse(
+        ResponseSchema(
+            success=True,
+            message="API is ready",
+            data=result.as_dict()
+        ),
+        status_code=status.HTTP_200_OK
     )
 
 
@@ -35,34 +96,36 @@ async def health_check():
     response_model=ResponseSchema,
     status_code=status.HTTP_200_OK,
     summary="Database health check",
-    description="Check database connectivity and version"
+    description="Database connectivity and version from the last background probe"
 )
-async def database_health_check(db: Session = Depends(get_db_session)):
+async def database_health_check():
     """
     Database health check endpoint
-    Tests connection and retrieves database version
+    Reports the latest probe result and its age
+    
+    Raises:
+        DatabaseException: If the last probe failed
     """
-    try:
-        # Execute a simple query to check database connection
-        result = db.execute(text("SELECT version();"))
-        version = result.scalar()
-        
-        logger.info("Database health check successful")
-        
-        return ResponseSchema(
+    result = health_probe.result
+    if result.status != STATUS_CONNECTED:
+        raise DatabaseException(
+            message="Database connection failed",
+            details=result.as_dict()
+        )
+    
+    return SchemaResponse(
+        ResponseSchema(
             success=True,
             message="Database connection successful",
             data={
-                "status": "connected",
-                "database_version": version
+                "status": result.status,
+                "database_version": result.version,
+                "latency_ms": result.latency_ms,
+                "age_seconds": round(result.age, 3)
             }
-        )
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
-        raise DatabaseException(
-            message="Database connection failed",
-            details=str(e)
-        )
+        ),
+        status_code=status.HTTP_200_OK
+    )
 
 
 @router.get(
@@ -72,40 +135,42 @@ async def database_health_check(db: Session = Depends(get_db_session)):
     summary="Detailed health check",
     description="Comprehensive system health information"
 )
-async def detailed_health_check(db: Session = Depends(get_db_session)):
-    """Detailed health check with system information"""
-    try:
-        # Check database
-        result = db.execute(text("SELECT version();"))
-        db_version = result.scalar()
-        
-        # Get database statistics
-        stats_result = db.execute(text("""
-            SELECT 
-                COUNT(*) as connection_count 
-            FROM pg_stat_activity 
-            WHERE datname = current_database();
-        """))
-        connection_count = stats_result.scalar()
-        
-        return ResponseSchema(
+async def detailed_health_check():
+    """
+    Detailed health check with probe result and connection pool statistics
+    
+    Raises:
+        DatabaseException: If the last probe failed
+    """
+    result = health_probe.result
+    if result.status != STATUS_CONNECTED:
+        raise DatabaseException(
+            message="Health check failed",
+            details=result.as_dict()
+        )
+    
+    pools = get_pool_status()
+    for label, pool in pools.items():
+        # Replica pools are admitted through the sync engine's controller
+        controller = admission_controllers.get(label)
+        if controller is not None:
+            pool["in_flight_requests"] = controller.in_flight
+            pool["avg_wait_ms"] = round(controller.avg_wait * 1000, 2)
+    
+    return SchemaResponse(
+        ResponseSchema(
             success=True,
             message="System is healthy",
             data={
                 "api": {
                     "status": "ok",
-                    "version": "1.0.0"
+                    "version": settings.VERSION
                 },
-                "database": {
-                    "status": "connected",
-                    "version": db_version,
-                    "active_connections": connection_count
-                }
+                "database": result.as_dict(),
+                "pools": pools,
+                "replicas": replicas.status(),
+                "token_revocation": revocation_list.stats()
             }
-        )
-    except Exception as e:
-        logger.error(f"Detailed health check failed: {str(e)}")
-        raise DatabaseException(
-            message="Health check failed",
-            details=str(e)
-        )
+        ),
+        status_code=status.HTTP_200_OK
+    )
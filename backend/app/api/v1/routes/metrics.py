@@ -0,0 +1,22 @@
+"""
+Metrics routes
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import registry
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format (charset is appended)
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get(
+    "",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+    description="Request, connection pool and crypto metrics in the Prometheus text format"
+)
+async def metrics():
+    """Metrics endpoint for Prometheus scraping"""
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -2,7 +2,8 @@
 Application settings and configuration
 """
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -18,10 +19,41 @@ class Settings(BaseSettings):
     
     # Database Settings
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL when unset
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
+    DB_BULK_CHUNK_SIZE: int = 1000  # Rows per statement/transaction in bulk operations
+    DB_SERVER_TIMING: bool = True  # Report per-request DB work in a Server-Timing header
+    DB_N_PLUS_ONE_THRESHOLD: int = 0  # Warn when one statement repeats this often per request (0 disables)
+    DB_MAX_CONNECTIONS: Optional[int] = None  # Connections all workers of one instance may open; overrides DB_POOL_SIZE/DB_MAX_OVERFLOW
+    DB_ASYNC_POOL_SHARE: float = 0.2  # Part of each worker's DB_MAX_CONNECTIONS share given to the async engine (at least 1)
+    DB_AUTO_INIT: bool = False  # Create missing tables on startup instead of via `python -m app.manage init-db`
+    
+    # Read Replica Settings
+    DATABASE_REPLICA_URLS: list = []  # Read-only replicas for service reads, primary only when empty
+    REPLICA_STICKY_WINDOW: float = 5.0  # Seconds a user's reads stay on the primary after they write
+    REPLICA_EJECT_SECONDS: float = 30.0  # Seconds a replica is skipped after a connection error
+    
+    # Admission Control Settings
+    DB_ADMISSION_ENABLED: bool = True
+    DB_ADMISSION_MAX_QUEUE: int = 10  # Requests allowed to wait for a connection once the pool is exhausted
+    DB_ADMISSION_WAIT_BUDGET: float = 0.5  # Seconds of average pool wait before new requests are shed
+    
+    # Health Probe Settings
+    HEALTH_PROBE_INTERVAL: float = 5.0  # Seconds between background database probes
+    HEALTH_PROBE_TIMEOUT: float = 2.0
+    HEALTH_PROBE_MAX_AGE: float = 15.0  # Seconds before a probe result is too stale to report ready
+    
+    # Cache Settings
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: int = 60  # Seconds
+    
+    # Count Settings
+    DB_COUNT_STRATEGY: str = "exact"  # exact, estimated or cached
+    DB_COUNT_CACHE_SIZE: int = 1024
+    DB_COUNT_CACHE_TTL: int = 60  # Seconds before a cached total is recomputed
     
     # CORS Settings
     CORS_ORIGINS: list = ["*"]
@@ -33,11 +65,106 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
+    WEB_CONCURRENCY: int = 1  # Worker processes run by `python -m app.serve`
+    WORKER_MAX_REQUESTS: int = 10000  # Replace a worker after this many requests (0 disables)
+    WORKER_MAX_REQUESTS_JITTER: int = 1000  # Spread replacements so workers don't restart together
+    WORKER_TIMEOUT: int = 60  # Seconds a worker may stay unresponsive before it is killed
+    WORKER_GRACEFUL_TIMEOUT: int = 30  # Seconds to finish in-flight requests on shutdown or replacement
+    WORKER_KEEPALIVE: int = 5  # Seconds to hold idle keep-alive connections
+    
+    # Logging Settings
+    LOG_JSON: bool = False
+    LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_FILE_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_RATE_LIMITS: dict = {}  # Logger name -> max INFO/DEBUG records per second
+    LOG_SAMPLE_RATES: dict = {}  # Logger name -> fraction of INFO/DEBUG records kept
     
     # Security Settings
     SECRET_KEY: str = "your-secret-key-change-in-production-min-32-characters-long"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS256/HS384/HS512 (SECRET_KEY), ES256 or EdDSA (PEM keys below)
+    JWT_PRIVATE_KEY: Optional[str] = None  # PEM private key for ES256/EdDSA signing
+    JWT_PUBLIC_KEY: Optional[str] = None  # PEM public key, derived from the private key when unset
+    JWT_KEY_ID: Optional[str] = None  # kid of the signing key, defaults to its JWK thumbprint
+    JWT_VERIFICATION_KEYS: dict = {}  # kid -> PEM public key still accepted (previous/next keys in a rotation)
+    JWKS_CACHE_MAX_AGE: int = 300  # Seconds clients may cache /.well-known/jwks.json
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_CACHE_SIZE: int = 100000  # Recently spent refresh tokens remembered for reuse detection
+    TOKEN_CACHE_SIZE: int = 10000  # Verified access tokens kept in memory
+    TOKEN_CACHE_TTL: int = 300  # Seconds, never beyond the token's own expiry
+    
+    # Token Revocation Settings
+    REVOCATION_BLOOM_CAPACITY: int = 100000  # Revocations before the filter is resized
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_SYNC_INTERVAL: float = 5.0  # Seconds before other workers' revocations apply here
+    
+    # Rate Limit Settings
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_PER_IP: int = 50
+    LOGIN_RATE_LIMIT_WINDOW: int = 60  # Seconds
+    TRUSTED_PROXY_COUNT: int = 0  # Proxies in front of the app appending to X-Forwarded-For (0 uses the socket peer)
+    
+    # Password Hashing Settings
+    PASSWORD_HASHER: str = "bcrypt"  # bcrypt, argon2id or scrypt
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    SCRYPT_LOG_N: int = 14
+    SCRYPT_R: int = 8
+    SCRYPT_P: int = 1
+    
+    # Password Hashing Pool Settings
+    PASSWORD_HASH_USE_PROCESSES: bool = False  # bcrypt releases the GIL, threads are enough
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_TIMEOUT: float = 10.0
+    
+    @model_validator(mode="after")
+    def check_connection_budget(self) -> "Settings":
+        """Reject pool settings that cannot fit in DB_MAX_CONNECTIONS"""
+        if self.WEB_CONCURRENCY < 1:
+            raise ValueError("WEB_CONCURRENCY must be at least 1")
+        if not 0 < self.DB_ASYNC_POOL_SHARE < 1:
+            raise ValueError("DB_ASYNC_POOL_SHARE must be between 0 and 1")
+        if self.DB_MAX_CONNECTIONS and self.DB_MAX_CONNECTIONS < 2 * self.WEB_CONCURRENCY:
+            raise ValueError(
+                f"DB_MAX_CONNECTIONS={self.DB_MAX_CONNECTIONS} cannot give each of the "
+                f"{self.WEB_CONCURRENCY} workers a sync and an async connection; "
+                f"allow at least {2 * self.WEB_CONCURRENCY} or lower WEB_CONCURRENCY"
+            )
+        return self
+    
+    def _split_pool(self, connections: int) -> Tuple[int, int]:
+        """Split a connection count into pool size and overflow at the configured ratio"""
+        configured = self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW
+        pool_size = max(1, round(connections * self.DB_POOL_SIZE / configured)) if configured else connections
+        return pool_size, connections - pool_size
+    
+    @property
+    def db_pool_limits(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Pool size and max overflow of the sync and async engine in one worker process
+        
+        With DB_MAX_CONNECTIONS set, each of the WEB_CONCURRENCY workers gets an
+        equal share. DB_ASYNC_POOL_SHARE of it goes to the async engine, which
+        most routes don't use, and the rest to the sync engine; both keep the
+        DB_POOL_SIZE to DB_MAX_OVERFLOW ratio. Without a budget both engines
+        use DB_POOL_SIZE and DB_MAX_OVERFLOW.
+        """
+        if not self.DB_MAX_CONNECTIONS:
+            limits = (self.DB_POOL_SIZE, self.DB_MAX_OVERFLOW)
+            return {"sync": limits, "async": limits}
+        
+        per_worker = self.DB_MAX_CONNECTIONS // self.WEB_CONCURRENCY
+        async_connections = min(per_worker - 1, max(1, int(per_worker * self.DB_ASYNC_POOL_SHARE)))
+        return {
+            "sync": self._split_pool(per_worker - async_connections),
+            "async": self._split_pool(async_connections),
+        }
     
     class Config:
         env_file = ".env"
@@ -1,4 +1,11 @@
-from .database import get_db, engine, Base, SessionLocal
+from .database import (
+    get_db,
+    get_async_session,
+    get_async_engine,
+    engine,
+    Base,
+    SessionLocal,
+)
 from .exceptions import (
     AppException,
     NotFoundException,
@@ -8,11 +15,23 @@ from .exceptions import (
 
 __all__ = [
     "get_db",
+    "get_async_session",
+    "get_async_engine",
     "engine",
+    "async_engine",
     "Base",
     "SessionLocal",
+    "AsyncSessionLocal",
     "AppException",
     "NotFoundException",
     "ValidationException",
     "DatabaseException",
 ]
+
+
+def __getattr__(name):
+    # Created on first access, see app.core.database
+    if name in ("async_engine", "AsyncSessionLocal"):
+        from . import database
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,124 @@
+"""
+Admission control for database-backed requests
+
+Without it, a traffic spike queues requests on the connection pool for up
+to DB_POOL_TIMEOUT seconds each before they fail. The controller rejects
+excess requests up front with 503 and Retry-After instead.
+"""
+import math
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from app.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+db_admission_in_flight = registry.gauge(
+    "db_admission_in_flight_requests",
+    "Admitted requests currently holding or waiting for a connection",
+    ("engine",),
+)
+db_admission_rejected = registry.counter(
+    "db_admission_rejected_total",
+    "Requests rejected because the connection pool was saturated",
+    ("engine", "reason"),
+)
+
+
+class AdmissionController:
+    """
+    Limit in-flight requests per connection pool
+
+    A request is always admitted while a connection is free. Beyond that it
+    is rejected when the number of requests already queued for a connection
+    reaches max_queue, or when the recent average pool wait exceeds the wait
+    budget.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        max_queue: int,
+        wait_budget: float,
+        smoothing: float = 0.2
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            name: Engine label used in logs and metrics
+            capacity: Connections the pool can hand out (pool size + overflow)
+            max_queue: Requests allowed to wait for a connection beyond capacity
+            wait_budget: Average pool wait in seconds above which to shed load
+            smoothing: Weight of each new sample in the average pool wait
+        """
+        self.name = name
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.wait_budget = wait_budget
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.avg_wait = 0.0
+        self._lock = threading.Lock()
+        db_admission_in_flight.labels(name).set_function(lambda: self.in_flight)
+
+    def record_wait(self, seconds: float) -> None:
+        """
+        Feed a connection checkout wait into the average
+
+        Args:
+            seconds: Time the checkout waited for the pool
+        """
+        self.avg_wait += self.smoothing * (seconds - self.avg_wait)
+
+    def _reject(self, reason: str) -> None:
+        db_admission_rejected.labels(self.name, reason).inc()
+        logger.warning(
+            "Shedding %s database request (%s): %s in flight, %.0f ms average pool wait",
+            self.name, reason, self.in_flight, self.avg_wait * 1000
+        )
+        raise ServiceUnavailableException(
+            "Server is busy, please retry shortly",
+            retry_after=max(1, math.ceil(self.avg_wait))
+        )
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Hold an admission slot for the duration of a request
+
+        Raises:
+            ServiceUnavailableException: If the pool is saturated
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                if self.in_flight >= self.capacity + self.max_queue:
+                    self._reject("queue_full")
+                if self.avg_wait > self.wait_budget:
+                    self._reject("wait_budget")
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _create_controller(name: str) -> AdmissionController:
+    return AdmissionController(
+        name=name,
+        capacity=sum(settings.db_pool_limits[name]),
+        max_queue=settings.DB_ADMISSION_MAX_QUEUE,
+        wait_budget=settings.DB_ADMISSION_WAIT_BUDGET,
+    )
+
+
+# One controller per engine, keyed by the pool's metrics label
+admission_controllers: Dict[str, AdmissionController] = {
+    "sync": _create_controller("sync"),
+    "async": _create_controller("async"),
+}
@@ -1,50 +1,271 @@
 """
 Database connection and session management
+
+The async engine is created on first use, so processes that only serve sync
+routes never import or connect the async driver.
 """
-from sqlalchemy import create_engine, event
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from sqlalchemy import Column, DateTime, Integer, String, Table, create_engine, delete, event, insert, inspect, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import Pool
+from sqlalchemy.schema import CreateIndex, CreateTable
 from app.config import settings
+from app.core.exceptions import DatabaseException
+from app.core.db_instrumentation import TimedAsyncAdaptedQueuePool, TimedQueuePool, TimedReplicaQueuePool
+from app.core.metrics import db_pool_checked_out, db_pool_connections_created, db_pool_overflow
+from app.core.replicas import ReplicaSet, mark_written, record_commit, use_replica
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-process pool limits, divided from DB_MAX_CONNECTIONS when set
+POOL_SIZE, MAX_OVERFLOW = settings.db_pool_limits["sync"]
+ASYNC_POOL_SIZE, ASYNC_MAX_OVERFLOW = settings.db_pool_limits["async"]
+
 # Create SQLAlchemy engine with optimized settings
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
+    poolclass=TimedQueuePool,  # Records checkout wait per request
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,  # Verify connections before using them
     echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
 
-# Add connection pool event listeners for monitoring
-@event.listens_for(Pool, "connect")
-def receive_connect(dbapi_conn, connection_record):
-    """Log when a new connection is established"""
-    logger.debug("New database connection established")
 
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """
+    Get the database URL for the async engine
+    
+    Uses ASYNC_DATABASE_URL when set, otherwise derives it from DATABASE_URL
+    by swapping in the async driver for the same backend.
+    
+    Returns:
+        Async SQLAlchemy database URL
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    
+    # asyncpg does not understand libpq's sslmode query argument
+    query = dict(url.query)
+    if driver == "asyncpg" and "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    
+    return url.set(drivername=f"{backend}+{driver}", query=query).render_as_string(hide_password=False)
+
+
+def _register_pool_metrics(label: str, pool_engine: Engine) -> None:
+    """
+    Export an engine's pool connection counts as metrics
+    
+    The pool is looked up on every scrape because dispose() replaces it.
+    
+    Args:
+        label: Engine label used in the metrics
+        pool_engine: Engine whose pool to observe
+    """
+    db_pool_checked_out.labels(label).set_function(lambda: pool_engine.pool.checkedout())
+    db_pool_overflow.labels(label).set_function(lambda: max(pool_engine.pool.overflow(), 0))
+    event.listen(pool_engine, "connect", lambda *args: db_pool_connections_created.labels(label).inc())
+
+
+_register_pool_metrics(TimedQueuePool.metrics_label, engine)
+
+
+def _create_replica_engine(index: int, url: str) -> Engine:
+    # A pool class per replica, so its checkout waits carry its own label
+    poolclass = type("TimedReplicaQueuePool", (TimedReplicaQueuePool,), {"metrics_label": f"replica-{index}"})
+    return create_engine(
+        url,
+        poolclass=poolclass,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        echo=settings.DEBUG,
+    )
+
+
+# Read replicas, empty unless DATABASE_REPLICA_URLS is set
+replicas = ReplicaSet(
+    [_create_replica_engine(index, url) for index, url in enumerate(settings.DATABASE_REPLICA_URLS)],
+    eject_seconds=settings.REPLICA_EJECT_SECONDS,
+)
+for _replica in replicas.engines:
+    _register_pool_metrics(_replica.pool.metrics_label, _replica)
+
+
+class TrackedSession(Session):
+    """Session recording whether it has written, for read-your-writes routing"""
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _track_writes(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_written(orm_execute_state.session)
 
-@event.listens_for(Pool, "checkout")
-def receive_checkout(dbapi_conn, connection_record, connection_proxy):
-    """Log when a connection is checked out from the pool"""
-    logger.debug("Connection checked out from pool")
+
+@event.listens_for(TrackedSession, "after_flush")
+def _track_flush(session, flush_context) -> None:
+    mark_written(session)
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _track_commit(session) -> None:
+    record_commit(session)
+
+
+class RoutingSession(TrackedSession):
+    """
+    Session sending reads marked with replica_reads() to a replica
+    
+    Everything else, including every read once the session has written or
+    its user is sticky, goes to the primary engine. A read that fails
+    because its replica's connection failed is retried once on the primary.
+    """
+    
+    # Replica the statement being executed was sent to
+    _replica: Optional[Engine] = None
+    _primary_only = False
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            replicas and use_replica(self) and not self._primary_only
+            and not self._flushing and not getattr(clause, "is_dml", False)
+        ):
+            replica = replicas.choose()
+            if replica is not None:
+                self._replica = replica
+                return replica
+        return engine
+    
+    def _read(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a Session execution method, falling back to the primary"""
+        if not replicas:
+            return method(*args, **kwargs)
+        
+        self._replica = None
+        try:
+            return method(*args, **kwargs)
+        except DBAPIError as e:
+            replica, self._replica = self._replica, None
+            # The replica's handle_error listener ejects it on connection
+            # errors only; anything else is the statement's own failure
+            if replica is None or not replicas.is_ejected(replica):
+                raise
+            if e.connection_invalidated:
+                # The transaction now holds a dead replica connection that
+                # would fail the next commit; a session on a replica has
+                # not written, so nothing is lost
+                self.rollback()
+            logger.warning("Read replica failed, retrying on the primary: %s", e.orig)
+            self._primary_only = True
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._primary_only = False
+    
+    def execute(self, *args, **kwargs):
+        return self._read(super().execute, *args, **kwargs)
+    
+    def scalar(self, *args, **kwargs):
+        return self._read(super().scalar, *args, **kwargs)
+    
+    def scalars(self, *args, **kwargs):
+        return self._read(super().scalars, *args, **kwargs)
 
 
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     bind=engine,
     expire_on_commit=False,
 )
 
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_engine_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine, creating it on first use
+    
+    Returns:
+        Async engine with its own share of the pool limits
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                async_engine = create_async_engine(
+                    get_async_database_url(),
+                    poolclass=TimedAsyncAdaptedQueuePool,  # aiosqlite would otherwise default to NullPool
+                    pool_size=ASYNC_POOL_SIZE,
+                    max_overflow=ASYNC_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    pool_recycle=settings.DB_POOL_RECYCLE,
+                    pool_pre_ping=True,
+                    echo=settings.DEBUG,
+                )
+                _register_pool_metrics(TimedAsyncAdaptedQueuePool.metrics_label, async_engine.sync_engine)
+                _async_session_factory = async_sessionmaker(
+                    bind=async_engine,
+                    sync_session_class=TrackedSession,
+                    autoflush=False,
+                    expire_on_commit=False,
+                )
+                _async_engine = async_engine
+    return _async_engine
+
+
+def __getattr__(name: str) -> Any:
+    # async_engine and AsyncSessionLocal stay importable by name but are
+    # only created when first accessed
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "AsyncSessionLocal":
+        get_async_engine()
+        return _async_session_factory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Base class for all models
 Base = declarative_base()
 
+# Single row holding the fingerprint of the schema init_db last created
+schema_version = Table(
+    "schema_version",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
 
 def get_db() -> Session:
     """
@@ -55,30 +276,209 @@ def get_db() -> Session:
     try:
         yield db
     except Exception as e:
-        logger.error(f"Database session error: {str(e)}")
+        logger.error("Database session error: %s", e)
         db.rollback()
         raise
     finally:
         db.close()
 
 
-def init_db() -> None:
-    """Initialize database tables"""
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get async database session
+    Automatically closes session after request
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error("Async database session error: %s", e)
+            await db.rollback()
+            raise
+
+
+def get_dialect_insert(dialect_name: str) -> Callable:
+    """
+    Get the dialect-specific insert() that supports ON CONFLICT
+    
+    Args:
+        dialect_name: SQLAlchemy dialect name of the bound engine
+        
+    Returns:
+        insert construct factory for the dialect
+        
+    Raises:
+        DatabaseException: If the dialect has no ON CONFLICT support here
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    raise DatabaseException(f"ON CONFLICT is not supported for dialect '{dialect_name}'")
+
+
+def get_pool_status() -> Dict[str, Dict[str, int]]:
+    """
+    Get connection counts for each engine's pool
+    
+    Returns:
+        Engine label -> pool size, idle, checked out and overflow connections
+        (the async engine only once it has been created, then any replicas)
+    """
+    engines = [("sync", engine)]
+    if _async_engine is not None:
+        engines.append(("async", _async_engine.sync_engine))
+    engines.extend((replica.pool.metrics_label, replica) for replica in replicas.engines)
+    
+    status = {}
+    for label, pool_engine in engines:
+        pool = pool_engine.pool
+        status[label] = {
+            "size": pool.size(),
+            "idle": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return status
+
+
+def get_schema_fingerprint() -> str:
+    """
+    Get a fingerprint of the schema the models describe
+    
+    Returns:
+        SHA-256 over the CREATE TABLE and CREATE INDEX statements create_all
+        would emit for this engine's dialect
+    """
+    # Import all models to register them with Base
+    import app.models  # noqa: F401
+    
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode("utf-8"))
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_stored_schema_fingerprint() -> Optional[str]:
+    """
+    Get the fingerprint recorded by the last init_db
+    
+    Returns:
+        Stored fingerprint, or None if the schema was never initialized
+    """
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                select(schema_version.c.fingerprint).where(schema_version.c.id == 1)
+            ).scalar()
+    except (OperationalError, ProgrammingError):
+        # schema_version does not exist yet
+        return None
+
+
+def get_missing_tables() -> List[str]:
+    """Get the model tables that do not exist in the database"""
+    # Import all models to register them with Base
+    import app.models  # noqa: F401
+    
+    existing = set(inspect(engine).get_table_names())
+    return [table.name for table in Base.metadata.sorted_tables if table.name not in existing]
+
+
+def check_schema() -> bool:
+    """
+    Check that the database schema matches the models, without running DDL
+    
+    A changed model whose tables all exist only logs a warning, so an
+    instance can still start ahead of a migration.
+    
+    Returns:
+        True if the stored fingerprint matches
+        
+    Raises:
+        DatabaseException: If a model table does not exist
+    """
+    if get_stored_schema_fingerprint() == get_schema_fingerprint():
+        return True
+    missing = get_missing_tables()
+    if missing:
+        raise DatabaseException(
+            f"Database tables missing ({', '.join(missing)}); run `python -m app.manage init-db`"
+        )
+    logger.warning("Database schema does not match the models; run `python -m app.manage init-db`")
+    return False
+
+
+def init_db(force: bool = False) -> bool:
+    """
+    Initialize database tables
+    
+    DDL is skipped when the stored schema fingerprint matches the models.
+    create_all only creates missing tables and indexes; changes to existing
+    tables still need a migration.
+    
+    Args:
+        force: Run create_all even if the fingerprint matches
+        
+    Returns:
+        True if DDL was run
+    """
     try:
-        # Import all models to register them with Base
-        from app.models import User, UserRole
+        fingerprint = get_schema_fingerprint()
+        if not force and get_stored_schema_fingerprint() == fingerprint:
+            logger.info("Database schema up to date, skipping table creation")
+            return False
         
         Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        with engine.begin() as connection:
+            connection.execute(delete(schema_version))
+            connection.execute(
+                insert(schema_version).values(id=1, fingerprint=fingerprint, applied_at=datetime.utcnow())
+            )
+        logger.info("Database tables created successfully (schema %s)", fingerprint[:12])
+        return True
     except Exception as e:
-        logger.error(f"Error creating database tables: {str(e)}")
+        logger.error("Error creating database tables: %s", e)
         raise
 
 
+def dispose_engines_after_fork() -> None:
+    """
+    Drop pooled connections inherited from the parent process
+    
+    Called in each worker after fork, so a worker never shares a socket with
+    its parent or siblings. The inherited connections are left open for the
+    parent rather than closed from here.
+    """
+    engine.dispose(close=False)
+    for replica in replicas.engines:
+        replica.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
 def close_db() -> None:
     """Close database connections"""
     try:
         engine.dispose()
+        for replica in replicas.engines:
+            replica.dispose()
         logger.info("Database connections closed")
     except Exception as e:
-        logger.error(f"Error closing database connections: {str(e)}")
+        logger.error("Error closing database connections: %s", e)
+
+
+async def close_async_db() -> None:
+    """Close async database connections"""
+    if _async_engine is None:
+        return
+    try:
+        await _async_engine.dispose()
+        logger.info("Async database connections closed")
+    except Exception as e:
+        logger.error("Error closing async database connections: %s", e)
@@ -0,0 +1,152 @@
+"""
+Per-request database instrumentation
+
+Statement count, time spent executing statements and time spent waiting for
+a pooled connection are accumulated in a context variable, so each request
+(or any other unit of work that calls start_db_stats) sees only its own work.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import settings
+from app.core.admission import admission_controllers
+from app.core.metrics import db_pool_checkout_wait
+
+
+class DBStats:
+    """Database work done within one request"""
+
+    __slots__ = ("queries", "db_time", "pool_wait", "statements", "n_plus_one")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0  # Seconds
+        self.pool_wait = 0.0  # Seconds
+        self.statements: Counter = Counter()
+        self.n_plus_one: List[str] = []
+
+    def record_query(self, statement: str, elapsed: float) -> None:
+        """
+        Record an executed statement
+
+        Args:
+            statement: SQL text as sent to the driver
+            elapsed: Execution time in seconds
+        """
+        self.queries += 1
+        self.db_time += elapsed
+
+        threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+        if threshold > 0:
+            # Parameters are bound separately, so a statement repeated in a
+            # loop shows up as identical SQL text
+            self.statements[statement] += 1
+            if self.statements[statement] == threshold:
+                self.n_plus_one.append(statement)
+
+    def server_timing(self) -> str:
+        """Format the stats as a Server-Timing header value"""
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f"db-pool;dur={self.pool_wait * 1000:.2f}"
+        )
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get the stats as a dictionary (times in milliseconds)"""
+        return {
+            "queries": self.queries,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "pool_wait_ms": round(self.pool_wait * 1000, 2),
+        }
+
+
+_db_stats: ContextVar[Optional[DBStats]] = ContextVar("db_stats", default=None)
+
+
+def start_db_stats() -> Tuple[DBStats, Token]:
+    """
+    Start collecting database stats for the current context
+
+    Returns:
+        Tuple of (stats being collected, token for stop_db_stats)
+    """
+    stats = DBStats()
+    return stats, _db_stats.set(stats)
+
+
+def get_db_stats() -> Optional[DBStats]:
+    """Get the stats being collected for the current context, if any"""
+    return _db_stats.get()
+
+
+def stop_db_stats(token: Token) -> None:
+    """Stop collecting database stats started with start_db_stats"""
+    _db_stats.reset(token)
+
+
+class TimedPoolMixin:
+    """Record how long each connection checkout waited for the pool"""
+
+    # Engine label for pool metrics
+    metrics_label = ""
+    # Admission controller fed with the waits, the engine's own when unset
+    admission_label: Optional[str] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            db_pool_checkout_wait.labels(self.metrics_label).observe(elapsed)
+            admission_controllers[self.admission_label or self.metrics_label].record_wait(elapsed)
+            stats = _db_stats.get()
+            if stats is not None:
+                stats.pool_wait += elapsed
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """QueuePool that records checkout wait time"""
+
+    metrics_label = "sync"
+    # Keep logging under SQLAlchemy's logger name
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class TimedReplicaQueuePool(TimedQueuePool):
+    """
+    QueuePool of a read replica engine
+    
+    Replica reads come from sessions admitted by the sync engine's
+    controller, so their waits count against its budget.
+    """
+
+    metrics_label = "replica"
+    admission_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time"""
+
+    metrics_label = "async"
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+# Engine is the class both engines (and the async engine's sync proxy) use,
+# so one pair of listeners covers every connection
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Remember when a statement started"""
+    conn.info["query_start_time"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Add a finished statement to the current request's stats"""
+    stats = _db_stats.get()
+    if stats is not None:
+        stats.record_query(statement, time.perf_counter() - conn.info["query_start_time"])
@@ -1,7 +1,7 @@
 """
 Custom exception classes for the application
 """
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 
 
 class AppException(Exception):
@@ -11,11 +11,13 @@ class AppException(Exception):
         self,
         message: str,
         status_code: int = 500,
-        details: Optional[Any] = None
+        details: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.status_code = status_code
         self.details = details
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -52,3 +54,29 @@ class AuthorizationException(AppException):
     
     def __init__(self, message: str = "Access denied", details: Optional[Any] = None):
         super().__init__(message=message, status_code=403, details=details)
+
+
+class ServiceUnavailableException(AppException):
+    """Exception raised when the service is temporarily overloaded"""
+    
+    def __init__(
+        self,
+        message: str = "Service temporarily unavailable",
+        details: Optional[Any] = None,
+        retry_after: Optional[int] = None
+    ):
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+        super().__init__(message=message, status_code=503, details=details, headers=headers)
+
+
+class TooManyRequestsException(AppException):
+    """Exception raised when a client exceeds a rate limit"""
+    
+    def __init__(
+        self,
+        message: str = "Too many requests",
+        details: Optional[Any] = None,
+        retry_after: Optional[int] = None
+    ):
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+        super().__init__(message=message, status_code=429, details=details, headers=headers)
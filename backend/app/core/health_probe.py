@@ -0,0 +1,182 @@
+"""
+Background database health probing
+
+A single task probes the database on an interval and keeps the latest
+result in memory, so health endpoints polled by load balancers never take
+a pooled connection themselves. The probe opens its own connection each
+time rather than borrowing one from the request pool, so it still reports
+correctly when that pool is exhausted and notices when the database stops
+accepting new connections.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.utils.singleflight import SingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Version query per dialect
+VERSION_QUERIES = {
+    "postgresql": "SELECT version()",
+    "sqlite": "SELECT sqlite_version()",
+}
+
+# Connection count query per dialect, where one exists
+CONNECTION_COUNT_QUERIES = {
+    "postgresql": "SELECT COUNT(*) FROM pg_stat_activity WHERE datname = current_database()",
+}
+
+STATUS_UNKNOWN = "unknown"
+STATUS_CONNECTED = "connected"
+STATUS_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Outcome of one database probe"""
+
+    status: str
+    version: Optional[str] = None
+    active_connections: Optional[int] = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: float = field(default_factory=time.time)
+    # Monotonic clock reading used for the result's age
+    checked_at_monotonic: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the probe ran"""
+        return time.monotonic() - self.checked_at_monotonic
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the result as a response payload"""
+        return {
+            "status": self.status,
+            "version": self.version,
+            "active_connections": self.active_connections,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+            "checked_at": self.checked_at,
+            "age_seconds": round(self.age, 3),
+        }
+
+
+class HealthProbe:
+    """Periodically probe the database and cache the result"""
+
+    def __init__(self, probe_engine: Engine, interval: float, timeout: float, max_age: float):
+        """
+        Initialize the prober
+
+        Args:
+            probe_engine: Engine to probe
+            interval: Seconds between probes
+            timeout: Seconds before a probe counts as failed
+            max_age: Seconds after which a result no longer counts as ready
+        """
+        self.engine = probe_engine
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age
+        self.result = ProbeResult(status=STATUS_UNKNOWN)
+        # Overlapping probe() calls share one round of queries
+        self._flight = SingleFlight("health_probe")
+        # Thread of the last probe, which a timeout cannot cancel
+        self._query_future: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the last probe succeeded and is recent enough"""
+        return self.result.status == STATUS_CONNECTED and self.result.age <= self.max_age
+
+    def _query(self) -> ProbeResult:
+        """Connect and run the probe queries (blocking)"""
+        dialect = self.engine.dialect.name
+        start = time.perf_counter()
+        try:
+            with self.engine.connect() as connection:
+                version = connection.execute(text(VERSION_QUERIES.get(dialect, "SELECT 1"))).scalar()
+                active_connections = None
+                if dialect in CONNECTION_COUNT_QUERIES:
+                    active_connections = connection.execute(text(CONNECTION_COUNT_QUERIES[dialect])).scalar()
+        except Exception as e:
+            return ProbeResult(status=STATUS_ERROR, error=str(e))
+        return ProbeResult(
+            status=STATUS_CONNECTED,
+            version=str(version) if dialect in VERSION_QUERIES else None,
+            active_connections=active_connections,
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
+    async def probe(self) -> ProbeResult:
+        """
+        Probe the database now and store the result
+
+        Returns:
+            The new probe result
+        """
+        result, _ = await self._flight.do_async("probe", self._probe)
+        return result
+
+    async def _probe(self) -> ProbeResult:
+        if self._query_future is not None and not self._query_future.done():
+            # Starting another thread would only pile up behind a hung connection
+            result = ProbeResult(status=STATUS_ERROR, error="Previous probe still running")
+        else:
+            self._query_future = asyncio.ensure_future(asyncio.to_thread(self._query))
+            try:
+                # Shielded so the future tracks the thread even after a timeout
+                result = await asyncio.wait_for(asyncio.shield(self._query_future), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                result = ProbeResult(status=STATUS_ERROR, error=f"Probe timed out after {self.timeout}s")
+
+        # Log state changes only, not every probe
+        if result.status != self.result.status:
+            if result.status == STATUS_CONNECTED:
+                logger.info("Database health probe succeeded")
+            else:
+                logger.error("Database health probe failed: %s", result.error)
+
+        self.result = result
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.probe()
+
+    async def start(self) -> None:
+        """Run a first probe and start probing in the background"""
+        if self._task is not None:
+            return
+        await self.probe()
+        self._task = asyncio.create_task(self._run(), name="db-health-probe")
+        logger.info("Database health probe started (every %ss)", self.interval)
+
+    async def stop(self) -> None:
+        """Stop background probing"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            logger.info("Database health probe stopped")
+
+
+health_probe = HealthProbe(
+    # A fresh connection per probe, outside the request pools
+    probe_engine=create_engine(settings.DATABASE_URL, poolclass=NullPool),
+    interval=settings.HEALTH_PROBE_INTERVAL,
+    timeout=settings.HEALTH_PROBE_TIMEOUT,
+    max_age=settings.HEALTH_PROBE_MAX_AGE,
+)
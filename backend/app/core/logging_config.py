@@ -1,34 +1,235 @@
 """
 Logging configuration for the application
+
+Records are handed to a background thread through a queue, so request
+handlers never format messages or touch stdout/disk themselves.
 """
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_listener: Optional[QueueListener] = None
+# Arguments of the last setup_logging call, reused after fork
+_setup_kwargs: Dict[str, Any] = {}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ThrottleFilter(logging.Filter):
+    """
+    Per-logger rate limiting and sampling for high-volume records
+
+    Limits apply to a logger and its children (e.g. "app.api" covers
+    "app.api.v1.routes.auth"). WARNING and above are never dropped.
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, float]] = None,
+        sample_rates: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the filter
+
+        Args:
+            rate_limits: Logger name -> maximum records per second
+            sample_rates: Logger name -> fraction of records to keep (0-1)
+        """
+        super().__init__()
+        self.rate_limits = rate_limits or {}
+        self.sample_rates = sample_rates or {}
+        self.dropped = 0
+        self._resolved: Dict[str, Tuple[Optional[str], Optional[float]]] = {}
+        # Token buckets: logger prefix -> [tokens, last refill time]
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, limits: Dict[str, float], name: str) -> Tuple[Optional[str], Optional[float]]:
+        """Find the most specific configured prefix for a logger name"""
+        while name:
+            if name in limits:
+                return name, limits[name]
+            name = name.rpartition(".")[0]
+        return None, None
+
+    def _resolve(self, name: str) -> Tuple[Optional[str], Optional[float]]:
+        """Get (rate limit prefix, sample rate) for a logger, cached per name"""
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            prefix, _ = self._lookup(self.rate_limits, name)
+            _, sample_rate = self._lookup(self.sample_rates, name)
+            resolved = self._resolved[name] = (prefix, sample_rate)
+        return resolved
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        prefix, sample_rate = self._resolve(record.name)
+
+        if sample_rate is not None and random.random() >= sample_rate:
+            self.dropped += 1
+            return False
+
+        if prefix is not None:
+            rate = self.rate_limits[prefix]
+            capacity = max(rate, 1.0)
+            now = time.monotonic()
+            with self._lock:
+                bucket = self._buckets.setdefault(prefix, [capacity, now])
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] < 1:
+                    self.dropped += 1
+                    return False
+                bucket[0] -= 1
+
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread
+
+    The stock QueueHandler formats each record in the calling thread so it
+    can be pickled; records here stay in-process, so that work is deferred.
+    A full queue drops the record instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(
+    log_level: str = "INFO",
+    json_format: bool = False,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    queue_size: int = 10000,
+    rate_limits: Optional[Dict[str, float]] = None,
+    sample_rates: Optional[Dict[str, float]] = None
+) -> None:
+    """
+    Configure application logging
+
+    Args:
+        log_level: Root log level
+        json_format: Emit JSON lines instead of plain text
+        max_bytes: Rotate logs/app.log after this size (0 disables rotation)
+        backup_count: Number of rotated log files to keep
+        queue_size: Maximum records buffered for the background writer
+        rate_limits: Logger name -> maximum INFO/DEBUG records per second
+        sample_rates: Logger name -> fraction of INFO/DEBUG records to keep
+    """
+    global _listener
+    _setup_kwargs.update(
+        log_level=log_level,
+        json_format=json_format,
+        max_bytes=max_bytes,
+        backup_count=backup_count,
+        queue_size=queue_size,
+        rate_limits=rate_limits,
+        sample_rates=sample_rates,
+    )
 
-def setup_logging(log_level: str = "INFO") -> None:
-    """Configure application logging"""
-    
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
-    # Configure logging format
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    date_format = "%Y-%m-%d %H:%M:%S"
-    
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(log_dir / "app.log"),
-        ]
+
+    formatter = JSONFormatter() if json_format else logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+    # Handlers doing the actual I/O, run by the background listener thread
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = RotatingFileHandler(
+        log_dir / "app.log",
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
     )
-    
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    queue_handler = DeferredQueueHandler(queue.Queue(maxsize=queue_size))
+    if rate_limits or sample_rates:
+        queue_handler.addFilter(ThrottleFilter(rate_limits, sample_rates))
+
+    # Replace any previous pipeline (e.g. when called twice)
+    shutdown_logging()
+
+    # Configure root logger
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(getattr(logging, log_level.upper()))
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+
     # Set specific log levels for libraries
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background logging thread"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def restart_logging_after_fork() -> None:
+    """
+    Rebuild the logging pipeline in a forked worker process
+
+    Threads do not survive fork(), so a worker forked from a preloaded parent
+    would otherwise queue records that no listener ever writes.
+    """
+    global _listener
+
+    # The inherited listener's thread only exists in the parent
+    _listener = None
+    if _setup_kwargs:
+        setup_logging(**_setup_kwargs)
+
+
+atexit.register(shutdown_logging)
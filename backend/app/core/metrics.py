@@ -0,0 +1,356 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+Values are kept in per-thread shards: each thread only ever writes its own
+shard, so recording a value takes no lock, and a scrape sums the shards.
+Shards of threads that have exited are folded into a base total, so the
+number of shards follows the live threads rather than every thread ever seen.
+"""
+import bisect
+import math
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a {name="value",...} label set"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Sharded:
+    """Values with one shard per writing thread"""
+
+    def __init__(self, size: int):
+        self._size = size
+        # Totals of the shards whose threads have exited
+        self._base = [0] * size
+        self._shards: List[Tuple[weakref.ref, list]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0] * self._size
+            self._local.shard = shard
+            # Only taken once per thread, never on the recording path
+            with self._lock:
+                self._prune()
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        return shard
+
+    def _prune(self) -> None:
+        """Fold the shards of exited threads into the base totals (lock held)"""
+        live = []
+        for owner, shard in self._shards:
+            thread = owner()
+            if thread is not None and thread.is_alive():
+                live.append((owner, shard))
+            else:
+                # An exited thread never writes its shard again
+                for index, value in enumerate(shard):
+                    self._base[index] += value
+        self._shards = live
+
+    def _totals(self) -> List[float]:
+        with self._lock:
+            self._prune()
+            totals = list(self._base)
+            for _, shard in self._shards:
+                for index, value in enumerate(shard):
+                    totals[index] += value
+        return totals
+
+
+class CounterChild(_Sharded):
+    """Counter for one label set"""
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter"""
+        self._shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class GaugeChild:
+    """Gauge for one label set, either set directly or read from a callback"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        """Set the gauge"""
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the gauge from a callback at scrape time"""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        return self._function() if self._function is not None else self._value
+
+
+class HistogramChild(_Sharded):
+    """Histogram for one label set"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        # One slot per bucket, one for +Inf, one for the sum
+        super().__init__(len(buckets) + 2)
+        self._buckets = buckets
+
+    def observe(self, value: float) -> None:
+        """Record an observation"""
+        shard = self._shard()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """
+        Get cumulative bucket counts, total count and sum
+
+        Returns:
+            Tuple of (cumulative counts per bucket incl. +Inf, count, sum)
+        """
+        totals = self._totals()
+        cumulative = []
+        running = 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+class Metric:
+    """A named metric with an optional set of labels"""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """
+        Get the child metric for a label set
+
+        Args:
+            values: Label values in labelnames order
+
+        Returns:
+            Child metric to record values on
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the text exposition format"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    metric_type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase an unlabelled counter"""
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge"""
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read an unlabelled gauge from a callback at scrape time"""
+        self.labels().set_function(function)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed buckets"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on an unlabelled histogram"""
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for values, child in list(self._children.items()):
+            cumulative, count, total = child.snapshot()
+            for bound, bucket_count in zip(bounds, cumulative):
+                labels = _format_labels(self.labelnames, values, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {bucket_count}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_count{labels} {count}"
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric, or return the one already registered under its name
+
+        Args:
+            metric: Metric to register
+
+        Returns:
+            Registered metric
+        """
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter"""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge"""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Create and register a histogram"""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Application metrics
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status"),
+)
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ("engine",),
+)
+db_pool_overflow = registry.gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond the pool size",
+    ("engine",),
+)
+db_pool_connections_created = registry.counter(
+    "db_pool_connections_created_total",
+    "New database connections opened by the pool",
+    ("engine",),
+)
+db_pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ("engine",),
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "Password hash and verify duration",
+    ("operation", "algorithm"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0, 2.5),
+)
+jwt_duration = registry.histogram(
+    "jwt_duration_seconds",
+    "JWT encode and decode duration",
+    ("operation",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
@@ -0,0 +1,130 @@
+"""
+ASGI middleware
+"""
+import time
+from typing import Callable, Dict
+from app.core.db_instrumentation import start_db_stats, stop_db_stats
+from app.core.metrics import http_request_duration
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DBTimingMiddleware:
+    """
+    Report each request's database work
+
+    Adds a Server-Timing header with the statement count, DB time and pool
+    wait, logs one summary line per request and warns about statements
+    repeated often enough to suggest an N+1 query pattern. Implemented as
+    plain ASGI so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        """
+        Initialize the middleware
+
+        Args:
+            app: ASGI application to wrap
+            server_timing: Add the Server-Timing response header
+        """
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_db_stats()
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    value = f"{stats.server_timing()}, app;dur={elapsed:.2f}"
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_db_stats(token)
+            # Runs on every request, so skip the formatting when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s %s %d - %d queries, %.2f ms db, %.2f ms pool wait, %.2f ms total",
+                    scope["method"], scope["path"], status_code, stats.queries,
+                    stats.db_time * 1000, stats.pool_wait * 1000, (time.perf_counter() - start) * 1000
+                )
+            for statement in stats.n_plus_one:
+                logger.warning(
+                    "Possible N+1 query in %s %s: executed %d times: %s",
+                    scope["method"], scope["path"], stats.statements[statement], statement
+                )
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template and status
+
+    Requests that match no route are grouped under one label so arbitrary
+    paths cannot grow the number of series.
+    """
+
+    UNMATCHED_ROUTE = "<unmatched>"
+
+    def __init__(self, app):
+        """
+        Initialize the middleware
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+        # Endpoint -> route path template
+        self._routes: Dict[Callable, str] = {}
+
+    def _route_label(self, scope) -> str:
+        """Get the path template of the route that handled a request"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return self.UNMATCHED_ROUTE
+        label = self._routes.get(endpoint)
+        if label is None:
+            label = self.UNMATCHED_ROUTE
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    label = route.path
+                    break
+            self._routes[endpoint] = label
+        return label
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration.labels(
+                scope["method"],
+                self._route_label(scope),
+                status_code
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,236 @@
+"""
+Rate limiting with pluggable counter storage
+"""
+import hashlib
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from starlette.requests import Request
+from app.config import settings
+from app.core.exceptions import TooManyRequestsException
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    """Storage for rate limit counters"""
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, window: float) -> float:
+        """
+        Record a hit for a key if it is under its limit
+
+        Args:
+            key: Counter key
+            limit: Maximum hits per window
+            window: Window length in seconds
+
+        Returns:
+            0 if the hit was allowed, otherwise seconds until it would be
+        """
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        """Forget all hits for a key"""
+
+
+class MemorySlidingWindowBackend(RateLimitBackend):
+    """
+    In-process sliding window counters
+
+    Each key keeps only the current and previous fixed-window counts; the
+    sliding count is the previous count weighted by how much of it still
+    overlaps the window. Keys are stored as 8-byte digests and the least
+    recently used keys are dropped beyond max_keys, so memory stays bounded
+    even under a flood of distinct emails or addresses.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        """
+        Initialize the backend
+
+        Args:
+            max_keys: Maximum number of tracked keys
+        """
+        self.max_keys = max_keys
+        # digest -> [window index, previous window count, current window count]
+        self._counters: "OrderedDict[bytes, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.time()
+        index, offset = divmod(now, window)
+        index = int(index)
+        digest = self._digest(key)
+
+        with self._lock:
+            counter = self._counters.get(digest)
+            if counter is None:
+                counter = [index, 0, 0]
+                self._counters[digest] = counter
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(digest)
+
+            # Roll the fixed windows forward
+            if counter[0] != index:
+                counter[1] = counter[2] if counter[0] == index - 1 else 0
+                counter[2] = 0
+                counter[0] = index
+
+            previous, current = counter[1], counter[2]
+            weight = 1 - offset / window
+            if previous * weight + current < limit:
+                counter[2] += 1
+                return 0.0
+
+        return self._retry_after(previous, current, limit, window, offset)
+
+    @staticmethod
+    def _retry_after(previous: int, current: int, limit: int, window: float, offset: float) -> float:
+        """Seconds until the sliding count drops below the limit"""
+        if current >= limit:
+            # Wait for the next window, then for this window's hits to slide out
+            return (window - offset) + window * (1 - limit / current)
+        # Wait for enough of the previous window's hits to slide out
+        return max(window * (1 - (limit - current) / previous) - offset, 0.0)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._counters.pop(self._digest(key), None)
+
+
+# Backend factories selectable through RATE_LIMIT_BACKEND
+RATE_LIMIT_BACKENDS: Dict[str, Callable[[], RateLimitBackend]] = {
+    "memory": lambda: MemorySlidingWindowBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS),
+}
+
+
+def register_rate_limit_backend(name: str, factory: Callable[[], RateLimitBackend]) -> None:
+    """
+    Register a rate limit backend (e.g. a shared store)
+
+    Args:
+        name: Name used in the RATE_LIMIT_BACKEND setting
+        factory: Callable creating the backend
+    """
+    RATE_LIMIT_BACKENDS[name] = factory
+
+
+def create_rate_limit_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """Create the configured rate limit backend"""
+    name = name or settings.RATE_LIMIT_BACKEND
+    if name not in RATE_LIMIT_BACKENDS:
+        raise ValueError(f"Unknown rate limit backend '{name}'")
+    return RATE_LIMIT_BACKENDS[name]()
+
+
+def get_client_ip(request: Request, trusted_proxies: Optional[int] = None) -> Optional[str]:
+    """
+    Get the client IP address to rate limit on
+
+    Each trusted proxy appends the address it received the request from to
+    X-Forwarded-For, so the client is that many entries from the right;
+    entries further left are whatever the client sent and can be forged.
+
+    Args:
+        request: Incoming request
+        trusted_proxies: Proxies in front of the app, defaults to TRUSTED_PROXY_COUNT
+
+    Returns:
+        Client IP address, or None if unknown
+    """
+    if trusted_proxies is None:
+        trusted_proxies = settings.TRUSTED_PROXY_COUNT
+    peer = request.client.host if request.client else None
+    if trusted_proxies <= 0:
+        return peer
+
+    hops = [
+        hop.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for hop in header.split(",")
+        if hop.strip()
+    ]
+    if len(hops) < trusted_proxies:
+        # Did not come through every proxy, so the header proves nothing
+        return peer
+    return hops[-trusted_proxies]
+
+
+class LoginRateLimiter:
+    """Throttle login attempts per email and per client IP"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_email: int,
+        per_ip: int,
+        window: float
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            backend: Counter storage
+            per_email: Maximum attempts per email per window
+            per_ip: Maximum attempts per client IP per window
+            window: Window length in seconds
+        """
+        self.backend = backend
+        self.per_email = per_email
+        self.per_ip = per_ip
+        self.window = window
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"login:email:{email.lower()}"
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f"login:ip:{ip}"
+
+    def check(self, email: str, ip: Optional[str]) -> None:
+        """
+        Record a login attempt or reject it
+
+        Args:
+            email: Email being logged into
+            ip: Client IP address, if known
+
+        Raises:
+            TooManyRequestsException: If either limit is exceeded
+        """
+        retry_after = 0.0
+        if ip:
+            retry_after = self.backend.hit(self._ip_key(ip), self.per_ip, self.window)
+        if not retry_after:
+            retry_after = self.backend.hit(self._email_key(email), self.per_email, self.window)
+
+        if retry_after:
+            logger.warning("Login throttled for %s from %s", email, ip)
+            raise TooManyRequestsException(
+                "Too many login attempts, please try again later",
+                retry_after=max(1, math.ceil(retry_after))
+            )
+
+    def reset(self, email: str) -> None:
+        """Clear the per-email counter after a successful login"""
+        self.backend.reset(self._email_key(email))
+
+
+login_limiter = LoginRateLimiter(
+    backend=create_rate_limit_backend(),
+    per_email=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW,
+)
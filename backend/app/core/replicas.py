@@ -0,0 +1,156 @@
+"""
+Read replica selection and read-your-writes stickiness
+
+Reads are only sent to a replica inside a replica_reads() block, and only
+while the session has not written and its user is not sticky. A user is
+sticky for REPLICA_STICKY_WINDOW seconds after committing a write, and
+while their access token is younger than that window (login, signup and
+refresh all write), so their next reads see their own changes despite
+replication lag.
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.utils.cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Users who committed a write within the sticky window (per process)
+recent_writers: TTLCache[int, bool] = TTLCache(maxsize=100000, ttl=settings.REPLICA_STICKY_WINDOW)
+
+
+class ReplicaSet:
+    """
+    Round-robin over read replicas, skipping ones that recently failed
+
+    A replica whose connection fails is ejected for eject_seconds and then
+    tried again by the next read that picks it.
+    """
+
+    def __init__(self, engines: Sequence[Engine], eject_seconds: float):
+        """
+        Initialize the set
+
+        Args:
+            engines: Replica engines
+            eject_seconds: Seconds to skip a replica after a connection error
+        """
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._ejected_until: Dict[Engine, float] = {}
+        self._cycle = itertools.cycle(self.engines)
+        self._lock = threading.Lock()
+        for replica in self.engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def _on_error(self, context: Any) -> None:
+        if context.is_disconnect or context.connection is None:
+            self.eject(context.engine)
+
+    def eject(self, replica: Engine) -> None:
+        """
+        Stop routing reads to a replica for eject_seconds
+
+        Args:
+            replica: Failing replica engine
+        """
+        self._ejected_until[replica] = time.monotonic() + self.eject_seconds
+        logger.warning("Ejected read replica %s for %ss", replica.url, self.eject_seconds)
+
+    def is_ejected(self, replica: Engine) -> bool:
+        """Whether a replica is currently skipped after a connection error"""
+        return self._ejected_until.get(replica, 0.0) > time.monotonic()
+
+    def choose(self) -> Optional[Engine]:
+        """
+        Pick the next healthy replica
+
+        Returns:
+            Replica engine, or None if every replica is ejected
+        """
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                replica = next(self._cycle)
+                if self._ejected_until.get(replica, 0.0) <= now:
+                    return replica
+        return None
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Get each replica's URL and ejection state"""
+        now = time.monotonic()
+        return [
+            {
+                "url": replica.url.render_as_string(),
+                "ejected_for": round(max(self._ejected_until.get(replica, 0.0) - now, 0.0), 3),
+                "checked_out": replica.pool.checkedout(),
+            }
+            for replica in self.engines
+        ]
+
+
+@contextmanager
+def replica_reads(db: Session) -> Iterator[None]:
+    """
+    Allow reads in the block to go to a replica
+
+    Args:
+        db: Session whose reads may be routed
+    """
+    db.info["replica_reads"] = db.info.get("replica_reads", 0) + 1
+    try:
+        yield
+    finally:
+        db.info["replica_reads"] -= 1
+
+
+def bind_user(db: Session, user_id: int, issued_at: Optional[float] = None) -> None:
+    """
+    Associate a session with the user it serves
+
+    Writes the session commits then make the user sticky, and a sticky user's
+    reads stay on the primary.
+
+    Args:
+        db: Request session
+        user_id: Authenticated user ID
+        issued_at: Access token iat; a token this recent means the user just wrote
+    """
+    db.info["user_id"] = user_id
+    fresh_token = issued_at is not None and time.time() - issued_at < settings.REPLICA_STICKY_WINDOW
+    if fresh_token or recent_writers.get(user_id):
+        db.info["primary"] = True
+
+
+def mark_written(db: Session) -> None:
+    """Send the session's remaining reads to the primary"""
+    db.info["primary"] = True
+    db.info["wrote"] = True
+
+
+def reads_pinned(db: Session) -> bool:
+    """Whether the session has written or serves a sticky user"""
+    return bool(db.info.get("primary"))
+
+
+def use_replica(db: Session) -> bool:
+    """Whether the session's next read may go to a replica"""
+    return db.info.get("replica_reads", 0) > 0 and not reads_pinned(db)
+
+
+def record_commit(db: Session) -> None:
+    """Make the session's user sticky if it committed a write"""
+    if db.info.pop("wrote", False):
+        user_id = db.info.get("user_id")
+        if user_id is not None:
+            recent_writers.set(user_id, True)
@@ -0,0 +1,23 @@
+"""
+Response classes for the fast serialization path
+"""
+from typing import Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class SchemaResponse(ORJSONResponse):
+    """
+    Response rendering an already-validated schema directly
+
+    Pydantic models are serialized by pydantic-core's model_dump_json, other
+    content by orjson. Returning this from a route bypasses FastAPI's
+    response_model pass (validate, jsonable_encoder, json.dumps), while the
+    route's response_model still documents the body in OpenAPI. Because that
+    pass is skipped, routes must pass status_code here themselves.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
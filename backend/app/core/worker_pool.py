@@ -0,0 +1,131 @@
+"""
+Bounded worker pool for running CPU-bound work off the event loop
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+from app.core.exceptions import ServiceUnavailableException
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BoundedWorkerPool:
+    """
+    Executor wrapper with a bounded number of pending jobs and a timeout
+
+    Jobs beyond ``max_pending`` are rejected immediately instead of queueing
+    without limit, so a burst of CPU-bound work cannot pile up behind the pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_pending: int,
+        timeout: Optional[float] = None,
+        use_processes: bool = False
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            name: Pool name used in logs and thread names
+            max_workers: Number of worker threads or processes
+            max_pending: Maximum number of submitted jobs (running + queued)
+            timeout: Seconds to wait for a job result before giving up
+            use_processes: Use a process pool instead of a thread pool
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently submitted to the pool"""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        """Create the underlying executor on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.use_processes:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix=self.name
+                        )
+                    logger.info(
+                        "Started %s pool with %s %s",
+                        self.name, self.max_workers, "processes" if self.use_processes else "threads"
+                    )
+        return self._executor
+
+    def _acquire_slot(self) -> None:
+        """Reserve a pending slot or reject the job"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning("%s pool saturated (%s pending jobs)", self.name, self._pending)
+                raise ServiceUnavailableException(
+                    "Server is busy, please retry shortly",
+                    retry_after=1
+                )
+            self._pending += 1
+
+    def _release_slot(self, *_: Any) -> None:
+        """Release a pending slot once the job has finished"""
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a function in the pool and await its result
+
+        Args:
+            func: Function to run (must be picklable when using processes)
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function result
+
+        Raises:
+            ServiceUnavailableException: If the pool is saturated or the job times out
+        """
+        self._acquire_slot()
+        try:
+            future = self._get_executor().submit(partial(func, *args, **kwargs))
+        except Exception:
+            self._release_slot()
+            raise
+
+        # The slot is held until the job really finishes, even if the caller gives up
+        future.add_done_callback(self._release_slot)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s pool job timed out after %ss", self.name, self.timeout)
+            raise ServiceUnavailableException(
+                "Server is busy, please retry shortly",
+                retry_after=1
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying executor"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Stopped %s pool", self.name)
@@ -3,18 +3,30 @@ Main application entry point
 """
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import init_db, check_schema, close_db, close_async_db
 from app.core.logging_config import setup_logging
 from app.core.exceptions import AppException
+from app.core.health_probe import health_probe
+from app.core.middleware import DBTimingMiddleware, MetricsMiddleware
+from app.services.revocation import revocation_list
+from app.utils.jwt_utils import get_jwks_document, password_pool
 from app.api.v1 import api_router
 
 # Setup logging
-setup_logging(log_level="INFO" if not settings.DEBUG else "DEBUG")
+setup_logging(
+    log_level="INFO" if not settings.DEBUG else "DEBUG",
+    json_format=settings.LOG_JSON,
+    max_bytes=settings.LOG_FILE_MAX_BYTES,
+    backup_count=settings.LOG_FILE_BACKUP_COUNT,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    rate_limits=settings.LOG_RATE_LIMITS,
+    sample_rates=settings.LOG_SAMPLE_RATES,
+)
 logger = logging.getLogger(__name__)
 
 
@@ -27,8 +39,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
     try:
-        init_db()
-        logger.info("Database initialized successfully")
+        # DDL only runs when opted in, and is skipped if the schema fingerprint matches.
+        # Without it, missing tables stop startup here rather than in the revocation sync.
+        if settings.DB_AUTO_INIT:
+            init_db()
+        else:
+            check_schema()
+        await health_probe.start()
+        await revocation_list.start()
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
@@ -38,7 +56,11 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application...")
     try:
+        await health_probe.stop()
+        await revocation_list.stop()
+        password_pool.shutdown()
         close_db()
+        await close_async_db()
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
@@ -50,6 +72,7 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -65,19 +88,26 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
+# Report per-request query count, DB time and pool wait
+app.add_middleware(DBTimingMiddleware, server_timing=settings.DB_SERVER_TIMING)
+
+# Record per-route latency for /metrics
+app.add_middleware(MetricsMiddleware)
+
 
 # Global exception handler
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
     """Handle custom application exceptions"""
     logger.error(f"Application exception: {exc.message}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "message": exc.message,
             "details": exc.details
-        }
+        },
+        headers=exc.headers
     )
 
 
@@ -85,7 +115,7 @@ async def app_exception_handler(request: Request, exc: AppException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -112,6 +142,25 @@ async def root():
     }
 
 
+@app.get(
+    "/.well-known/jwks.json",
+    tags=["Root"],
+    summary="JSON Web Key Set",
+    description="Public keys for verifying access tokens without calling this API",
+    responses={304: {"description": "Key set unchanged since the ETag in If-None-Match"}}
+)
+async def jwks(request: Request):
+    """Public token verification keys (empty when tokens use a shared secret)"""
+    body, etag = get_jwks_document()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE}",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/jwk-set+json", headers=headers)
+
+
 # Include API routers
 app.include_router(
     api_router,
@@ -0,0 +1,169 @@
+"""
+Management commands
+
+Usage:
+    python -m app.manage init-db [--force]
+    python -m app.manage calibrate-hasher [--hasher bcrypt] [--target-ms 250]
+    python -m app.manage create-admin --email admin@example.com --full-name "Site Admin" [--password-stdin]
+"""
+import argparse
+import asyncio
+import getpass
+import statistics
+import sys
+import time
+from typing import Any, List, Optional
+from pydantic import ValidationError
+from app.config import settings
+from app.core.exceptions import ValidationException
+from app.utils.password_hashers import PASSWORD_HASHERS, PasswordHasher, get_hasher
+
+# Cost search bounds per algorithm
+COST_BOUNDS = {
+    "bcrypt": (4, 20),
+    "argon2id": (1, 50),
+    "scrypt": (10, 22),
+}
+
+
+def measure_verify_ms(hasher: PasswordHasher, samples: int = 3) -> float:
+    """
+    Measure the median time to verify a password
+
+    Args:
+        hasher: Hasher to measure
+        samples: Number of timed verifications
+
+    Returns:
+        Median verify time in milliseconds
+    """
+    password = "calibration-password"
+    encoded = hasher.hash(password)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(password, encoded)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_hasher(algorithm: str, target_ms: float, samples: int = 3) -> int:
+    """
+    Find the highest cost whose verify time stays within the target
+
+    Args:
+        algorithm: Hasher name
+        target_ms: Target verify time in milliseconds
+        samples: Timed verifications per cost
+
+    Returns:
+        Recommended cost parameter
+    """
+    base = get_hasher(algorithm)
+    low, high = COST_BOUNDS[algorithm]
+    best = low
+    for cost in range(low, high + 1):
+        elapsed = measure_verify_ms(base.with_cost(cost), samples)
+        print(f"  {base.cost_setting}={cost}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = cost
+    return best
+
+
+def create_admin(email: str, full_name: str, password: str) -> Any:
+    """
+    Create an admin account
+    
+    Signup only offers the student and mentor roles, so this is the only
+    way to get an admin.
+    
+    Args:
+        email: Admin email
+        full_name: Admin name
+        password: Admin password
+        
+    Returns:
+        Created user
+        
+    Raises:
+        pydantic.ValidationError: If the details are invalid
+        ValidationException: If the email is already registered
+    """
+    from app.core.database import SessionLocal
+    from app.schemas.auth import AdminCreateRequest
+    from app.services.auth_service import AuthService
+    
+    admin = AdminCreateRequest(full_name=full_name, email=email, password=password)
+    db = SessionLocal()
+    try:
+        return asyncio.run(AuthService.create_user(db, admin))
+    finally:
+        db.close()
+
+
+def read_password(from_stdin: bool) -> Optional[str]:
+    """Read a new password from stdin or an interactive prompt, None if the prompts differ"""
+    if from_stdin:
+        return sys.stdin.readline().rstrip("\n")
+    password = getpass.getpass("Password: ")
+    if getpass.getpass("Repeat password: ") != password:
+        return None
+    return password
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a management command"""
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    init = subparsers.add_parser("init-db", help="Create missing database tables")
+    init.add_argument("--force", action="store_true", help="Run DDL even if the schema fingerprint matches")
+
+    calibrate = subparsers.add_parser(
+        "calibrate-hasher",
+        help="Pick a password hasher cost that meets a target verify time on this host"
+    )
+    calibrate.add_argument("--hasher", choices=list(PASSWORD_HASHERS), default=settings.PASSWORD_HASHER)
+    calibrate.add_argument("--target-ms", type=float, default=250.0)
+    calibrate.add_argument("--samples", type=int, default=3)
+
+    admin = subparsers.add_parser("create-admin", help="Create an admin account")
+    admin.add_argument("--email", required=True)
+    admin.add_argument("--full-name", required=True)
+    admin.add_argument("--password-stdin", action="store_true", help="Read the password from stdin instead of prompting")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "init-db":
+        from app.core.database import close_db, init_db
+        try:
+            init_db(force=args.force)
+        finally:
+            close_db()
+
+    elif args.command == "calibrate-hasher":
+        print(f"Calibrating {args.hasher} for a {args.target_ms:.0f} ms verify time...")
+        cost = calibrate_hasher(args.hasher, args.target_ms, args.samples)
+        print(f"\nRecommended setting: {get_hasher(args.hasher).cost_setting}={cost}")
+
+    elif args.command == "create-admin":
+        password = read_password(args.password_stdin)
+        if password is None:
+            print("Passwords do not match", file=sys.stderr)
+            return 1
+        try:
+            user = create_admin(args.email, args.full_name, password)
+        except ValidationError as e:
+            print(f"Invalid admin details:\n{e}", file=sys.stderr)
+            return 1
+        except ValidationException as e:
+            print(e.message, file=sys.stderr)
+            return 1
+        print(f"Created admin {user.email} (ID {user.id})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
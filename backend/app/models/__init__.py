@@ -4,5 +4,7 @@ Import all models here for easy access
 """
 from app.core.database import Base
 from .user import User, UserRole
+from .refresh_token import RefreshToken
+from .revoked_token import RevokedToken
 
-__all__ = ["Base", "User", "UserRole"]
+__all__ = ["Base", "User", "UserRole", "RefreshToken", "RevokedToken"]
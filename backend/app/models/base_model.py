@@ -1,23 +1,59 @@
 """
 Base model class with common fields and methods
 """
-from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy import Column, Integer, DateTime, Index
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class utcnow(FunctionElement):
+    """Current UTC timestamp evaluated by the database"""
+    
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element, compiler, **kw):
+    # SQLite stores datetimes as text and compares them as strings, so match
+    # the YYYY-MM-DD HH:MM:SS.ffffff format SQLAlchemy binds parameters in
+    # (%f gives milliseconds); CURRENT_TIMESTAMP has no fraction and sorts
+    # before an equal bound value, which breaks keyset cursors
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
 
 
 class BaseModel:
     """Base model with common fields and methods"""
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Timestamps are set by the database and returned with INSERT/UPDATE ... RETURNING
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
+    
+    # Fetch server-generated values in the same statement instead of a reload
+    __mapper_args__ = {"eager_defaults": True}
     
     @declared_attr
     def __tablename__(cls):
         """Generate table name from class name"""
         return cls.__name__.lower() + 's'
     
+    @declared_attr
+    def __table_args__(cls):
+        """Index backing keyset pagination ordered by (created_at, id)"""
+        return (Index(f"ix_{cls.__tablename__}_created_at_id", "created_at", "id"),)
+    
     def to_dict(self):
         """Convert model instance to dictionary"""
         return {
@@ -0,0 +1,27 @@
+"""
+Refresh token model for rotation and reuse detection
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.models.base_model import BaseModel
+from app.core.database import Base
+
+
+class RefreshToken(Base, BaseModel):
+    """
+    Issued refresh token, stored by the SHA-256 of its jti claim
+    
+    Each refresh spends the presented token and issues a successor in the
+    same family; presenting a spent token again revokes the whole family.
+    """
+    
+    __tablename__ = "refresh_tokens"
+    
+    jti_hash = Column(String(64), unique=True, index=True, nullable=False)
+    family_id = Column(String(32), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id={self.family_id})>"
@@ -0,0 +1,24 @@
+"""
+Revoked access token model
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.models.base_model import BaseModel
+from app.core.database import Base
+
+
+class RevokedToken(Base, BaseModel):
+    """
+    Access token revoked before its expiry, identified by its jti claim
+    
+    Rows only matter until expires_at; after that the token is rejected on
+    its own and the row can be pruned.
+    """
+    
+    __tablename__ = "revoked_tokens"
+    
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    
+    def __repr__(self):
+        return f"<RevokedToken(id={self.id}, user_id={self.user_id}, jti={self.jti})>"
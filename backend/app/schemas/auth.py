@@ -21,7 +21,8 @@ class SignUpRequest(BaseSchema):
     full_name: str = Field(..., min_length=2, max_length=255)
     email: EmailStr
     password: str = Field(..., min_length=8, max_length=72)
-    role: str = Field(..., pattern="^(student|mentor|admin)$")
+    # Admins are created out of band with `python -m app.manage create-admin`
+    role: str = Field(..., pattern="^(student|mentor)$")
     
     @validator('full_name')
     def validate_full_name(cls, v):
@@ -30,6 +31,12 @@ class SignUpRequest(BaseSchema):
         return v.strip()
 
 
+class AdminCreateRequest(SignUpRequest):
+    """Schema for creating an admin account from the management CLI"""
+    
+    role: str = Field(default="admin", pattern="^admin$")
+
+
 class LoginRequest(BaseSchema):
     """Schema for user login"""
     
@@ -43,6 +50,12 @@ class TokenRefreshRequest(BaseSchema):
     refresh_token: str
 
 
+class LogoutRequest(BaseSchema):
+    """Schema for logout"""
+    
+    refresh_token: Optional[str] = None  # Also revoke the login this refresh token belongs to
+
+
 # Response Schemas
 class TokenResponse(BaseSchema):
     """Schema for authentication token response"""
@@ -55,16 +55,27 @@ class PaginationSchema(BaseSchema):
     page_size: int = 10
     total: int
     total_pages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
     
     @classmethod
-    def create(cls, total: int, page: int = 1, page_size: int = 10):
+    def create(
+        cls,
+        total: int,
+        page: int = 1,
+        page_size: int = 10,
+        next_cursor: Optional[str] = None,
+        prev_cursor: Optional[str] = None
+    ):
         """Create pagination instance with calculated total_pages"""
         total_pages = (total + page_size - 1) // page_size
         return cls(
             page=page,
             page_size=page_size,
             total=total,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
         )
 
 
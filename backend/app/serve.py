@@ -0,0 +1,84 @@
+"""
+Production server entry point
+
+Runs WEB_CONCURRENCY uvicorn workers under gunicorn:
+
+    python -m app.serve
+
+The app is imported once in the parent and forked into the workers. Each
+worker's connection pools are sized from DB_MAX_CONNECTIONS (see
+Settings.db_pool_limits), workers are replaced after WORKER_MAX_REQUESTS
+requests, and SIGTERM lets in-flight requests finish for up to
+WORKER_GRACEFUL_TIMEOUT seconds. `python -m app.main` remains the
+single-process development server.
+"""
+from typing import Any, Dict
+from gunicorn.app.base import BaseApplication
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """Reset process-local state inherited from the preloaded parent"""
+    from app.core.database import dispose_engines_after_fork
+    from app.core.logging_config import restart_logging_after_fork
+
+    restart_logging_after_fork()
+    dispose_engines_after_fork()
+
+
+def get_server_options() -> Dict[str, Any]:
+    """
+    Get the gunicorn configuration from settings
+
+    Returns:
+        gunicorn setting name -> value
+    """
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": settings.WEB_CONCURRENCY,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": settings.WORKER_MAX_REQUESTS,
+        "max_requests_jitter": settings.WORKER_MAX_REQUESTS_JITTER,
+        "timeout": settings.WORKER_TIMEOUT,
+        "graceful_timeout": settings.WORKER_GRACEFUL_TIMEOUT,
+        "keepalive": settings.WORKER_KEEPALIVE,
+        "post_fork": post_fork,
+    }
+
+
+class Server(BaseApplication):
+    """gunicorn application serving app.main:app"""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        # Imported once in the parent (preload_app), which also sets up logging
+        from app.main import app
+
+        limits = settings.db_pool_limits
+        connections = settings.WEB_CONCURRENCY * sum(sum(engine_limits) for engine_limits in limits.values())
+        logger.info(
+            "Serving with %s workers (sync pool %s + %s overflow, "
+            "async pool %s + %s overflow per worker, up to %s connections)",
+            settings.WEB_CONCURRENCY, *limits["sync"], *limits["async"], connections
+        )
+        return app
+
+
+def main() -> None:
+    """Start the server"""
+    Server(get_server_options()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """
 Business logic services package
 """
-from .base_service import BaseService
+from .base_service import BaseService, AsyncBaseService, CursorPage
 
-__all__ = ["BaseService"]
+__all__ = ["BaseService", "AsyncBaseService", "CursorPage"]
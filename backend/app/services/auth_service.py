@@ -1,24 +1,79 @@
 """
 Authentication service for user registration and login
 """
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+from app.core.database import get_dialect_insert
+from app.core.replicas import bind_user, replica_reads
 from app.models.user import User, UserRole
 from app.schemas.auth import SignUpRequest, LoginRequest, UserResponse, TokenResponse
-from app.utils.jwt_utils import hash_password, verify_password, create_access_token, create_refresh_token
-from app.core.exceptions import ValidationException, AuthenticationException, DatabaseException
+from app.utils.jwt_utils import (
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    create_access_token,
+    decode_token,
+    verify_token_type,
+)
+from app.services.user_cache import UserSnapshot, user_cache
+from app.services.revocation import revocation_list
+from app.services.token_store import (
+    spent_tokens,
+    hash_jti,
+    issue_refresh_token,
+    build_spend_query,
+    build_lookup_query,
+    build_revoke_family_query,
+)
+from app.core.exceptions import (
+    ValidationException,
+    AuthenticationException,
+    DatabaseException,
+    ServiceUnavailableException,
+)
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def build_signup_query(dialect_name: str, signup_data: SignUpRequest, password_hash: str) -> Any:
+    """
+    Build the INSERT ... ON CONFLICT (email) DO NOTHING RETURNING statement for signup
+    
+    Args:
+        dialect_name: Dialect of the bound engine
+        signup_data: User registration data
+        password_hash: Hashed password
+        
+    Returns:
+        Statement returning the new user, or no row if the email is taken
+    """
+    insert = get_dialect_insert(dialect_name)
+    return (
+        insert(User)
+        .values(
+            full_name=signup_data.full_name,
+            email=signup_data.email,
+            password_hash=password_hash,
+            role=UserRole(signup_data.role),
+            is_active=True,
+            is_verified=False
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
+    )
+
+
 class AuthService:
     """Service for authentication operations"""
     
     @staticmethod
-    def create_user(db: Session, signup_data: SignUpRequest) -> User:
+    async def create_user(db: Session, signup_data: SignUpRequest) -> User:
         """
         Create a new user
         
@@ -32,46 +87,39 @@ class AuthService:
         Raises:
             ValidationException: If email already exists
             DatabaseException: If database error occurs
+            ServiceUnavailableException: If the password pool is saturated
         """
         try:
-            # Check if user already exists
-            existing_user = db.query(User).filter(User.email == signup_data.email).first()
-            if existing_user:
-                raise ValidationException("Email already registered")
-            
-            # Hash the password
-            password_hash = hash_password(signup_data.password)
+            # Hash the password off the event loop
+            password_hash = await hash_password_async(signup_data.password)
             
-            # Create user instance
-            new_user = User(
-                full_name=signup_data.full_name,
-                email=signup_data.email,
-                password_hash=password_hash,
-                role=UserRole(signup_data.role),
-                is_active=True,
-                is_verified=False
-            )
+            # Insert in one round trip; a duplicate email hits the unique
+            # constraint and returns no row instead of needing a pre-check
+            stmt = build_signup_query(db.get_bind().dialect.name, signup_data, password_hash)
+            new_user = db.scalars(stmt).first()
+            if new_user is None:
+                db.rollback()
+                raise ValidationException("Email already registered")
             
-            db.add(new_user)
             db.commit()
-            db.refresh(new_user)
+            user_cache.invalidate(new_user.id)
             
-            logger.info(f"User created successfully: {new_user.email}")
+            logger.info("User created successfully: %s", new_user.email)
             return new_user
             
-        except ValidationException:
+        except (ValidationException, ServiceUnavailableException):
             raise
         except IntegrityError as e:
             db.rollback()
-            logger.error(f"Database integrity error: {str(e)}")
+            logger.error("Database integrity error: %s", e)
             raise ValidationException("Email already registered")
         except Exception as e:
             db.rollback()
-            logger.error(f"Error creating user: {str(e)}")
+            logger.error("Error creating user: %s", e)
             raise DatabaseException("Failed to create user")
     
     @staticmethod
-    def authenticate_user(db: Session, login_data: LoginRequest) -> Optional[User]:
+    async def authenticate_user(db: Session, login_data: LoginRequest) -> Optional[User]:
         """
         Authenticate a user with email and password
         
@@ -81,39 +129,69 @@ class AuthService:
             
         Returns:
             User instance if authentication successful, None otherwise
+            
+        Raises:
+            ServiceUnavailableException: If the password pool is saturated
         """
         try:
             user = db.query(User).filter(User.email == login_data.email).first()
             
             if not user:
-                logger.warning(f"Login attempt with non-existent email: {login_data.email}")
+                logger.warning("Login attempt with non-existent email: %s", login_data.email)
                 return None
             
-            if not verify_password(login_data.password, user.password_hash):
-                logger.warning(f"Failed login attempt for user: {login_data.email}")
+            if not await verify_password_async(login_data.password, user.password_hash):
+                logger.warning("Failed login attempt for user: %s", login_data.email)
                 return None
             
             if not user.is_active:
-                logger.warning(f"Login attempt for inactive user: {login_data.email}")
+                logger.warning("Login attempt for inactive user: %s", login_data.email)
                 return None
             
-            logger.info(f"User authenticated successfully: {user.email}")
+            if password_needs_rehash(user.password_hash):
+                await AuthService._upgrade_password_hash(db, user, login_data.password)
+            
+            logger.info("User authenticated successfully: %s", user.email)
             return user
             
+        except ServiceUnavailableException:
+            raise
         except Exception as e:
-            logger.error(f"Error authenticating user: {str(e)}")
+            logger.error("Error authenticating user: %s", e)
             return None
     
     @staticmethod
-    def generate_tokens(user: User) -> TokenResponse:
+    async def _upgrade_password_hash(db: Session, user: User, password: str) -> None:
         """
-        Generate access and refresh tokens for a user
+        Replace an outdated password hash after a successful verify
+        
+        Failures are logged and ignored; the login itself still succeeds.
         
         Args:
-            user: User instance
+            db: Database session
+            user: Authenticated user
+            password: Verified plain text password
+        """
+        try:
+            user.password_hash = await hash_password_async(password)
+            db.commit()
+            user_cache.invalidate(user.id)
+            logger.info("Upgraded password hash for user: %s", user.email)
+        except Exception as e:
+            db.rollback()
+            logger.error("Error upgrading password hash: %s", e)
+    
+    @staticmethod
+    def _build_tokens(user: Union[User, UserSnapshot], family_id: Optional[str] = None) -> Tuple[TokenResponse, Any]:
+        """
+        Create a token pair and the statement recording its refresh token
+        
+        Args:
+            user: User instance or snapshot
+            family_id: Rotation family to continue, or None for a new login
             
         Returns:
-            TokenResponse with access and refresh tokens
+            Tuple of (TokenResponse, INSERT statement for the refresh token)
         """
         token_data = {
             "sub": str(user.id),
@@ -122,47 +200,430 @@ class AuthService:
         }
         
         access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token({"sub": str(user.id)})
+        refresh_token, stmt = issue_refresh_token(user.id, family_id)
         
-        return TokenResponse(
+        tokens = TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer",
             expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
         )
+        return tokens, stmt
     
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
+    def _spendable_jti_hash(refresh_token: str) -> str:
         """
-        Get user by ID
+        Verify a refresh token's signature and claims
+        
+        Args:
+            refresh_token: Encoded refresh token
+            
+        Returns:
+            Hashed jti used as the token store key
+            
+        Raises:
+            AuthenticationException: If the token is invalid or not a refresh token
+        """
+        payload = decode_token(refresh_token)
+        verify_token_type(payload, "refresh")
+        jti = payload.get("jti")
+        if not isinstance(jti, str):
+            # Issued before rotation existed; the user has to log in again
+            raise AuthenticationException("Invalid or expired refresh token")
+        return hash_jti(jti)
+    
+    @staticmethod
+    def generate_tokens(db: Session, user: Union[User, UserSnapshot], family_id: Optional[str] = None) -> TokenResponse:
+        """
+        Generate access and refresh tokens for a user and store the refresh token
+        
+        Args:
+            db: Database session
+            user: User instance or snapshot
+            family_id: Rotation family to continue, or None for a new login
+            
+        Returns:
+            TokenResponse with access and refresh tokens
+        """
+        tokens, stmt = AuthService._build_tokens(user, family_id)
+        bind_user(db, user.id)
+        db.execute(stmt)
+        db.commit()
+        return tokens
+    
+    @staticmethod
+    def _reject_refresh(db: Session, jti_hash: str, now: datetime) -> None:
+        """
+        Explain a refresh token that could not be spent, revoking its family on reuse
+        
+        Raises:
+            AuthenticationException: Always
+        """
+        spent = spent_tokens.get(jti_hash)
+        if spent is None:
+            record = db.execute(build_lookup_query(jti_hash)).first()
+            if record is not None and record.used_at is not None:
+                spent = (record.user_id, record.family_id)
+        
+        if spent is not None:
+            user_id, family_id = spent
+            db.execute(build_revoke_family_query(family_id, now))
+            db.commit()
+            logger.warning("Refresh token reuse for user %s, revoked token family %s", user_id, family_id)
+        
+        raise AuthenticationException("Invalid or expired refresh token")
+    
+    @staticmethod
+    def refresh_tokens(db: Session, refresh_token: str) -> TokenResponse:
+        """
+        Exchange a refresh token for a new token pair
+        
+        The presented token is spent and replaced by a successor in the same
+        family. Presenting an already spent token again means it leaked, so
+        the whole family is revoked and the legitimate holder has to log in
+        again too.
+        
+        Args:
+            db: Database session
+            refresh_token: Encoded refresh token
+            
+        Returns:
+            TokenResponse with the new access and refresh tokens
+            
+        Raises:
+            AuthenticationException: If the token is invalid, expired, revoked or reused
+        """
+        jti_hash = AuthService._spendable_jti_hash(refresh_token)
+        now = datetime.utcnow()
+        
+        # A token known to be spent goes straight to reuse handling
+        spent = None
+        if spent_tokens.get(jti_hash) is None:
+            spent = db.execute(build_spend_query(jti_hash, now)).first()
+        if spent is None:
+            db.rollback()
+            AuthService._reject_refresh(db, jti_hash, now)
+        
+        user = AuthService.get_user_by_id(db, spent.user_id)
+        if not user or not user.is_active:
+            db.rollback()
+            raise AuthenticationException("User not found or inactive")
+        
+        tokens = AuthService.generate_tokens(db, user, family_id=spent.family_id)
+        spent_tokens.set(jti_hash, (spent.user_id, spent.family_id))
+        return tokens
+    
+    @staticmethod
+    def logout(db: Session, payload: Dict[str, Any], refresh_token: Optional[str] = None) -> None:
+        """
+        Revoke the current access token and optionally its refresh token family
+        
+        Args:
+            db: Database session
+            payload: Verified claims of the access token
+            refresh_token: Refresh token of the same login, if the client has one
+            
+        Raises:
+            AuthenticationException: If the refresh token is invalid or belongs to another user
+        """
+        user_id = int(payload["sub"])
+        
+        if refresh_token:
+            jti_hash = AuthService._spendable_jti_hash(refresh_token)
+            record = db.execute(build_lookup_query(jti_hash)).first()
+            if record is None or record.user_id != user_id:
+                raise AuthenticationException("Invalid or expired refresh token")
+            db.execute(build_revoke_family_query(record.family_id, datetime.utcnow()))
+            db.commit()
+        
+        # Tokens issued before revocation support have no jti and simply expire
+        jti = payload.get("jti")
+        if jti:
+            revocation_list.revoke(db, jti, user_id, datetime.utcfromtimestamp(payload["exp"]))
+        
+        logger.info("User %s logged out", user_id)
+    
+    @staticmethod
+    def get_user_by_id(db: Session, user_id: int) -> Optional[UserSnapshot]:
+        """
+        Get user by ID, served from the user cache when possible
         
         Args:
             db: Database session
             user_id: User ID
             
         Returns:
-            User instance or None
+            Immutable user snapshot or None
         """
+        snapshot = user_cache.get_by_id(user_id)
+        if snapshot is not None:
+            return snapshot
+        
         try:
-            return db.query(User).filter(User.id == user_id).first()
+            generation = user_cache.generation
+            with replica_reads(db):
+                user = db.query(User).filter(User.id == user_id).first()
+            return user_cache.put(user, generation) if user else None
         except Exception as e:
-            logger.error(f"Error getting user by ID: {str(e)}")
+            logger.error("Error getting user by ID: %s", e)
             return None
     
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    def get_user_by_email(db: Session, email: str) -> Optional[UserSnapshot]:
         """
-        Get user by email
+        Get user by email, served from the user cache when possible
         
         Args:
             db: Database session
             email: User email
             
         Returns:
-            User instance or None
+            Immutable user snapshot or None
+        """
+        snapshot = user_cache.get_by_email(email)
+        if snapshot is not None:
+            return snapshot
+        
+        try:
+            generation = user_cache.generation
+            with replica_reads(db):
+                user = db.query(User).filter(User.email == email).first()
+            return user_cache.put(user, generation) if user else None
+        except Exception as e:
+            logger.error("Error getting user by email: %s", e)
+            return None
+
+
+class AsyncAuthService:
+    """Async counterpart of AuthService for use with AsyncSession"""
+    
+    @staticmethod
+    async def generate_tokens(db: AsyncSession, user: Union[User, UserSnapshot], family_id: Optional[str] = None) -> TokenResponse:
+        """
+        Generate access and refresh tokens for a user and store the refresh token
+        
+        Args:
+            db: Async database session
+            user: User instance or snapshot
+            family_id: Rotation family to continue, or None for a new login
+            
+        Returns:
+            TokenResponse with access and refresh tokens
+        """
+        tokens, stmt = AuthService._build_tokens(user, family_id)
+        await db.execute(stmt)
+        await db.commit()
+        return tokens
+    
+    @staticmethod
+    async def _reject_refresh(db: AsyncSession, jti_hash: str, now: datetime) -> None:
         """
+        Explain a refresh token that could not be spent, revoking its family on reuse
+        
+        Raises:
+            AuthenticationException: Always
+        """
+        spent = spent_tokens.get(jti_hash)
+        if spent is None:
+            record = (await db.execute(build_lookup_query(jti_hash))).first()
+            if record is not None and record.used_at is not None:
+                spent = (record.user_id, record.family_id)
+        
+        if spent is not None:
+            user_id, family_id = spent
+            await db.execute(build_revoke_family_query(family_id, now))
+            await db.commit()
+            logger.warning("Refresh token reuse for user %s, revoked token family %s", user_id, family_id)
+        
+        raise AuthenticationException("Invalid or expired refresh token")
+    
+    @staticmethod
+    async def refresh_tokens(db: AsyncSession, refresh_token: str) -> TokenResponse:
+        """
+        Exchange a refresh token for a new token pair
+        
+        Args:
+            db: Async database session
+            refresh_token: Encoded refresh token
+            
+        Returns:
+            TokenResponse with the new access and refresh tokens
+            
+        Raises:
+            AuthenticationException: If the token is invalid, expired, revoked or reused
+        """
+        jti_hash = AuthService._spendable_jti_hash(refresh_token)
+        now = datetime.utcnow()
+        
+        spent = None
+        if spent_tokens.get(jti_hash) is None:
+            spent = (await db.execute(build_spend_query(jti_hash, now))).first()
+        if spent is None:
+            await db.rollback()
+            await AsyncAuthService._reject_refresh(db, jti_hash, now)
+        
+        user = await AsyncAuthService.get_user_by_id(db, spent.user_id)
+        if not user or not user.is_active:
+            await db.rollback()
+            raise AuthenticationException("User not found or inactive")
+        
+        tokens = await AsyncAuthService.generate_tokens(db, user, family_id=spent.family_id)
+        spent_tokens.set(jti_hash, (spent.user_id, spent.family_id))
+        return tokens
+    
+    @staticmethod
+    async def _upgrade_password_hash(db: AsyncSession, user: User, password: str) -> None:
+        """
+        Replace an outdated password hash after a successful verify
+        
+        Failures are logged and ignored; the login itself still succeeds.
+        
+        Args:
+            db: Async database session
+            user: Authenticated user
+            password: Verified plain text password
+        """
+        try:
+            user.password_hash = await hash_password_async(password)
+            await db.commit()
+            user_cache.invalidate(user.id)
+            logger.info("Upgraded password hash for user: %s", user.email)
+        except Exception as e:
+            await db.rollback()
+            logger.error("Error upgrading password hash: %s", e)
+    
+    @staticmethod
+    async def create_user(db: AsyncSession, signup_data: SignUpRequest) -> User:
+        """
+        Create a new user
+        
+        Args:
+            db: Async database session
+            signup_data: User registration data
+            
+        Returns:
+            Created user instance
+            
+        Raises:
+            ValidationException: If email already exists
+            DatabaseException: If database error occurs
+            ServiceUnavailableException: If the password pool is saturated
+        """
+        try:
+            # Hash the password off the event loop
+            password_hash = await hash_password_async(signup_data.password)
+            
+            # Insert in one round trip; a duplicate email hits the unique
+            # constraint and returns no row instead of needing a pre-check
+            stmt = build_signup_query(db.get_bind().dialect.name, signup_data, password_hash)
+            new_user = (await db.scalars(stmt)).first()
+            if new_user is None:
+                await db.rollback()
+                raise ValidationException("Email already registered")
+            
+            await db.commit()
+            user_cache.invalidate(new_user.id)
+            
+            logger.info("User created successfully: %s", new_user.email)
+            return new_user
+            
+        except (ValidationException, ServiceUnavailableException):
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            logger.error("Database integrity error: %s", e)
+            raise ValidationException("Email already registered")
+        except Exception as e:
+            await db.rollback()
+            logger.error("Error creating user: %s", e)
+            raise DatabaseException("Failed to create user")
+    
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, login_data: LoginRequest) -> Optional[User]:
+        """
+        Authenticate a user with email and password
+        
+        Args:
+            db: Async database session
+            login_data: Login credentials
+            
+        Returns:
+            User instance if authentication successful, None otherwise
+            
+        Raises:
+            ServiceUnavailableException: If the password pool is saturated
+        """
+        try:
+            user = await db.scalar(select(User).where(User.email == login_data.email))
+            
+            if not user:
+                logger.warning("Login attempt with non-existent email: %s", login_data.email)
+                return None
+            
+            if not await verify_password_async(login_data.password, user.password_hash):
+                logger.warning("Failed login attempt for user: %s", login_data.email)
+                return None
+            
+            if not user.is_active:
+                logger.warning("Login attempt for inactive user: %s", login_data.email)
+                return None
+            
+            if password_needs_rehash(user.password_hash):
+                await AsyncAuthService._upgrade_password_hash(db, user, login_data.password)
+            
+            logger.info("User authenticated successfully: %s", user.email)
+            return user
+            
+        except ServiceUnavailableException:
+            raise
+        except Exception as e:
+            logger.error("Error authenticating user: %s", e)
+            return None
+    
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[UserSnapshot]:
+        """
+        Get user by ID, served from the user cache when possible
+        
+        Args:
+            db: Async database session
+            user_id: User ID
+            
+        Returns:
+            Immutable user snapshot or None
+        """
+        snapshot = user_cache.get_by_id(user_id)
+        if snapshot is not None:
+            return snapshot
+        
+        try:
+            generation = user_cache.generation
+            user = await db.get(User, user_id)
+            return user_cache.put(user, generation) if user else None
+        except Exception as e:
+            logger.error("Error getting user by ID: %s", e)
+            return None
+    
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[UserSnapshot]:
+        """
+        Get user by email, served from the user cache when possible
+        
+        Args:
+            db: Async database session
+            email: User email
+            
+        Returns:
+            Immutable user snapshot or None
+        """
+        snapshot = user_cache.get_by_email(email)
+        if snapshot is not None:
+            return snapshot
+        
         try:
-            return db.query(User).filter(User.email == email).first()
+            generation = user_cache.generation
+            user = await db.scalar(select(User).where(User.email == email))
+            return user_cache.put(user, generation) if user else None
         except Exception as e:
-            logger.error(f"Error getting user by email: {str(e)}")
+            logger.error("Error getting user by email: %s", e)
             return None
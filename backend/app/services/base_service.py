@@ -1,17 +1,282 @@
 """
 Base service class with common CRUD operations
 """
-from typing import TypeVar, Generic, Type, Optional, List, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.core.database import Base
-from app.core.exceptions import NotFoundException, DatabaseException
+from typing import (
+    TypeVar, Generic, Type, Optional, List, Any, Callable, Dict, Iterable, Iterator, NamedTuple, Sequence, Tuple
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import Select, and_, bindparam, delete, insert, inspect, select, tuple_, update
+from app.config import settings
+from app.core.database import Base, get_dialect_insert
+from app.core.replicas import reads_pinned, replica_reads
+from app.models.base_model import utcnow
+from app.core.exceptions import NotFoundException, DatabaseException, ValidationException, AppException
+from app.services.counting import (
+    COUNT_CACHED,
+    COUNT_ESTIMATED,
+    build_count_query,
+    build_estimate_query,
+    count_cache,
+    parse_estimate,
+    resolve_strategy,
+    supports_estimates,
+)
+from app.utils.cursor import CURSOR_NEXT, CURSOR_PREV, decode_cursor, encode_cursor
+from app.utils.helpers import chunked
+from app.utils.singleflight import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Default keyset ordering, backed by the (created_at, id) index on BaseModel
+DEFAULT_KEYSET_ORDER: Tuple[str, ...] = ("created_at", "id")
+
+
+class CursorPage(NamedTuple):
+    """One page of keyset-paginated results"""
+    
+    items: List[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+# Concurrent get_by_id calls for the same row share one query
+get_by_id_flight = SingleFlight("get_by_id")
+
+
+def _shares_reads(db: Any) -> bool:
+    """Whether a session may take a row another session loaded"""
+    # A session that wrote, or has changes waiting to flush, must see its own changes
+    return not (reads_pinned(db) or db.new or db.dirty or db.deleted)
+
+
+# Callbacks notified with the ID of each committed change, per model class
+_change_listeners: Dict[type, List[Callable[[int], None]]] = {}
+
+
+def register_change_listener(model: type, callback: Callable[[int], None]) -> None:
+    """
+    Register a callback run after a row of a model is changed and committed
+    
+    Args:
+        model: SQLAlchemy model class
+        callback: Function receiving the changed record ID
+    """
+    _change_listeners.setdefault(model, []).append(callback)
+
+
+def notify_change(model: type, ids: Iterable[int]) -> None:
+    """
+    Notify change listeners about committed changes
+    
+    Args:
+        model: SQLAlchemy model class
+        ids: IDs of the changed records
+    """
+    listeners = _change_listeners.get(model)
+    if not listeners:
+        return
+    for id in ids:
+        for callback in listeners:
+            try:
+                callback(id)
+            except Exception as e:
+                logger.error("Change listener error for %s %s: %s", model.__name__, id, e)
+
+
+def build_filter_conditions(model: Type[ModelType], filters: Optional[dict]) -> list:
+    """
+    Build equality filter conditions for a model
+    
+    Args:
+        model: SQLAlchemy model class
+        filters: Optional dictionary of filters (unknown keys are ignored)
+        
+    Returns:
+        List of SQLAlchemy filter expressions
+    """
+    if not filters:
+        return []
+    return [
+        getattr(model, key) == value
+        for key, value in filters.items()
+        if hasattr(model, key)
+    ]
+
+
+def column_values(model: Type[ModelType], obj_in: dict) -> dict:
+    """
+    Keep only the entries of obj_in that map to model columns
+    
+    Args:
+        model: SQLAlchemy model class
+        obj_in: Dictionary with model data
+        
+    Returns:
+        Dictionary of column values
+    """
+    columns = inspect(model).column_attrs.keys()
+    return {key: value for key, value in obj_in.items() if key in columns}
+
+
+def snapshot_row(db_obj: Optional[Any]) -> Tuple[Optional[Any], Optional[dict]]:
+    """
+    Pair a loaded instance with a copy of its column values
+    
+    Runs inside a single flight, right after the leader's query, so the
+    values are taken before the leader's code can change the instance.
+    
+    Args:
+        db_obj: Instance loaded by the leader, or None
+        
+    Returns:
+        Tuple of (instance for the leader, column values for followers)
+    """
+    if db_obj is None:
+        return None, None
+    return db_obj, {attr.key: getattr(db_obj, attr.key) for attr in inspect(db_obj).mapper.column_attrs}
+
+
+def detached_copy(model: Type[ModelType], values: dict) -> ModelType:
+    """
+    Build a clean detached instance from column values loaded by another session
+    
+    Args:
+        model: SQLAlchemy model class
+        values: Column values from snapshot_row
+        
+    Returns:
+        Instance with no pending changes, ready for merge(load=False)
+    """
+    db_obj = model(**values)
+    make_transient_to_detached(db_obj)
+    return db_obj
+
+
+def build_update_query(model: Type[ModelType], id: int, obj_in: dict) -> Any:
+    """
+    Build an UPDATE ... RETURNING statement for one record
+    
+    Args:
+        model: SQLAlchemy model class
+        id: Record ID
+        obj_in: Dictionary with updated data (non-column keys are ignored)
+        
+    Returns:
+        Statement returning the updated instance, or nothing if the ID does not exist
+    """
+    return (
+        update(model)
+        .where(model.id == id)
+        .values(**column_values(model, obj_in))
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+
+
+def build_keyset_query(
+    model: Type[ModelType],
+    limit: int,
+    cursor: Optional[str] = None,
+    filters: Optional[dict] = None,
+    order_by: Sequence[str] = DEFAULT_KEYSET_ORDER
+) -> Tuple[Select, list, str]:
+    """
+    Build a keyset pagination query
+    
+    Args:
+        model: SQLAlchemy model class
+        limit: Page size
+        cursor: Optional cursor from a previous page
+        filters: Optional dictionary of filters
+        order_by: Names of indexed columns to order by; "id" is appended as tie-breaker
+        
+    Returns:
+        Tuple of (statement fetching limit + 1 rows, ordering columns, direction)
+        
+    Raises:
+        ValidationException: If the ordering or cursor is invalid
+    """
+    names = list(order_by)
+    if "id" not in names:
+        names.append("id")
+    
+    try:
+        columns = [getattr(model, name) for name in names]
+    except AttributeError as e:
+        raise ValidationException(f"Invalid ordering column: {str(e)}")
+    
+    stmt = select(model)
+    filter_conditions = build_filter_conditions(model, filters)
+    
+    direction = CURSOR_NEXT
+    if cursor:
+        values, direction = decode_cursor(cursor, [_python_type(column) for column in columns])
+        if direction == CURSOR_NEXT:
+            filter_conditions.append(tuple_(*columns) > tuple_(*values))
+        else:
+            filter_conditions.append(tuple_(*columns) < tuple_(*values))
+    
+    if filter_conditions:
+        stmt = stmt.where(and_(*filter_conditions))
+    
+    if direction == CURSOR_NEXT:
+        stmt = stmt.order_by(*[column.asc() for column in columns])
+    else:
+        stmt = stmt.order_by(*[column.desc() for column in columns])
+    
+    return stmt.limit(limit + 1), names, direction
+
+
+def build_cursor_page(
+    rows: List[Any],
+    limit: int,
+    names: List[str],
+    direction: str,
+    has_cursor: bool
+) -> CursorPage:
+    """
+    Turn the rows of a keyset query into a page with cursors
+    
+    Args:
+        rows: Rows returned by the query built with build_keyset_query
+        limit: Page size
+        names: Ordering column names
+        direction: Direction the query was built for
+        has_cursor: Whether the query started from a cursor
+        
+    Returns:
+        CursorPage with items in ascending order
+    """
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    if direction == CURSOR_PREV:
+        items.reverse()
+    
+    def cursor_for(item: Any, cursor_direction: str) -> str:
+        return encode_cursor([getattr(item, name) for name in names], cursor_direction)
+    
+    # Coming back from a later page means a next page exists, and vice versa
+    more_after = has_more if direction == CURSOR_NEXT else True
+    more_before = has_cursor if direction == CURSOR_NEXT else has_more
+    
+    return CursorPage(
+        items=items,
+        next_cursor=cursor_for(items[-1], CURSOR_NEXT) if items and more_after else None,
+        prev_cursor=cursor_for(items[0], CURSOR_PREV) if items and more_before else None,
+    )
+
+
+def _python_type(column: Any) -> type:
+    """Get the Python type of a column, falling back to object"""
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return object
+
 
 class BaseService(Generic[ModelType]):
     """
@@ -40,7 +305,18 @@ class BaseService(Generic[ModelType]):
             Model instance or None
         """
         try:
-            return db.query(self.model).filter(self.model.id == id).first()
+            with replica_reads(db):
+                if not _shares_reads(db):
+                    return db.query(self.model).filter(self.model.id == id).first()
+                
+                (db_obj, values), shared = get_by_id_flight.do(
+                    (self.model, id),
+                    lambda: snapshot_row(db.query(self.model).filter(self.model.id == id).first())
+                )
+            if not shared or values is None:
+                return db_obj
+            # The leader's instance belongs to its session; attach our own copy without a query
+            return db.merge(detached_copy(self.model, values), load=False)
         except Exception as e:
             logger.error(f"Error getting {self.model.__name__} by ID: {str(e)}")
             raise DatabaseException(f"Error retrieving {self.model.__name__}")
@@ -86,44 +362,122 @@ class BaseService(Generic[ModelType]):
         try:
             query = db.query(self.model)
             
-            if filters:
-                filter_conditions = [
-                    getattr(self.model, key) == value
-                    for key, value in filters.items()
-                    if hasattr(self.model, key)
-                ]
-                if filter_conditions:
-                    query = query.filter(and_(*filter_conditions))
+            filter_conditions = build_filter_conditions(self.model, filters)
+            if filter_conditions:
+                query = query.filter(and_(*filter_conditions))
             
-            return query.offset(skip).limit(limit).all()
+            with replica_reads(db):
+                return query.offset(skip).limit(limit).all()
         except Exception as e:
             logger.error(f"Error getting all {self.model.__name__}: {str(e)}")
             raise DatabaseException(f"Error retrieving {self.model.__name__} list")
     
-    def count(self, db: Session, filters: Optional[dict] = None) -> int:
+    def get_page(
+        self,
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[dict] = None,
+        order_by: Sequence[str] = DEFAULT_KEYSET_ORDER
+    ) -> CursorPage:
+        """
+        Get a page of records using keyset (cursor) pagination
+        
+        Unlike get_all, the cost of a page does not grow with its depth.
+        
+        Args:
+            db: Database session
+            limit: Maximum number of records to return
+            cursor: Opaque cursor from a previous page's next_cursor/prev_cursor
+            filters: Optional dictionary of filters
+            order_by: Names of indexed columns to order by
+            
+        Returns:
+            CursorPage with items and cursors for the adjacent pages
+        """
+        try:
+            stmt, names, direction = build_keyset_query(self.model, limit, cursor, filters, order_by)
+            rows = list(db.scalars(stmt).all())
+            return build_cursor_page(rows, limit, names, direction, bool(cursor))
+        except AppException:
+            raise
+        except Exception as e:
+            logger.error("Error getting %s page: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error retrieving {self.model.__name__} list")
+    
+    def stream(
+        self,
+        db: Session,
+        filters: Optional[dict] = None,
+        batch_size: int = 1000
+    ) -> Iterator[ModelType]:
+        """
+        Iterate over all matching records using a server-side cursor
+        
+        Rows are fetched batch_size at a time, so memory stays flat regardless
+        of table size as long as the caller does not keep the yielded instances.
+        
+        Args:
+            db: Database session (must stay open while iterating)
+            filters: Optional dictionary of filters
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            Model instances ordered by ID
+        """
+        stmt = select(self.model).order_by(self.model.id)
+        
+        filter_conditions = build_filter_conditions(self.model, filters)
+        if filter_conditions:
+            stmt = stmt.where(and_(*filter_conditions))
+        
+        try:
+            # yield_per implies stream_results, i.e. a server-side cursor
+            result = db.scalars(stmt.execution_options(yield_per=batch_size))
+            for partition in result.partitions():
+                yield from partition
+        except Exception as e:
+            logger.error("Error streaming %s: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error retrieving {self.model.__name__} list")
+    
+    def count(
+        self,
+        db: Session,
+        filters: Optional[dict] = None,
+        strategy: Optional[str] = None
+    ) -> int:
         """
         Count records with optional filters
         
         Args:
             db: Database session
             filters: Optional dictionary of filters
+            strategy: "exact", "estimated" or "cached" (defaults to DB_COUNT_STRATEGY)
             
         Returns:
-            Total count
+            Total count (approximate for the estimated and cached strategies)
         """
+        strategy = resolve_strategy(strategy)
         try:
-            query = db.query(self.model)
+            filter_conditions = build_filter_conditions(self.model, filters)
             
-            if filters:
-                filter_conditions = [
-                    getattr(self.model, key) == value
-                    for key, value in filters.items()
-                    if hasattr(self.model, key)
-                ]
-                if filter_conditions:
-                    query = query.filter(and_(*filter_conditions))
+            with replica_reads(db):
+                if strategy == COUNT_ESTIMATED and supports_estimates(db.get_bind().dialect.name):
+                    value = db.execute(build_estimate_query(self.model, filter_conditions)).scalar()
+                    estimate = parse_estimate(value, bool(filter_conditions))
+                    if estimate is not None:
+                        return estimate
+                
+                if strategy == COUNT_CACHED:
+                    total = count_cache.get(self.model, filters)
+                    if total is not None:
+                        return total
+                
+                total = db.execute(build_count_query(self.model, filter_conditions)).scalar_one()
             
-            return query.count()
+            if strategy == COUNT_CACHED:
+                count_cache.set(self.model, filters, total)
+            return total
         except Exception as e:
             logger.error(f"Error counting {self.model.__name__}: {str(e)}")
             raise DatabaseException(f"Error counting {self.model.__name__}")
@@ -140,10 +494,10 @@ class BaseService(Generic[ModelType]):
             Created model instance
         """
         try:
-            db_obj = self.model(**obj_in)
-            db.add(db_obj)
+            # Single INSERT ... RETURNING round trip, server defaults included
+            db_obj = db.scalars(insert(self.model).values(**obj_in).returning(self.model)).one()
             db.commit()
-            db.refresh(db_obj)
+            count_cache.adjust(self.model, db_obj, 1)
             logger.info(f"Created {self.model.__name__} with ID: {db_obj.id}")
             return db_obj
         except Exception as e:
@@ -164,14 +518,18 @@ class BaseService(Generic[ModelType]):
             Updated model instance
         """
         try:
-            db_obj = self.get_or_404(db, id)
+            if not column_values(self.model, obj_in):
+                return self.get_or_404(db, id)
             
-            for field, value in obj_in.items():
-                if hasattr(db_obj, field):
-                    setattr(db_obj, field, value)
+            # Single UPDATE ... RETURNING round trip instead of SELECT + UPDATE + reload
+            db_obj = db.scalars(build_update_query(self.model, id, obj_in)).first()
+            if db_obj is None:
+                db.rollback()
+                raise NotFoundException(f"{self.model.__name__} with ID {id} not found")
             
             db.commit()
-            db.refresh(db_obj)
+            notify_change(self.model, [id])
+            count_cache.invalidate(self.model)
             logger.info(f"Updated {self.model.__name__} with ID: {id}")
             return db_obj
         except NotFoundException:
@@ -196,6 +554,8 @@ class BaseService(Generic[ModelType]):
             db_obj = self.get_or_404(db, id)
             db.delete(db_obj)
             db.commit()
+            notify_change(self.model, [id])
+            count_cache.adjust(self.model, db_obj, -1)
             logger.info(f"Deleted {self.model.__name__} with ID: {id}")
             return True
         except NotFoundException:
@@ -204,3 +564,439 @@ class BaseService(Generic[ModelType]):
             db.rollback()
             logger.error(f"Error deleting {self.model.__name__}: {str(e)}")
             raise DatabaseException(f"Error deleting {self.model.__name__}")
+    
+    def bulk_create(
+        self,
+        db: Session,
+        objs_in: List[dict],
+        chunk_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Create many records with multi-row INSERT ... RETURNING
+        
+        Each chunk is inserted in a single statement and committed in its own
+        transaction; chunks committed before a failure are kept.
+        
+        Args:
+            db: Database session
+            objs_in: List of dictionaries with model data
+            chunk_size: Rows per chunk (defaults to DB_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Created model instances
+        """
+        created: List[ModelType] = []
+        try:
+            for chunk in chunked(objs_in, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+                created.extend(db.scalars(insert(self.model).returning(self.model), chunk).all())
+                db.commit()
+            logger.info("Bulk created %s %s records", len(created), self.model.__name__)
+            return created
+        except Exception as e:
+            db.rollback()
+            logger.error("Error bulk creating %s: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error creating {self.model.__name__} records")
+        finally:
+            if created:
+                count_cache.invalidate(self.model)
+    
+    def bulk_update(
+        self,
+        db: Session,
+        objs_in: List[dict],
+        chunk_size: Optional[int] = None
+    ) -> int:
+        """
+        Update many records by primary key with executemany UPDATE statements
+        
+        Rows updating the same set of fields share one executemany statement;
+        IDs that match no record are skipped.
+        
+        Args:
+            db: Database session
+            objs_in: List of dictionaries, each containing "id" and the fields to update
+            chunk_size: Rows per chunk (defaults to DB_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Number of records updated
+        """
+        table = self.model.__table__
+        # Parameters named after columns form the SET clause
+        stmt = update(table).where(table.c.id == bindparam("_id"))
+        updated = 0
+        updated_ids: List[int] = []
+        try:
+            for chunk in chunked(objs_in, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+                by_fields: Dict[Tuple[str, ...], List[dict]] = {}
+                for obj in chunk:
+                    fields = tuple(key for key in obj if key != "id")
+                    by_fields.setdefault(fields, []).append(
+                        {"_id": obj["id"], **{field: obj[field] for field in fields}}
+                    )
+                for params in by_fields.values():
+                    updated += db.execute(stmt, params).rowcount
+                db.commit()
+                updated_ids.extend(obj["id"] for obj in chunk)
+            logger.info("Bulk updated %d %s records", updated, self.model.__name__)
+            return updated
+        except Exception as e:
+            db.rollback()
+            logger.error("Error bulk updating %s: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error updating {self.model.__name__} records")
+        finally:
+            if updated_ids:
+                notify_change(self.model, updated_ids)
+                count_cache.invalidate(self.model)
+    
+    def bulk_upsert(
+        self,
+        db: Session,
+        objs_in: List[dict],
+        conflict_keys: Sequence[str] = ("id",),
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Insert or update many records with INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+        
+        Args:
+            db: Database session
+            objs_in: List of dictionaries with model data (same keys in every row)
+            conflict_keys: Columns of the unique constraint to resolve conflicts on
+            update_fields: Columns to overwrite on conflict (defaults to all given columns
+                except the conflict keys and id)
+            chunk_size: Rows per chunk (defaults to DB_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Inserted or updated model instances
+        """
+        if not objs_in:
+            return []
+        
+        if update_fields is None:
+            update_fields = [
+                key for key in objs_in[0]
+                if key not in conflict_keys and key != "id"
+            ]
+        update_fields = [field for field in update_fields if field != "updated_at"]
+        
+        upserted: List[ModelType] = []
+        try:
+            dialect_insert = get_dialect_insert(db.get_bind().dialect.name)
+            for chunk in chunked(objs_in, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+                stmt = dialect_insert(self.model).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_keys),
+                    set_=self._upsert_set(stmt, update_fields)
+                ).returning(self.model)
+                upserted.extend(
+                    db.scalars(stmt, execution_options={"populate_existing": True}).all()
+                )
+                db.commit()
+            logger.info("Bulk upserted %s %s records", len(upserted), self.model.__name__)
+            return upserted
+        except Exception as e:
+            db.rollback()
+            logger.error("Error bulk upserting %s: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error upserting {self.model.__name__} records")
+        finally:
+            if upserted:
+                notify_change(self.model, [obj.id for obj in upserted])
+                count_cache.invalidate(self.model)
+    
+    def _upsert_set(self, stmt: Any, update_fields: Sequence[str]) -> dict:
+        """Build the SET clause of an upsert, refreshing updated_at when present"""
+        set_ = {field: stmt.excluded[field] for field in update_fields}
+        if "updated_at" in self.model.__table__.columns:
+            set_["updated_at"] = utcnow()
+        return set_
+    
+    def bulk_delete(
+        self,
+        db: Session,
+        ids: List[int],
+        chunk_size: Optional[int] = None
+    ) -> int:
+        """
+        Delete many records by ID with DELETE ... WHERE id IN (...)
+        
+        Args:
+            db: Database session
+            ids: Record IDs
+            chunk_size: IDs per chunk (defaults to DB_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Number of deleted records
+        """
+        deleted = 0
+        deleted_ids: List[int] = []
+        try:
+            for chunk in chunked(ids, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+                result = db.execute(
+                    delete(self.model)
+                    .where(self.model.id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                deleted += result.rowcount
+                deleted_ids.extend(chunk)
+            logger.info("Bulk deleted %s %s records", deleted, self.model.__name__)
+            return deleted
+        except Exception as e:
+            db.rollback()
+            logger.error("Error bulk deleting %s: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error deleting {self.model.__name__} records")
+        finally:
+            if deleted_ids:
+                notify_change(self.model, deleted_ids)
+                count_cache.invalidate(self.model)
+
+
+class AsyncBaseService(Generic[ModelType]):
+    """
+    Async counterpart of BaseService for use with AsyncSession
+    Inherit from this class for model-specific async services
+    """
+    
+    def __init__(self, model: Type[ModelType]):
+        """
+        Initialize service with model class
+        
+        Args:
+            model: SQLAlchemy model class
+        """
+        self.model = model
+    
+    async def get_by_id(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """
+        Get a record by ID
+        
+        Args:
+            db: Async database session
+            id: Record ID
+            
+        Returns:
+            Model instance or None
+        """
+        try:
+            if not _shares_reads(db):
+                return await db.get(self.model, id)
+            
+            async def load():
+                return snapshot_row(await db.get(self.model, id))
+            
+            (db_obj, values), shared = await get_by_id_flight.do_async((self.model, id), load)
+            if not shared or values is None:
+                return db_obj
+            return await db.merge(detached_copy(self.model, values), load=False)
+        except Exception as e:
+            logger.error(f"Error getting {self.model.__name__} by ID: {str(e)}")
+            raise DatabaseException(f"Error retrieving {self.model.__name__}")
+    
+    async def get_or_404(self, db: AsyncSession, id: int) -> ModelType:
+        """
+        Get a record by ID or raise 404
+        
+        Args:
+            db: Async database session
+            id: Record ID
+            
+        Returns:
+            Model instance
+            
+        Raises:
+            NotFoundException: If record not found
+        """
+        instance = await self.get_by_id(db, id)
+        if not instance:
+            raise NotFoundException(f"{self.model.__name__} with ID {id} not found")
+        return instance
+    
+    async def get_all(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[dict] = None
+    ) -> List[ModelType]:
+        """
+        Get all records with pagination and optional filters
+        
+        Args:
+            db: Async database session
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            filters: Optional dictionary of filters
+            
+        Returns:
+            List of model instances
+        """
+        try:
+            stmt = select(self.model)
+            
+            filter_conditions = build_filter_conditions(self.model, filters)
+            if filter_conditions:
+                stmt = stmt.where(and_(*filter_conditions))
+            
+            result = await db.scalars(stmt.offset(skip).limit(limit))
+            return list(result.all())
+        except Exception as e:
+            logger.error(f"Error getting all {self.model.__name__}: {str(e)}")
+            raise DatabaseException(f"Error retrieving {self.model.__name__} list")
+    
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[dict] = None,
+        order_by: Sequence[str] = DEFAULT_KEYSET_ORDER
+    ) -> CursorPage:
+        """
+        Get a page of records using keyset (cursor) pagination
+        
+        Unlike get_all, the cost of a page does not grow with its depth.
+        
+        Args:
+            db: Async database session
+            limit: Maximum number of records to return
+            cursor: Opaque cursor from a previous page's next_cursor/prev_cursor
+            filters: Optional dictionary of filters
+            order_by: Names of indexed columns to order by
+            
+        Returns:
+            CursorPage with items and cursors for the adjacent pages
+        """
+        try:
+            stmt, names, direction = build_keyset_query(self.model, limit, cursor, filters, order_by)
+            rows = list((await db.scalars(stmt)).all())
+            return build_cursor_page(rows, limit, names, direction, bool(cursor))
+        except AppException:
+            raise
+        except Exception as e:
+            logger.error("Error getting %s page: %s", self.model.__name__, e)
+            raise DatabaseException(f"Error retrieving {self.model.__name__} list")
+    
+    async def count(
+        self,
+        db: AsyncSession,
+        filters: Optional[dict] = None,
+        strategy: Optional[str] = None
+    ) -> int:
+        """
+        Count records with optional filters
+        
+        Args:
+            db: Async database session
+            filters: Optional dictionary of filters
+            strategy: "exact", "estimated" or "cached" (defaults to DB_COUNT_STRATEGY)
+            
+        Returns:
+            Total count (approximate for the estimated and cached strategies)
+        """
+        strategy = resolve_strategy(strategy)
+        try:
+            filter_conditions = build_filter_conditions(self.model, filters)
+            
+            if strategy == COUNT_ESTIMATED and supports_estimates(db.get_bind().dialect.name):
+                value = (await db.execute(build_estimate_query(self.model, filter_conditions))).scalar()
+                estimate = parse_estimate(value, bool(filter_conditions))
+                if estimate is not None:
+                    return estimate
+            
+            if strategy == COUNT_CACHED:
+                total = count_cache.get(self.model, filters)
+                if total is not None:
+                    return total
+            
+            total = (await db.execute(build_count_query(self.model, filter_conditions))).scalar_one()
+            
+            if strategy == COUNT_CACHED:
+                count_cache.set(self.model, filters, total)
+            return total
+        except Exception as e:
+            logger.error(f"Error counting {self.model.__name__}: {str(e)}")
+            raise DatabaseException(f"Error counting {self.model.__name__}")
+    
+    async def create(self, db: AsyncSession, obj_in: dict) -> ModelType:
+        """
+        Create a new record
+        
+        Args:
+            db: Async database session
+            obj_in: Dictionary with model data
+            
+        Returns:
+            Created model instance
+        """
+        try:
+            # Single INSERT ... RETURNING round trip, server defaults included
+            db_obj = (await db.scalars(insert(self.model).values(**obj_in).returning(self.model))).one()
+            await db.commit()
+            count_cache.adjust(self.model, db_obj, 1)
+            logger.info(f"Created {self.model.__name__} with ID: {db_obj.id}")
+            return db_obj
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error creating {self.model.__name__}: {str(e)}")
+            raise DatabaseException(f"Error creating {self.model.__name__}")
+    
+    async def update(self, db: AsyncSession, id: int, obj_in: dict) -> ModelType:
+        """
+        Update an existing record
+        
+        Args:
+            db: Async database session
+            id: Record ID
+            obj_in: Dictionary with updated data
+            
+        Returns:
+            Updated model instance
+        """
+        try:
+            if not column_values(self.model, obj_in):
+                return await self.get_or_404(db, id)
+            
+            # Single UPDATE ... RETURNING round trip instead of SELECT + UPDATE + reload
+            db_obj = (await db.scalars(build_update_query(self.model, id, obj_in))).first()
+            if db_obj is None:
+                await db.rollback()
+                raise NotFoundException(f"{self.model.__name__} with ID {id} not found")
+            
+            await db.commit()
+            notify_change(self.model, [id])
+            count_cache.invalidate(self.model)
+            logger.info(f"Updated {self.model.__name__} with ID: {id}")
+            return db_obj
+        except NotFoundException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error updating {self.model.__name__}: {str(e)}")
+            raise DatabaseException(f"Error updating {self.model.__name__}")
+    
+    async def delete(self, db: AsyncSession, id: int) -> bool:
+        """
+        Delete a record
+        
+        Args:
+            db: Async database session
+            id: Record ID
+            
+        Returns:
+            True if deleted successfully
+        """
+        try:
+            db_obj = await self.get_or_404(db, id)
+            await db.delete(db_obj)
+            await db.commit()
+            notify_change(self.model, [id])
+            count_cache.adjust(self.model, db_obj, -1)
+            logger.info(f"Deleted {self.model.__name__} with ID: {id}")
+            return True
+        except NotFoundException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error deleting {self.model.__name__}: {str(e)}")
+            raise DatabaseException(f"Error deleting {self.model.__name__}")
@@ -0,0 +1,158 @@
+"""
+Count strategies for BaseService.count
+
+- exact: SELECT count(*) with the given filters
+- estimated: PostgreSQL planner statistics (pg_class.reltuples, or the
+  EXPLAIN row estimate when filtered), exact count on other databases
+- cached: exact count kept in memory per filter set, adjusted incrementally
+  on create/delete and refreshed after a TTL
+"""
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Select, and_, func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.config import settings
+from app.utils.cache import TTLCache
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+COUNT_CACHED = "cached"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_CACHED)
+
+RELTUPLES_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)")
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper around a SELECT statement"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def resolve_strategy(strategy: Optional[str]) -> str:
+    """
+    Resolve and validate a count strategy
+
+    Args:
+        strategy: Requested strategy or None for the configured default
+
+    Returns:
+        Strategy name
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    strategy = strategy or settings.DB_COUNT_STRATEGY
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Unknown count strategy '{strategy}', expected one of {COUNT_STRATEGIES}")
+    return strategy
+
+
+def build_count_query(model: Any, conditions: List[Any]) -> Select:
+    """Build an exact COUNT(*) query without a wrapping subquery"""
+    stmt = select(func.count()).select_from(model)
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+    return stmt
+
+
+def build_estimate_query(model: Any, conditions: List[Any]) -> Executable:
+    """
+    Build a PostgreSQL row estimate query
+
+    Unfiltered counts read pg_class.reltuples; filtered counts use the
+    planner's row estimate for the filtered SELECT.
+    """
+    if not conditions:
+        return RELTUPLES_QUERY.bindparams(table=model.__tablename__)
+    return Explain(select(model.id).where(and_(*conditions)))
+
+
+def parse_estimate(value: Any, filtered: bool) -> Optional[int]:
+    """
+    Extract the row estimate from a build_estimate_query result
+
+    Returns:
+        Estimated row count, or None if statistics are unavailable
+    """
+    if value is None:
+        return None
+    if filtered:
+        plan = json.loads(value) if isinstance(value, str) else value
+        return int(plan[0]["Plan"]["Plan Rows"])
+    # reltuples is -1 for tables that were never vacuumed or analyzed
+    return int(value) if value >= 0 else None
+
+
+def supports_estimates(dialect_name: str) -> bool:
+    """Whether planner-statistics estimates are available for a database"""
+    return dialect_name == "postgresql"
+
+
+class CountCache:
+    """Per-model, per-filter cache of row totals maintained incrementally"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of cached totals
+            ttl: Seconds before a total is recomputed
+        """
+        self._totals: TTLCache[Tuple[str, tuple], List[Any]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _filters_key(model: Any, filters: Optional[dict]) -> Tuple[str, tuple]:
+        """Build a hashable key from the filters that apply to the model"""
+        items = tuple(sorted(
+            (key, repr(value))
+            for key, value in (filters or {}).items()
+            if hasattr(model, key)
+        ))
+        return model.__tablename__, items
+
+    def get(self, model: Any, filters: Optional[dict]) -> Optional[int]:
+        """Get a cached total or None"""
+        entry = self._totals.get(self._filters_key(model, filters))
+        return None if entry is None else entry[0]
+
+    def set(self, model: Any, filters: Optional[dict], total: int) -> None:
+        """Cache a freshly computed total"""
+        applicable = {key: value for key, value in (filters or {}).items() if hasattr(model, key)}
+        self._totals.set(self._filters_key(model, filters), [total, applicable])
+
+    def adjust(self, model: Any, obj: Any, delta: int) -> None:
+        """
+        Adjust every cached total of a model whose filters match a row
+
+        Args:
+            model: SQLAlchemy model class
+            obj: Created or deleted model instance
+            delta: +1 for a created row, -1 for a deleted row
+        """
+        table = model.__tablename__
+        with self._lock:
+            for (entry_table, _), entry in self._totals.items():
+                if entry_table != table:
+                    continue
+                if all(getattr(obj, key, None) == value for key, value in entry[1].items()):
+                    entry[0] += delta
+
+    def invalidate(self, model: Any) -> None:
+        """Drop all cached totals of a model"""
+        table = model.__tablename__
+        self._totals.evict_where(lambda key, _: key[0] == table)
+
+
+count_cache = CountCache(maxsize=settings.DB_COUNT_CACHE_SIZE, ttl=settings.DB_COUNT_CACHE_TTL)
@@ -0,0 +1,109 @@
+"""
+Streaming export of model rows as NDJSON or CSV
+"""
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence
+from app.core.database import SessionLocal
+from app.services.base_service import BaseService
+from app.utils.helpers import chunked
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a column value into a JSON/CSV friendly value"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows: Iterable[Any], fields: Sequence[str], batch_size: int = 1000) -> Iterator[str]:
+    """
+    Serialize rows as newline-delimited JSON
+
+    Args:
+        rows: Model instances
+        fields: Attribute names to export
+        batch_size: Rows per yielded chunk
+
+    Yields:
+        Chunks of NDJSON text
+    """
+    for batch in chunked(rows, batch_size):
+        yield "".join(
+            json.dumps({field: _export_value(getattr(row, field)) for field in fields}) + "\n"
+            for row in batch
+        )
+
+
+def iter_csv(rows: Iterable[Any], fields: Sequence[str], batch_size: int = 1000) -> Iterator[str]:
+    """
+    Serialize rows as CSV with a header line
+
+    Args:
+        rows: Model instances
+        fields: Attribute names to export
+        batch_size: Rows per yielded chunk
+
+    Yields:
+        Chunks of CSV text
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(fields)
+    for batch in chunked(rows, batch_size):
+        for row in batch:
+            writer.writerow([_export_value(getattr(row, field)) for field in fields])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    # Flush the header when there were no rows at all
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(
+    service: BaseService,
+    fields: Sequence[str],
+    export_format: str,
+    filters: Optional[dict] = None,
+    batch_size: int = 1000
+) -> Iterator[str]:
+    """
+    Stream all matching records of a service's model in the given format
+
+    The export owns its database session, because request-scoped sessions are
+    closed before a streaming response body is sent.
+
+    Args:
+        service: Service of the model to export
+        fields: Attribute names to export
+        export_format: "ndjson" or "csv"
+        filters: Optional dictionary of filters
+        batch_size: Rows fetched and serialized per batch
+
+    Yields:
+        Chunks of serialized text
+    """
+    serializer = iter_csv if export_format == "csv" else iter_ndjson
+    db = SessionLocal()
+    try:
+        rows = service.stream(db, filters=filters, batch_size=batch_size)
+        yield from serializer(rows, fields, batch_size)
+        logger.info("Exported %s records as %s", service.model.__name__, export_format)
+    finally:
+        db.close()
@@ -0,0 +1,234 @@
+"""
+Access token revocation list
+
+Every authenticated request checks its token's jti here. A Bloom filter
+clears almost all tokens, which were never revoked, without a database or
+dictionary lookup; only filter positives consult the exact set of revoked
+jtis. The list is loaded from the revoked_tokens table at startup and a
+background task picks up revocations made by other workers.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.database import engine
+from app.core.metrics import registry
+from app.models.revoked_token import RevokedToken
+from app.utils.bloom import BloomFilter
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows created this long before the last one seen are fetched again, so a
+# revocation committed late by a slow transaction is not skipped
+SYNC_OVERLAP = timedelta(seconds=30)
+
+revocation_false_positives = registry.counter(
+    "token_revocation_false_positives_total",
+    "Revocation checks that passed the Bloom filter but were not revoked",
+)
+
+
+class RevocationList:
+    """In-process view of the revoked_tokens table"""
+
+    def __init__(self, source_engine: Engine, capacity: int, error_rate: float, sync_interval: float):
+        """
+        Initialize an empty list
+
+        Args:
+            source_engine: Engine holding the revoked_tokens table
+            capacity: Revocations the Bloom filter is sized for before a rebuild
+            error_rate: Target Bloom filter false positive rate at capacity
+            sync_interval: Seconds between picking up other workers' revocations
+        """
+        self.engine = source_engine
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.checks = 0
+        self.revoked_hits = 0
+        self.false_positives = 0
+        self._revoked: Dict[str, datetime] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    @property
+    def bloom(self) -> BloomFilter:
+        """Current Bloom filter"""
+        return self._filter
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Check whether a token has been revoked
+
+        Args:
+            jti: Token ID claim, None for tokens issued without one
+
+        Returns:
+            True if the token is revoked
+        """
+        self.checks += 1
+        if jti is None or jti not in self._filter:
+            return False
+        if jti in self._revoked:
+            self.revoked_hits += 1
+            return True
+        self.false_positives += 1
+        revocation_false_positives.inc()
+        return False
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """
+        Add a revocation to the in-process list
+
+        Args:
+            jti: Token ID claim
+            expires_at: Token expiry (UTC), after which the entry can be dropped
+        """
+        with self._lock:
+            if jti in self._revoked:
+                return
+            self._revoked[jti] = expires_at
+            self._filter.add(jti)
+            if self._filter.count > self._filter.capacity:
+                self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Drop expired entries and size a new filter for the rest (lock held)"""
+        now = datetime.utcnow()
+        live = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+        bloom = BloomFilter.from_items(live, max(self.capacity, 2 * len(live)), self.error_rate)
+        # Readers may pair the old filter with the new set or vice versa;
+        # both only differ by expired entries
+        self._revoked = live
+        self._filter = bloom
+        self._next_prune = time.monotonic() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        logger.info("Rebuilt token revocation filter: %d entries, %d bytes", len(live), bloom.memory_bytes)
+
+    def _apply(self, rows: Sequence[Any]) -> None:
+        for row in rows:
+            self.add(row.jti, row.expires_at)
+            if self._watermark is None or row.created_at > self._watermark:
+                self._watermark = row.created_at
+
+    def load(self) -> None:
+        """Prune expired rows and load all live revocations (blocking)"""
+        now = datetime.utcnow()
+        with self.engine.begin() as connection:
+            pruned = connection.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now)).rowcount
+            rows = connection.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.created_at)
+                .where(RevokedToken.expires_at > now)
+            ).all()
+
+        with self._lock:
+            self._revoked = {}
+            self._filter = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+            self._watermark = None
+        self._apply(rows)
+        self._next_prune = time.monotonic() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        logger.info("Loaded %d token revocations (%d expired rows pruned)", len(rows), pruned)
+
+    def sync(self) -> None:
+        """Pick up revocations added since the last load or sync (blocking)"""
+        stmt = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.created_at).where(
+            RevokedToken.expires_at > datetime.utcnow()
+        )
+        if self._watermark is not None:
+            stmt = stmt.where(RevokedToken.created_at >= self._watermark - SYNC_OVERLAP)
+        with self.engine.connect() as connection:
+            rows = connection.execute(stmt).all()
+        self._apply(rows)
+
+        if time.monotonic() >= self._next_prune:
+            with self._lock:
+                self._rebuild()
+
+    def revoke(self, db: Session, jti: str, user_id: int, expires_at: datetime) -> None:
+        """
+        Revoke a token in the database and in this process
+
+        Args:
+            db: Database session
+            jti: Token ID claim
+            user_id: Token subject
+            expires_at: Token expiry (UTC)
+        """
+        try:
+            db.execute(insert(RevokedToken).values(jti=jti, user_id=user_id, expires_at=expires_at))
+            db.commit()
+        except IntegrityError:
+            # Already revoked, possibly by a concurrent request
+            db.rollback()
+        self.add(jti, expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry counts, filter memory and false positive rates"""
+        negatives = self.checks - self.revoked_hits
+        return {
+            "entries": len(self._revoked),
+            "checks": self.checks,
+            "revoked_hits": self.revoked_hits,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": self.false_positives / negatives if negatives else 0.0,
+            "filter": self._filter.stats(),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logger.error("Token revocation sync failed: %s", e)
+
+    async def start(self) -> None:
+        """Load the list and start syncing in the background"""
+        if self._task is not None:
+            return
+        await asyncio.to_thread(self.load)
+        self._task = asyncio.create_task(self._run(), name="token-revocation-sync")
+
+    async def stop(self) -> None:
+        """Stop background syncing"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+revocation_list = RevocationList(
+    source_engine=engine,
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.REVOCATION_SYNC_INTERVAL,
+)
+
+registry.gauge(
+    "token_revocation_entries",
+    "Revoked access tokens held in memory",
+).set_function(lambda: len(revocation_list))
+registry.gauge(
+    "token_revocation_filter_bytes",
+    "Memory used by the revocation Bloom filter",
+).set_function(lambda: revocation_list.bloom.memory_bytes)
+registry.gauge(
+    "token_revocation_filter_expected_false_positive_rate",
+    "Expected revocation Bloom filter false positive rate at its current fill",
+).set_function(lambda: revocation_list.bloom.false_positive_rate)
@@ -0,0 +1,97 @@
+"""
+Refresh token store with rotation and reuse detection
+
+Tokens are stored by the SHA-256 of their jti claim, so the table never
+holds anything that could be presented as a token. Spending a token is a
+single indexed UPDATE ... RETURNING that only matches unspent, unrevoked,
+unexpired rows, so two concurrent refreshes with the same token cannot
+both succeed.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Any, Optional, Tuple
+from sqlalchemy import insert, select, update
+from app.config import settings
+from app.models.refresh_token import RefreshToken
+from app.utils.cache import TTLCache
+from app.utils.jwt_utils import create_refresh_token
+
+# Recently spent jti hashes -> (user ID, family ID), so replays are
+# recognised without a lookup
+spent_tokens: TTLCache[str, Tuple[int, str]] = TTLCache(
+    maxsize=settings.REFRESH_TOKEN_CACHE_SIZE,
+    ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+)
+
+
+def hash_jti(jti: str) -> str:
+    """Get the stored form of a jti claim"""
+    return hashlib.sha256(jti.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(user_id: int, family_id: Optional[str] = None) -> Tuple[str, Any]:
+    """
+    Create a refresh token and the statement that records it
+    
+    Args:
+        user_id: Token subject
+        family_id: Rotation family to continue, or None to start a new one
+        
+    Returns:
+        Tuple of (encoded refresh token, INSERT statement to execute)
+    """
+    jti = secrets.token_urlsafe(16)
+    expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    token = create_refresh_token({"sub": str(user_id), "jti": jti}, expires_at=expires_at)
+    stmt = insert(RefreshToken).values(
+        jti_hash=hash_jti(jti),
+        family_id=family_id or secrets.token_hex(16),
+        user_id=user_id,
+        expires_at=expires_at,
+    )
+    return token, stmt
+
+
+def build_spend_query(jti_hash: str, now: datetime) -> Any:
+    """
+    Build the UPDATE marking a live token as used
+    
+    Args:
+        jti_hash: Hashed jti of the presented token
+        now: Current UTC time
+        
+    Returns:
+        Statement returning (user_id, family_id), or no row if the token is
+        unknown, spent, revoked or expired
+    """
+    return (
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti_hash == jti_hash,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    )
+
+
+def build_lookup_query(jti_hash: str) -> Any:
+    """Build the SELECT explaining why a token could not be spent"""
+    return select(
+        RefreshToken.user_id,
+        RefreshToken.family_id,
+        RefreshToken.used_at,
+        RefreshToken.revoked_at,
+    ).where(RefreshToken.jti_hash == jti_hash)
+
+
+def build_revoke_family_query(family_id: str, now: datetime) -> Any:
+    """Build the UPDATE revoking every live token of a rotation family"""
+    return (
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
@@ -0,0 +1,156 @@
+"""
+Read-through cache of user identities
+"""
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.models.user import User, UserRole
+from app.services.base_service import register_change_listener
+from app.utils.cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Immutable, session-independent copy of a User row"""
+
+    id: int
+    full_name: str
+    email: str
+    password_hash: str
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_model(cls, user: User) -> "UserSnapshot":
+        """Create a snapshot from a loaded User instance"""
+        return cls(
+            id=user.id,
+            full_name=user.full_name,
+            email=user.email,
+            password_hash=user.password_hash,
+            role=user.role,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class UserCache:
+    """
+    Size-bounded LRU+TTL cache of user snapshots, addressable by ID and email
+
+    Usage:
+        generation = user_cache.generation
+        snapshot = user_cache.get_by_id(user_id)
+        if snapshot is None:
+            user = <load from database>
+            snapshot = user_cache.put(user, generation)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of cached users
+            ttl: Time to live in seconds
+        """
+        self._by_id: TTLCache[int, UserSnapshot] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._email_index: TTLCache[str, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter, captured before loading a row from the database"""
+        return self._generation
+
+    def get_by_id(self, user_id: int) -> Optional[UserSnapshot]:
+        """Get a cached user by ID"""
+        snapshot = self._by_id.get(user_id)
+        self._record(snapshot)
+        return snapshot
+
+    def get_by_email(self, email: str) -> Optional[UserSnapshot]:
+        """Get a cached user by email"""
+        user_id = self._email_index.get(email)
+        snapshot = self._by_id.get(user_id) if user_id is not None else None
+        # The index may point at a row whose email has since changed
+        if snapshot is not None and snapshot.email != email:
+            snapshot = None
+        self._record(snapshot)
+        return snapshot
+
+    def put(self, user: User, generation: int) -> UserSnapshot:
+        """
+        Snapshot a freshly loaded user and cache it
+
+        Args:
+            user: User instance loaded from the database
+            generation: Value of `generation` captured before the load
+
+        Returns:
+            Snapshot of the user
+        """
+        snapshot = UserSnapshot.from_model(user)
+        with self._lock:
+            # Skip caching if a write was committed while the row was loading
+            if generation != self._generation:
+                return snapshot
+            self._by_id.set(snapshot.id, snapshot)
+            self._email_index.set(snapshot.email, snapshot.id)
+        return snapshot
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop a user from the cache after a committed change
+
+        Args:
+            user_id: ID of the changed user
+        """
+        with self._lock:
+            self._generation += 1
+            self._by_id.pop(user_id)
+
+    def clear(self) -> None:
+        """Drop all cached users"""
+        with self._lock:
+            self._generation += 1
+            self._by_id.clear()
+            self._email_index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss/eviction counters"""
+        by_id = self._by_id.stats()
+        return {
+            "size": by_id["size"],
+            "maxsize": by_id["maxsize"],
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": by_id["evictions"],
+            "expirations": by_id["expirations"],
+        }
+
+    def _record(self, snapshot: Optional[UserSnapshot]) -> None:
+        """Update hit/miss counters"""
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Keep the cache coherent with writes made through BaseService
+register_change_listener(User, user_cache.invalidate)
@@ -0,0 +1,101 @@
+"""
+Bloom filter for fast negative membership checks
+"""
+import math
+import threading
+from typing import Any, Dict, Iterable
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    Membership tests never give false negatives; false positives occur at
+    roughly error_rate once capacity items have been added. Positions come
+    from the two 32-bit halves of the item's built-in hash (Kirsch-Mitzenmacher
+    double hashing); str caches its hash, and a lookup stops at the first
+    unset bit, so most non-members cost one byte read. The built-in hash is
+    seeded per process, so a filter must never be persisted or shared.
+
+    Adds are serialized; lookups take no lock.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false positive rate at capacity
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        """Build a filter holding the given items"""
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def add(self, item: str) -> None:
+        """
+        Add an item
+
+        Args:
+            item: Item to add
+        """
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        # A zero step would probe the same bit num_hashes times
+        h2 = (h >> 32) & 0xFFFFFFFF | 1
+        num_bits = self.num_bits
+        with self._lock:
+            bits = self._bits
+            for i in range(self.num_hashes):
+                position = (h1 + i * h2) % num_bits
+                bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) & 0xFFFFFFFF | 1
+        bits = self._bits
+        num_bits = self.num_bits
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array"""
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate for the items added so far"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> Dict[str, Any]:
+        """Get filter sizing and expected accuracy"""
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "bits": self.num_bits,
+            "hashes": self.num_hashes,
+            "memory_bytes": self.memory_bytes,
+            "expected_false_positive_rate": self.false_positive_rate,
+        }
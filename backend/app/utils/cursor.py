@@ -0,0 +1,62 @@
+"""
+Opaque cursor encoding for keyset pagination
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Sequence, Tuple
+from app.core.exceptions import ValidationException
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+
+def encode_cursor(values: Sequence[Any], direction: str = CURSOR_NEXT) -> str:
+    """
+    Encode keyset values into an opaque URL-safe cursor
+
+    Args:
+        values: Values of the ordering columns for the boundary row
+        direction: CURSOR_NEXT or CURSOR_PREV
+
+    Returns:
+        Cursor string
+    """
+    payload = {
+        "d": direction,
+        "v": [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, python_types: Sequence[type]) -> Tuple[List[Any], str]:
+    """
+    Decode a cursor created by encode_cursor
+
+    Args:
+        cursor: Cursor string
+        python_types: Python types of the ordering columns, used to restore values
+
+    Returns:
+        Tuple of (keyset values, direction)
+
+    Raises:
+        ValidationException: If the cursor is malformed or does not match the ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = payload["d"]
+        raw_values = payload["v"]
+        if direction not in (CURSOR_NEXT, CURSOR_PREV) or len(raw_values) != len(python_types):
+            raise ValueError("cursor does not match ordering")
+
+        values = []
+        for value, python_type in zip(raw_values, python_types):
+            if value is not None and python_type in (datetime, date):
+                value = python_type.fromisoformat(value)
+            values.append(value)
+        return values, direction
+    except Exception:
+        raise ValidationException("Invalid pagination cursor")
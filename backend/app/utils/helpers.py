@@ -1,11 +1,13 @@
 """
 Helper utility functions
 """
-from typing import Optional, Any
+from typing import Optional, Any, Iterable, Iterator, List, TypeVar
 from datetime import datetime, timedelta
 import hashlib
 import secrets
 
+T = TypeVar("T")
+
 
 def generate_random_string(length: int = 32) -> str:
     """Generate a random string"""
@@ -37,3 +39,15 @@ def convert_to_dict(obj: Any) -> dict:
             if not key.startswith('_')
         }
     return {}
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most size items"""
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -2,34 +2,60 @@
 JWT token utilities for authentication
 """
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-import bcrypt
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
+import hashlib
+import json
+import secrets
+import time
 from app.config import settings
 from app.core.exceptions import AuthenticationException
+from app.core.metrics import jwt_duration, password_hash_duration
+from app.core.worker_pool import BoundedWorkerPool
+from app.utils.cache import TTLCache
+from app.utils.password_hashers import get_hasher, identify_hasher
+from app.utils.token_engine import TokenError, get_token_engine
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bounded pool that keeps password hashing off the event loop
+password_pool = BoundedWorkerPool(
+    name="password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+)
+
+# Verified access token claims keyed by SHA-256 digest of the token
+token_cache: TTLCache[bytes, Dict[str, Any]] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL,
+)
+
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt
+    Hash a password with the configured hasher (PASSWORD_HASHER setting)
     
     Args:
-        password: Plain text password (truncated to 72 bytes per bcrypt spec)
+        password: Plain text password
         
     Returns:
         Hashed password
     """
-    password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+    hasher = get_hasher()
+    start = time.perf_counter()
+    try:
+        return hasher.hash(password)
+    finally:
+        password_hash_duration.labels("hash", hasher.algorithm).observe(time.perf_counter() - start)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its hash
+    Verify a password against its hash, whichever supported algorithm created it
     
     Args:
         plain_password: Plain text password
@@ -39,12 +65,66 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         True if password matches, False otherwise
     """
     try:
-        password_bytes = plain_password.encode('utf-8')[:72]
-        return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+        hasher = identify_hasher(hashed_password)
+        if hasher is None:
+            logger.error("Unrecognized password hash format")
+            return False
+        start = time.perf_counter()
+        try:
+            return hasher.verify(plain_password, hashed_password)
+        finally:
+            password_hash_duration.labels("verify", hasher.algorithm).observe(time.perf_counter() - start)
     except Exception:
         return False
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a hash was created with an outdated algorithm or cost
+    
+    Args:
+        hashed_password: Stored password hash
+        
+    Returns:
+        True if the hash should be replaced by a hash from the configured hasher
+    """
+    hasher = get_hasher()
+    return not hasher.identify(hashed_password) or hasher.needs_rehash(hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the password worker pool
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password
+        
+    Raises:
+        ServiceUnavailableException: If the pool is saturated or times out
+    """
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash in the password worker pool
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password to verify against
+        
+    Returns:
+        True if password matches, False otherwise
+        
+    Raises:
+        ServiceUnavailableException: If the pool is saturated or times out
+    """
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -66,30 +146,30 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),
+        "jti": secrets.token_urlsafe(12),  # Identifies the token for revocation
         "type": "access"
     })
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
+    start = time.perf_counter()
+    encoded_jwt = get_token_engine().encode(to_encode)
+    jwt_duration.labels("encode").observe(time.perf_counter() - start)
     
     return encoded_jwt
 
 
-def create_refresh_token(data: Dict[str, Any]) -> str:
+def create_refresh_token(data: Dict[str, Any], expires_at: Optional[datetime] = None) -> str:
     """
     Create a JWT refresh token (longer expiration)
     
     Args:
         data: Data to encode in the token
+        expires_at: Optional expiry time (UTC), defaults to REFRESH_TOKEN_EXPIRE_DAYS from now
         
     Returns:
         Encoded JWT refresh token
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=7)  # 7 days for refresh token
+    expire = expires_at or datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode.update({
         "exp": expire,
@@ -97,11 +177,9 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         "type": "refresh"
     })
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
+    start = time.perf_counter()
+    encoded_jwt = get_token_engine().encode(to_encode)
+    jwt_duration.labels("encode").observe(time.perf_counter() - start)
     
     return encoded_jwt
 
@@ -119,16 +197,27 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         AuthenticationException: If token is invalid or expired
     """
+    start = time.perf_counter()
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = get_token_engine().decode(token)
         return payload
-    except JWTError as e:
+    except TokenError as e:
         logger.error(f"Token decode error: {str(e)}")
         raise AuthenticationException("Invalid or expired token")
+    finally:
+        jwt_duration.labels("decode").observe(time.perf_counter() - start)
+
+
+@lru_cache(maxsize=None)
+def get_jwks_document() -> Tuple[bytes, str]:
+    """
+    Get the serialized JWK Set of public verification keys
+    
+    Returns:
+        Tuple of (JSON body, quoted ETag)
+    """
+    body = json.dumps(get_token_engine().jwks(), separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
 
 
 def verify_token_type(payload: Dict[str, Any], expected_type: str) -> None:
@@ -145,3 +234,57 @@ def verify_token_type(payload: Dict[str, Any], expected_type: str) -> None:
     token_type = payload.get("type")
     if token_type != expected_type:
         raise AuthenticationException(f"Invalid token type. Expected {expected_type}")
+
+
+def _token_digest(token: str) -> bytes:
+    """Get the cache key for a token"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Decode and verify an access token, reusing previously verified claims
+    
+    Args:
+        token: JWT access token
+        
+    Returns:
+        Decoded token payload (a copy that callers may modify)
+        
+    Raises:
+        AuthenticationException: If token is invalid, expired or not an access token
+    """
+    key = _token_digest(token)
+    payload = token_cache.get(key)
+    
+    if payload is None:
+        payload = decode_token(token)
+        verify_token_type(payload, "access")
+        # Never keep a token cached past its own expiry
+        token_cache.set(key, payload, ttl=payload.get("exp", 0) - time.time())
+    
+    return dict(payload)
+
+
+def evict_cached_token(token: str) -> None:
+    """
+    Remove a token from the verified token cache
+    
+    Args:
+        token: JWT token to forget
+    """
+    token_cache.pop(_token_digest(token))
+
+
+def evict_cached_user_tokens(user_id: int) -> int:
+    """
+    Remove all cached tokens belonging to a user
+    
+    Args:
+        user_id: User ID (token subject)
+        
+    Returns:
+        Number of evicted tokens
+    """
+    subject = str(user_id)
+    return token_cache.evict_where(lambda _, payload: payload.get("sub") == subject)
@@ -0,0 +1,255 @@
+"""
+Password hashing algorithms selectable through settings
+
+Each hasher produces self-describing hashes (algorithm and cost are encoded
+in the hash string), so stored hashes can be verified with whatever hasher
+created them and upgraded when the configured algorithm or cost changes.
+"""
+import base64
+import hashlib
+import hmac
+import re
+import secrets
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+from app.config import settings
+
+
+class PasswordHasher(ABC):
+    """Base class for password hashing algorithms"""
+
+    # Registry name, also used in the PASSWORD_HASHER setting
+    algorithm: str = ""
+    # Setting holding the cost parameter tuned by calibration
+    cost_setting: str = ""
+
+    @property
+    @abstractmethod
+    def cost(self) -> int:
+        """Current cost parameter"""
+
+    @abstractmethod
+    def with_cost(self, cost: int) -> "PasswordHasher":
+        """Create a copy of this hasher with another cost parameter"""
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash a password"""
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        """Verify a password against a hash created by this algorithm"""
+
+    @abstractmethod
+    def identify(self, encoded: str) -> bool:
+        """Whether a hash was created by this algorithm"""
+
+    @abstractmethod
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether a hash of this algorithm uses outdated parameters"""
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt with a configurable number of rounds (log2 cost)"""
+
+    algorithm = "bcrypt"
+    cost_setting = "BCRYPT_ROUNDS"
+    _pattern = re.compile(r"^\$2[aby]?\$(\d\d)\$")
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    @property
+    def cost(self) -> int:
+        return self.rounds
+
+    def with_cost(self, cost: int) -> "BcryptHasher":
+        return BcryptHasher(rounds=cost)
+
+    def hash(self, password: str) -> str:
+        import bcrypt
+
+        # bcrypt only uses the first 72 bytes of a password
+        password_bytes = password.encode("utf-8")[:72]
+        return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=self.rounds)).decode("utf-8")
+
+    def verify(self, password: str, encoded: str) -> bool:
+        import bcrypt
+
+        return bcrypt.checkpw(password.encode("utf-8")[:72], encoded.encode("utf-8"))
+
+    def identify(self, encoded: str) -> bool:
+        return bool(self._pattern.match(encoded))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        match = self._pattern.match(encoded)
+        return not match or int(match.group(1)) != self.rounds
+
+
+class Argon2idHasher(PasswordHasher):
+    """argon2id via argon2-cffi, tuned through its time cost"""
+
+    algorithm = "argon2id"
+    cost_setting = "ARGON2_TIME_COST"
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = None
+
+    @property
+    def cost(self) -> int:
+        return self.time_cost
+
+    def with_cost(self, cost: int) -> "Argon2idHasher":
+        return Argon2idHasher(time_cost=cost, memory_cost=self.memory_cost, parallelism=self.parallelism)
+
+    def _get_hasher(self):
+        """Create the argon2-cffi hasher on first use"""
+        if self._hasher is None:
+            try:
+                from argon2 import PasswordHasher as Argon2PasswordHasher
+                from argon2 import Type
+            except ImportError:
+                raise ImportError("The argon2id password hasher requires the argon2-cffi package")
+            self._hasher = Argon2PasswordHasher(
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost,
+                parallelism=self.parallelism,
+                type=Type.ID,
+            )
+        return self._hasher
+
+    def hash(self, password: str) -> str:
+        return self._get_hasher().hash(password)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        from argon2.exceptions import VerificationError, InvalidHashError
+
+        try:
+            return self._get_hasher().verify(encoded, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith("$argon2id$")
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return self._get_hasher().check_needs_rehash(encoded)
+
+
+class ScryptHasher(PasswordHasher):
+    """
+    scrypt from the standard library, tuned through log2(N)
+
+    Hash format: $scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<hash>
+    """
+
+    algorithm = "scrypt"
+    cost_setting = "SCRYPT_LOG_N"
+    _pattern = re.compile(r"^\$scrypt\$ln=(\d+),r=(\d+),p=(\d+)\$([A-Za-z0-9+/=]+)\$([A-Za-z0-9+/=]+)$")
+
+    def __init__(self, log_n: int = 14, r: int = 8, p: int = 1):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+
+    @property
+    def cost(self) -> int:
+        return self.log_n
+
+    def with_cost(self, cost: int) -> "ScryptHasher":
+        return ScryptHasher(log_n=cost, r=self.r, p=self.p)
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+        n = 1 << log_n
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=32,
+        )
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        derived = self._derive(password, salt, self.log_n, self.r, self.p)
+        return "$scrypt$ln={},r={},p={}${}${}".format(
+            self.log_n,
+            self.r,
+            self.p,
+            base64.b64encode(salt).decode("ascii"),
+            base64.b64encode(derived).decode("ascii"),
+        )
+
+    def verify(self, password: str, encoded: str) -> bool:
+        match = self._pattern.match(encoded)
+        if not match:
+            return False
+        log_n, r, p = (int(value) for value in match.group(1, 2, 3))
+        salt = base64.b64decode(match.group(4))
+        expected = base64.b64decode(match.group(5))
+        return hmac.compare_digest(self._derive(password, salt, log_n, r, p), expected)
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith("$scrypt$")
+
+    def needs_rehash(self, encoded: str) -> bool:
+        match = self._pattern.match(encoded)
+        if not match:
+            return True
+        return tuple(int(value) for value in match.group(1, 2, 3)) != (self.log_n, self.r, self.p)
+
+
+# Hasher factories configured from settings
+PASSWORD_HASHERS: Dict[str, Callable[[], PasswordHasher]] = {
+    "bcrypt": lambda: BcryptHasher(rounds=settings.BCRYPT_ROUNDS),
+    "argon2id": lambda: Argon2idHasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+    "scrypt": lambda: ScryptHasher(log_n=settings.SCRYPT_LOG_N, r=settings.SCRYPT_R, p=settings.SCRYPT_P),
+}
+
+
+@lru_cache(maxsize=None)
+def get_hasher(algorithm: Optional[str] = None) -> PasswordHasher:
+    """
+    Get a configured hasher
+
+    Args:
+        algorithm: Hasher name, defaults to the PASSWORD_HASHER setting
+
+    Returns:
+        Password hasher instance
+
+    Raises:
+        ValueError: If the algorithm is unknown
+    """
+    algorithm = algorithm or settings.PASSWORD_HASHER
+    if algorithm not in PASSWORD_HASHERS:
+        raise ValueError(f"Unknown password hasher '{algorithm}', expected one of {list(PASSWORD_HASHERS)}")
+    return PASSWORD_HASHERS[algorithm]()
+
+
+def identify_hasher(encoded: str) -> Optional[PasswordHasher]:
+    """
+    Find the hasher that created a hash
+
+    Args:
+        encoded: Stored password hash
+
+    Returns:
+        Matching hasher or None if the format is unknown
+    """
+    for algorithm in PASSWORD_HASHERS:
+        hasher = get_hasher(algorithm)
+        if hasher.identify(encoded):
+            return hasher
+    return None
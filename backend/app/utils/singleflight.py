@@ -0,0 +1,154 @@
+"""
+Single-flight coalescing of identical concurrent calls
+
+While a call for a key is in flight, further callers with the same key wait
+for it and share its result (or exception) instead of repeating the work.
+Nothing is cached: once the call finishes, the next caller starts a new one.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from app.core.metrics import registry
+
+singleflight_calls = registry.counter(
+    "singleflight_calls_total",
+    "Calls through a single-flight group, by whether they ran or joined one in flight",
+    ("group", "role"),
+)
+singleflight_coalescing_ratio = registry.gauge(
+    "singleflight_coalescing_ratio",
+    "Fraction of single-flight calls served by joining a call in flight",
+    ("group",),
+)
+
+
+class _Call:
+    """A call in flight for the thread-based path"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Group of calls coalesced by key
+
+    do() serves threads (sync code, including sync routes in the threadpool);
+    do_async() serves coroutines on one event loop. The two paths never
+    share calls with each other.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the group
+
+        Args:
+            name: Group label used in metrics
+        """
+        self.name = name
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._in_flight_async: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._leader_calls = singleflight_calls.labels(name, "leader")
+        self._shared_calls = singleflight_calls.labels(name, "shared")
+        singleflight_coalescing_ratio.labels(name).set_function(
+            lambda: self.shared / self.calls if self.calls else 0.0
+        )
+
+    def _count(self, shared: bool) -> None:
+        # Called with the lock held
+        self.calls += 1
+        if shared:
+            self.shared += 1
+            self._shared_calls.inc()
+        else:
+            self._leader_calls.inc()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the call already running for key
+
+        Args:
+            key: Identity of the call
+            fn: Function producing the result
+
+        Returns:
+            Tuple of (result, whether it came from another caller's call)
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            shared = call is not None
+            if not shared:
+                call = self._in_flight[key] = _Call()
+            self._count(shared)
+
+        if shared:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await fn, or the call already running for key
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine function producing the result
+
+        Returns:
+            Tuple of (result, whether it came from another caller's call)
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        future = self._in_flight_async.get(key)
+        while future is not None:
+            with self._lock:
+                self._count(True)
+            try:
+                # shield: a cancelled follower must not cancel the shared call
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled; start or join a new call
+                future = self._in_flight_async.get(key)
+
+        with self._lock:
+            self._count(False)
+        future = self._in_flight_async[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Only followers read the exception; don't warn when there are none
+            future.exception()
+            raise
+        finally:
+            del self._in_flight_async[key]
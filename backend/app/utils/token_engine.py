@@ -0,0 +1,434 @@
+"""
+JWT signing and verification with key material prepared once
+
+Produces the same compact serialization as python-jose (sorted, compact
+header JSON; compact claims JSON; NumericDate integers for datetime claims),
+so tokens are byte-identical to the previous implementation for HS256 and
+interchangeable with it for every algorithm.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from calendar import timegm
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Union
+from app.config import settings
+
+# Claims converted from datetime to NumericDate when encoding
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+class TokenError(Exception):
+    """Token is malformed, wrongly signed or fails claim validation"""
+
+
+class ExpiredTokenError(TokenError):
+    """Token has expired"""
+
+
+def b64url_encode(data: bytes) -> bytes:
+    """Base64url-encode without padding"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: Union[str, bytes]) -> bytes:
+    """Base64url-decode, restoring any stripped padding"""
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class Signer(ABC):
+    """Signs and verifies a JWS signing input for one algorithm and key"""
+
+    # JWS algorithm name
+    algorithm: str = ""
+    # JWK members hashed into the thumbprint
+    thumbprint_members: tuple = ()
+
+    @abstractmethod
+    def sign(self, message: bytes) -> bytes:
+        """Sign a message"""
+
+    @abstractmethod
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        """Check a signature over a message"""
+
+    def public_jwk(self) -> Optional[Dict[str, str]]:
+        """Public key as a JWK, or None for symmetric keys"""
+        return None
+
+    def thumbprint(self) -> Optional[str]:
+        """RFC 7638 JWK thumbprint, usable as a key ID, or None for symmetric keys"""
+        jwk = self.public_jwk()
+        if jwk is None:
+            return None
+        required = {name: jwk[name] for name in self.thumbprint_members}
+        digest = hashlib.sha256(json.dumps(required, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+        return b64url_encode(digest.digest()).decode("ascii")
+
+
+class HMACSigner(Signer):
+    """HS256/HS384/HS512 via the hmac module's one-shot digest"""
+
+    def __init__(self, algorithm: str, secret: Union[str, bytes]):
+        self.algorithm = algorithm
+        self.digest = "sha" + algorithm[2:]
+        self.secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+
+    def sign(self, message: bytes) -> bytes:
+        return hmac.digest(self.secret, message, self.digest)
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(hmac.digest(self.secret, message, self.digest), signature)
+
+
+class AsymmetricSigner(Signer):
+    """Signer for a private/public key pair loaded from PEM"""
+
+    def __init__(self, private_pem: Optional[str] = None, public_pem: Optional[str] = None):
+        """
+        Load the key pair
+
+        Args:
+            private_pem: PEM private key, needed for signing
+            public_pem: PEM public key, derived from the private key when omitted
+
+        Raises:
+            ValueError: If no key is given or a key does not fit the algorithm
+        """
+        from cryptography.hazmat.primitives import serialization
+
+        self.private_key = None
+        if private_pem:
+            self.private_key = serialization.load_pem_private_key(private_pem.encode("utf-8"), password=None)
+        if public_pem:
+            self.public_key = serialization.load_pem_public_key(public_pem.encode("utf-8"))
+        elif self.private_key is not None:
+            self.public_key = self.private_key.public_key()
+        else:
+            raise ValueError(f"{self.algorithm} requires JWT_PRIVATE_KEY or JWT_PUBLIC_KEY")
+
+        if not self.accepts(self.public_key):
+            raise ValueError(f"Key does not match the {self.algorithm} algorithm")
+
+    @staticmethod
+    @abstractmethod
+    def accepts(public_key) -> bool:
+        """Whether a public key belongs to this algorithm"""
+
+    def _private_key(self):
+        if self.private_key is None:
+            raise TokenError("No private key configured for signing")
+        return self.private_key
+
+
+class ECDSASigner(AsymmetricSigner):
+    """ES256 with raw r||s signatures as required by JWS"""
+
+    algorithm = "ES256"
+    thumbprint_members = ("crv", "kty", "x", "y")
+
+    @staticmethod
+    def accepts(public_key) -> bool:
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        return isinstance(public_key, ec.EllipticCurvePublicKey) and public_key.curve.name == "secp256r1"
+
+    def sign(self, message: bytes) -> bytes:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+        r, s = decode_dss_signature(self._private_key().sign(message, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+        if len(signature) != 64:
+            return False
+        der = encode_dss_signature(int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big"))
+        try:
+            self.public_key.verify(der, message, ec.ECDSA(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> Dict[str, str]:
+        numbers = self.public_key.public_numbers()
+        return {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": b64url_encode(numbers.x.to_bytes(32, "big")).decode("ascii"),
+            "y": b64url_encode(numbers.y.to_bytes(32, "big")).decode("ascii"),
+        }
+
+
+class EdDSASigner(AsymmetricSigner):
+    """EdDSA over Ed25519"""
+
+    algorithm = "EdDSA"
+    thumbprint_members = ("crv", "kty", "x")
+
+    @staticmethod
+    def accepts(public_key) -> bool:
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+
+        return isinstance(public_key, ed25519.Ed25519PublicKey)
+
+    def sign(self, message: bytes) -> bytes:
+        return self._private_key().sign(message)
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+
+        try:
+            self.public_key.verify(signature, message)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> Dict[str, str]:
+        from cryptography.hazmat.primitives import serialization
+
+        raw = self.public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return {"kty": "OKP", "crv": "Ed25519", "x": b64url_encode(raw).decode("ascii")}
+
+
+# Signer factories by JWS algorithm, taking (secret, private PEM, public PEM)
+SIGNERS: Dict[str, Callable[[str, Optional[str], Optional[str]], Signer]] = {
+    "HS256": lambda secret, private_pem, public_pem: HMACSigner("HS256", secret),
+    "HS384": lambda secret, private_pem, public_pem: HMACSigner("HS384", secret),
+    "HS512": lambda secret, private_pem, public_pem: HMACSigner("HS512", secret),
+    "ES256": lambda secret, private_pem, public_pem: ECDSASigner(private_pem, public_pem),
+    "EdDSA": lambda secret, private_pem, public_pem: EdDSASigner(private_pem, public_pem),
+}
+
+
+def load_verification_key(public_pem: str) -> AsymmetricSigner:
+    """
+    Load a public key, picking the algorithm from the key type
+
+    Args:
+        public_pem: PEM public key
+
+    Returns:
+        Verify-only signer
+
+    Raises:
+        ValueError: If the key type is not supported
+    """
+    from cryptography.hazmat.primitives import serialization
+
+    public_key = serialization.load_pem_public_key(public_pem.encode("utf-8"))
+    for signer_class in (ECDSASigner, EdDSASigner):
+        if signer_class.accepts(public_key):
+            return signer_class(public_pem=public_pem)
+    raise ValueError("Unsupported verification key type, expected P-256 or Ed25519")
+
+
+def _encode_header(header: Dict[str, str]) -> bytes:
+    """Serialize a header segment the way python-jose does"""
+    return b64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+
+class TokenEngine:
+    """Encode JWTs with one signing key and decode them with any known key"""
+
+    def __init__(
+        self,
+        signer: Signer,
+        kid: Optional[str] = None,
+        verification_keys: Optional[Dict[str, Signer]] = None
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            signer: Signer holding the active key material
+            kid: Key ID put in the header of issued tokens
+            verification_keys: Further key ID -> signer accepted when decoding
+                (e.g. the previous key during a rotation)
+        """
+        self.signer = signer
+        self.algorithm = signer.algorithm
+        self.kid = kid
+
+        # The header never changes, so it is serialized once
+        self.header = {"alg": self.algorithm, "typ": "JWT"}
+        if kid:
+            self.header["kid"] = kid
+        self.header_segment = _encode_header(self.header)
+
+        self.keys: Dict[str, Signer] = dict(verification_keys or {})
+        if kid:
+            self.keys[kid] = signer
+
+        # Known header segments -> verifier, so common tokens skip header parsing
+        self._verifiers: Dict[bytes, Signer] = {self.header_segment: signer}
+        for key_id, verifier in self.keys.items():
+            segment = _encode_header({"alg": verifier.algorithm, "kid": key_id, "typ": "JWT"})
+            self._verifiers[segment] = verifier
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Sign a claims set
+
+        Args:
+            claims: Claims to sign; datetime values of exp/iat/nbf become NumericDates
+
+        Returns:
+            Compact JWS string
+        """
+        if any(isinstance(claims.get(claim), datetime) for claim in TIME_CLAIMS):
+            claims = dict(claims)
+            for claim in TIME_CLAIMS:
+                if isinstance(claims.get(claim), datetime):
+                    claims[claim] = timegm(claims[claim].utctimetuple())
+
+        payload_segment = b64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        signing_input = self.header_segment + b"." + payload_segment
+        return (signing_input + b"." + b64url_encode(self.signer.sign(signing_input))).decode("ascii")
+
+    def _get_verifier(self, header_segment: bytes) -> Signer:
+        """Find the key for a token header, rejecting unknown keys and algorithms"""
+        verifier = self._verifiers.get(header_segment)
+        if verifier is not None:
+            return verifier
+
+        try:
+            header = json.loads(b64url_decode(header_segment))
+        except (ValueError, binascii.Error):
+            raise TokenError("Invalid header")
+        if not isinstance(header, dict):
+            raise TokenError("Invalid header")
+
+        kid = header.get("kid")
+        # Tokens without a key ID predate key IDs and use the active key
+        verifier = self.signer if kid is None else self.keys.get(kid)
+        if verifier is None:
+            raise TokenError("Unknown signing key")
+        if header.get("alg") != verifier.algorithm:
+            raise TokenError("The specified alg value is not allowed")
+        return verifier
+
+    def jwks(self) -> Dict[str, Any]:
+        """
+        Get the public verification keys as a JWK Set
+
+        Returns:
+            JWK Set with every asymmetric key, empty for shared secrets
+        """
+        keys = []
+        for kid, verifier in self.keys.items():
+            jwk = verifier.public_jwk()
+            if jwk is not None:
+                keys.append({**jwk, "kid": kid, "alg": verifier.algorithm, "use": "sig"})
+        return {"keys": keys}
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token's signature and registered claims
+
+        Args:
+            token: Compact JWS string
+
+        Returns:
+            Claims set
+
+        Raises:
+            ExpiredTokenError: If the token has expired
+            TokenError: If the token is malformed, wrongly signed or has invalid claims
+        """
+        try:
+            data = token.encode("ascii")
+        except (AttributeError, UnicodeEncodeError):
+            raise TokenError("Invalid token encoding")
+
+        parts = data.split(b".")
+        if len(parts) != 3:
+            raise TokenError("Token must have three segments")
+        header_segment, payload_segment, signature_segment = parts
+
+        verifier = self._get_verifier(header_segment)
+
+        try:
+            signature = b64url_decode(signature_segment)
+        except (ValueError, binascii.Error):
+            raise TokenError("Invalid crypto padding")
+        if not verifier.verify(data[:len(header_segment) + 1 + len(payload_segment)], signature):
+            raise TokenError("Signature verification failed")
+
+        try:
+            claims = json.loads(b64url_decode(payload_segment))
+        except (ValueError, binascii.Error) as e:
+            raise TokenError(f"Invalid payload string: {e}")
+        if not isinstance(claims, dict):
+            raise TokenError("Invalid payload string: must be a json object")
+
+        self._validate_claims(claims)
+        return claims
+
+    @staticmethod
+    def _numeric_claim(claims: Dict[str, Any], claim: str) -> Optional[int]:
+        if claim not in claims:
+            return None
+        try:
+            return int(claims[claim])
+        except (TypeError, ValueError):
+            raise TokenError(f"Claim ({claim}) must be an integer")
+
+    def _validate_claims(self, claims: Dict[str, Any]) -> None:
+        """Validate registered claims the way python-jose's defaults do"""
+        now = int(time.time())
+
+        self._numeric_claim(claims, "iat")
+
+        nbf = self._numeric_claim(claims, "nbf")
+        if nbf is not None and nbf > now:
+            raise TokenError("The token is not yet valid (nbf)")
+
+        exp = self._numeric_claim(claims, "exp")
+        if exp is not None and exp < now:
+            raise ExpiredTokenError("Signature has expired")
+
+        # No audience is configured, so tokens naming one are not for us
+        if "aud" in claims:
+            raise TokenError("Invalid audience")
+
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise TokenError("Subject must be a string")
+
+        if "jti" in claims and not isinstance(claims["jti"], str):
+            raise TokenError("JWT ID must be a string")
+
+
+@lru_cache(maxsize=None)
+def get_token_engine() -> TokenEngine:
+    """
+    Get the token engine configured from settings
+
+    Asymmetric signing keys get a key ID (JWT_KEY_ID, or the key's RFC 7638
+    thumbprint); keys in JWT_VERIFICATION_KEYS stay valid for decoding.
+
+    Raises:
+        ValueError: If the algorithm is unsupported or its keys are missing
+    """
+    algorithm = settings.ALGORITHM
+    if algorithm not in SIGNERS:
+        raise ValueError(f"Unsupported JWT algorithm '{algorithm}', expected one of {list(SIGNERS)}")
+    signer = SIGNERS[algorithm](settings.SECRET_KEY, settings.JWT_PRIVATE_KEY, settings.JWT_PUBLIC_KEY)
+    verification_keys = {
+        kid: load_verification_key(public_pem)
+        for kid, public_pem in settings.JWT_VERIFICATION_KEYS.items()
+    }
+    return TokenEngine(signer, kid=settings.JWT_KEY_ID or signer.thumbprint(), verification_keys=verification_keys)
@@ -0,0 +1,76 @@
+"""
+Token revocation check benchmark
+
+Fills an in-memory revocation list and times is_revoked for tokens that
+were never revoked (the common case, answered by the Bloom filter) and for
+revoked ones, then reports the observed false positive rate against the
+configured target. No database is touched.
+
+Usage:
+    python -m benchmarks.revocation [--revoked 100000] [--checks 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+# The list is filled directly, so any database URL will do
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.config import settings
+from app.core.database import engine
+from app.services.revocation import RevocationList
+
+
+def time_checks(revocations: RevocationList, jtis: List[str]) -> float:
+    """
+    Time is_revoked over a list of jtis
+
+    Args:
+        revocations: List to check against
+        jtis: Token IDs to check
+
+    Returns:
+        Checks per second
+    """
+    is_revoked = revocations.is_revoked
+    start = time.perf_counter()
+    for jti in jtis:
+        is_revoked(jti)
+    return len(jtis) / (time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.revocation")
+    parser.add_argument("--revoked", type=int, default=settings.REVOCATION_BLOOM_CAPACITY)
+    parser.add_argument("--checks", type=int, default=1_000_000)
+    parser.add_argument("--capacity", type=int, default=settings.REVOCATION_BLOOM_CAPACITY)
+    parser.add_argument("--error-rate", type=float, default=settings.REVOCATION_BLOOM_ERROR_RATE)
+    args = parser.parse_args(argv)
+
+    revocations = RevocationList(engine, args.capacity, args.error_rate, settings.REVOCATION_SYNC_INTERVAL)
+    expires_at = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    revoked = [uuid.uuid4().hex for _ in range(args.revoked)]
+    for jti in revoked:
+        revocations.add(jti, expires_at)
+    live = [uuid.uuid4().hex for _ in range(args.checks)]
+
+    live_rate = time_checks(revocations, live)
+    false_positives = revocations.false_positives
+    revoked_rate = time_checks(revocations, revoked[:args.checks])
+    bloom = revocations.bloom
+
+    print(f"Revoked tokens:      {len(revocations)} (filter {bloom.memory_bytes / 1024:.0f} KiB, {bloom.num_hashes} hashes)")
+    print(f"Live token checks:   {live_rate:,.0f}/s")
+    print(f"Revoked checks:      {revoked_rate:,.0f}/s")
+    print(f"False positive rate: {false_positives / len(live):.5f} observed, "
+          f"{bloom.false_positive_rate:.5f} expected, {args.error_rate:.5f} target")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
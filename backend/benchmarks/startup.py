@@ -0,0 +1,85 @@
+"""
+Startup benchmark
+
+Times importing app.main in a fresh interpreter, and the time from
+launching uvicorn until the first response from the liveness probe. Each
+is repeated and the median reported. The database in DATABASE_URL must
+already be initialized with `python -m app.manage init-db`.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--port 8765]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import List, Optional
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import app.main; print(time.perf_counter() - start)"
+
+
+def time_import() -> float:
+    """Seconds to import app.main in a new interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def time_first_response(port: int, timeout: float) -> float:
+    """
+    Seconds from launching uvicorn until GET /api/v1/health/live answers
+
+    Args:
+        port: Port to serve on
+        timeout: Seconds to wait for the first response
+
+    Returns:
+        Time to first response in seconds
+    """
+    from app.config import settings
+
+    url = f"http://127.0.0.1:{port}{settings.API_V1_PREFIX}/health/live"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup; is the database initialized?")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"No response within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    imports = [time_import() for _ in range(args.runs)]
+    first_responses = [time_first_response(args.port, args.timeout) for _ in range(args.runs)]
+
+    print(f"Import app.main:         {statistics.median(imports) * 1000:.0f} ms median of {args.runs}")
+    print(f"Time to first response:  {statistics.median(first_responses) * 1000:.0f} ms median of {args.runs}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
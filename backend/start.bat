@@ -7,6 +7,9 @@ cd /d "%~dp0"
 REM Set Python path
 set PYTHONPATH=%CD%
 
+REM Create missing tables (skipped when the schema is up to date)
+python -m app.manage init-db
+
 REM Run the application
 python -m app.main
 
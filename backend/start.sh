@@ -6,5 +6,8 @@ echo "Starting Crammer+ Backend..."
 # Set Python path
 export PYTHONPATH="${PWD}"
 
+# Create missing tables (skipped when the schema is up to date)
+python -m app.manage init-db
+
 # Run the application
 python -m app.main
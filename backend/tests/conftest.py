@@ -0,0 +1,98 @@
+"""
+Shared test fixtures
+
+Tests run against a throwaway SQLite database; the environment is set before
+the app is imported so settings pick it up.
+"""
+import os
+import asyncio
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("DEBUG", "False")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, List
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import Base, SessionLocal, engine, get_async_engine, get_async_session
+from app.core.db_instrumentation import DBStats, start_db_stats, stop_db_stats
+from app.models import User, UserRole
+from app.services.token_store import spent_tokens
+from app.services.user_cache import user_cache
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--run-slow", action="store_true", help="Also run tests marked slow")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "slow: long-running test, skipped unless --run-slow is given")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    if config.getoption("--run-slow"):
+        return
+    skip = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    """Session on freshly created tables"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Recreated tables reuse IDs, so drop what earlier tests cached
+    user_cache.clear()
+    spent_tokens.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def make_users(db: Session, count: int) -> List[User]:
+    """Insert count users, one statement per user, and return them"""
+    users = []
+    for i in range(count):
+        user = User(
+            full_name=f"User {i}",
+            email=f"user{i}@example.com",
+            password_hash="x",
+            role=UserRole.STUDENT,
+        )
+        db.add(user)
+        db.flush()
+        users.append(user)
+    db.commit()
+    return users
+
+
+@contextmanager
+def count_statements() -> Iterator[DBStats]:
+    """Collect the statements executed in the block"""
+    stats, token = start_db_stats()
+    try:
+        yield stats
+    finally:
+        stop_db_stats(token)
+
+
+def run_with_async_session(fn: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+    """Run fn with a session from get_async_session on a new event loop"""
+    async def main():
+        sessions = get_async_session()
+        session = await sessions.__anext__()
+        try:
+            return await fn(session)
+        finally:
+            await sessions.aclose()
+            # aiosqlite connections belong to this loop
+            await get_async_engine().dispose()
+    
+    return asyncio.run(main())
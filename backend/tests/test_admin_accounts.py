@@ -0,0 +1,80 @@
+"""
+Tests for admin account creation and the admin-only export
+"""
+import io
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from app.config import settings
+from app.main import app
+from app.manage import main
+from app.models import User, UserRole
+from app.schemas.auth import AdminCreateRequest, SignUpRequest
+
+SIGNUP = {
+    "full_name": "Eve Example",
+    "email": "eve@example.com",
+    "password": "password123",
+}
+
+
+def _create_admin(monkeypatch, email="admin@example.com"):
+    monkeypatch.setattr("sys.stdin", io.StringIO("password123\n"))
+    return main(["create-admin", "--email", email, "--full-name", "Site Admin", "--password-stdin"])
+
+
+def test_signup_schema_rejects_admin_role():
+    with pytest.raises(ValidationError):
+        SignUpRequest(**SIGNUP, role="admin")
+    # The CLI schema is the only one that accepts it
+    assert AdminCreateRequest(**SIGNUP).role == "admin"
+
+
+def test_signup_route_rejects_admin_role(db):
+    client = TestClient(app)
+    
+    response = client.post(f"{settings.API_V1_PREFIX}/auth/signup", json={**SIGNUP, "role": "admin"})
+    
+    assert response.status_code == 422
+    assert db.query(User).count() == 0
+
+
+def test_create_admin_command_creates_an_admin_who_can_export(db, monkeypatch):
+    assert _create_admin(monkeypatch) == 0
+    
+    admin = db.query(User).filter(User.email == "admin@example.com").one()
+    assert admin.role == UserRole.ADMIN
+    
+    client = TestClient(app)
+    login = client.post(
+        f"{settings.API_V1_PREFIX}/auth/login",
+        json={"email": "admin@example.com", "password": "password123"},
+    )
+    token = login.json()["data"]["token"]["access_token"]
+    export = client.get(
+        f"{settings.API_V1_PREFIX}/admin/users/export",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert export.status_code == 200
+    assert "admin@example.com" in export.text
+
+
+def test_create_admin_command_rejects_a_registered_email(db, monkeypatch, capsys):
+    assert _create_admin(monkeypatch) == 0
+    
+    assert _create_admin(monkeypatch) == 1
+    assert "already registered" in capsys.readouterr().err.lower()
+    assert db.query(User).count() == 1
+
+
+def test_students_cannot_export(db):
+    client = TestClient(app)
+    signup = client.post(f"{settings.API_V1_PREFIX}/auth/signup", json={**SIGNUP, "role": "student"})
+    token = signup.json()["data"]["token"]["access_token"]
+    
+    export = client.get(
+        f"{settings.API_V1_PREFIX}/admin/users/export",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    
+    assert export.status_code == 403
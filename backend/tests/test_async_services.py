@@ -0,0 +1,96 @@
+"""
+Tests for the async services on aiosqlite
+"""
+import pytest
+from app.core.exceptions import NotFoundException, ValidationException
+from app.models import User, UserRole
+from app.schemas.auth import LoginRequest, SignUpRequest
+from app.services.auth_service import AsyncAuthService
+from app.services.base_service import AsyncBaseService
+from tests.conftest import make_users, run_with_async_session
+
+user_service = AsyncBaseService(User)
+
+NEW_USER = {"full_name": "Ann", "email": "ann@example.com", "password_hash": "x", "role": UserRole.STUDENT}
+
+
+def test_create_get_update_delete(db):
+    async def crud(session):
+        created = await user_service.create(session, NEW_USER)
+        fetched = await user_service.get_by_id(session, created.id)
+        updated = await user_service.update(session, created.id, {"full_name": "Renamed"})
+        deleted = await user_service.delete(session, created.id)
+        return created, fetched, updated, deleted, await user_service.get_by_id(session, created.id)
+    
+    created, fetched, updated, deleted, missing = run_with_async_session(crud)
+    
+    assert created.id is not None and created.created_at is not None
+    assert fetched.email == "ann@example.com"
+    assert updated.full_name == "Renamed"
+    assert deleted is True
+    assert missing is None
+
+
+def test_missing_rows_raise_not_found(db):
+    async def update_missing(session):
+        await user_service.update(session, 404, {"full_name": "Nobody"})
+    
+    async def delete_missing(session):
+        await user_service.delete(session, 404)
+    
+    with pytest.raises(NotFoundException):
+        run_with_async_session(update_missing)
+    with pytest.raises(NotFoundException):
+        run_with_async_session(delete_missing)
+
+
+def test_get_all_count_and_pages(db):
+    make_users(db, 25)
+    
+    async def read(session):
+        everything = await user_service.get_all(session, limit=100)
+        count = await user_service.count(session)
+        first = await user_service.get_page(session, limit=10)
+        second = await user_service.get_page(session, limit=10, cursor=first.next_cursor)
+        return everything, count, first, second
+    
+    everything, count, first, second = run_with_async_session(read)
+    
+    assert len(everything) == 25
+    assert count == 25
+    assert [user.id for user in first.items + second.items] == list(range(1, 21))
+
+
+def test_signup_and_login(db):
+    signup = SignUpRequest(full_name="Ann Bee", email="ann@example.com", password="password123", role="student")
+    
+    async def flow(session):
+        user = await AsyncAuthService.create_user(session, signup)
+        good = await AsyncAuthService.authenticate_user(
+            session, LoginRequest(email="ann@example.com", password="password123")
+        )
+        bad = await AsyncAuthService.authenticate_user(
+            session, LoginRequest(email="ann@example.com", password="wrongpass1")
+        )
+        unknown = await AsyncAuthService.authenticate_user(
+            session, LoginRequest(email="nobody@example.com", password="password123")
+        )
+        return user, good, bad, unknown
+    
+    user, good, bad, unknown = run_with_async_session(flow)
+    
+    assert user.id is not None and user.password_hash != "password123"
+    assert good is not None and good.id == user.id
+    assert bad is None
+    assert unknown is None
+
+
+def test_duplicate_signup_is_rejected(db):
+    signup = SignUpRequest(full_name="Ann Bee", email="ann@example.com", password="password123", role="student")
+    
+    async def twice(session):
+        await AsyncAuthService.create_user(session, signup)
+        await AsyncAuthService.create_user(session, signup)
+    
+    with pytest.raises(ValidationException):
+        run_with_async_session(twice)
@@ -0,0 +1,96 @@
+"""
+Tests for BaseService writes and keyset pagination
+"""
+import asyncio
+import pytest
+from app.core.exceptions import NotFoundException, ValidationException
+from app.models import User, UserRole
+from app.schemas.auth import SignUpRequest
+from app.services.auth_service import AuthService
+from app.services.base_service import BaseService
+from tests.conftest import count_statements, make_users
+
+user_service = BaseService(User)
+
+
+def _signup(db, email):
+    data = SignUpRequest(full_name="New User", email=email, password="password123", role="student")
+    return asyncio.run(AuthService.create_user(db, data))
+
+
+def test_create_is_one_statement(db):
+    with count_statements() as stats:
+        user = user_service.create(
+            db, {"full_name": "Ann", "email": "ann@example.com", "password_hash": "x", "role": UserRole.STUDENT}
+        )
+    
+    assert stats.queries == 1
+    # Server defaults come back with the INSERT
+    assert user.id is not None
+    assert user.created_at is not None and user.is_active is True
+
+
+def test_update_is_one_statement(db):
+    user = make_users(db, 1)[0]
+    
+    with count_statements() as stats:
+        updated = user_service.update(db, user.id, {"full_name": "Renamed"})
+    
+    assert stats.queries == 1
+    assert updated.full_name == "Renamed"
+    assert updated.updated_at >= updated.created_at
+
+
+def test_update_of_missing_row_is_one_statement(db):
+    with count_statements() as stats:
+        with pytest.raises(NotFoundException):
+            user_service.update(db, 404, {"full_name": "Nobody"})
+    
+    assert stats.queries == 1
+
+
+def test_signup_is_one_statement(db):
+    with count_statements() as stats:
+        user = _signup(db, "new@example.com")
+    
+    assert stats.queries == 1
+    assert user.email == "new@example.com"
+
+
+def test_duplicate_signup_is_detected_by_the_insert(db):
+    _signup(db, "new@example.com")
+    
+    with count_statements() as stats:
+        with pytest.raises(ValidationException):
+            _signup(db, "new@example.com")
+    
+    assert stats.queries == 1
+
+
+def test_get_page_walks_every_page_in_both_directions(db):
+    # Rows inserted within the same second share created_at, so the id
+    # tiebreaker decides the order across page boundaries
+    make_users(db, 25)
+    
+    pages, cursor = [], None
+    while True:
+        page = user_service.get_page(db, limit=10, cursor=cursor)
+        pages.append([user.id for user in page.items])
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    
+    assert pages == [list(range(1, 11)), list(range(11, 21)), list(range(21, 26))]
+    
+    previous = user_service.get_page(db, limit=10, cursor=page.prev_cursor)
+    assert [user.id for user in previous.items] == list(range(11, 21))
+
+
+def test_get_page_after_update_keeps_created_at_order(db):
+    users = make_users(db, 15)
+    user_service.update(db, users[0].id, {"full_name": "Renamed"})
+    
+    first = user_service.get_page(db, limit=10)
+    second = user_service.get_page(db, limit=10, cursor=first.next_cursor)
+    
+    assert [user.id for user in first.items + second.items] == list(range(1, 16))
@@ -0,0 +1,94 @@
+"""
+Tests for BaseService bulk operations
+"""
+import pytest
+from sqlalchemy import select
+from app.core.database import engine, get_dialect_insert
+from app.core.exceptions import DatabaseException
+from app.models import User, UserRole
+from app.services.base_service import BaseService
+from tests.conftest import count_statements, make_users
+
+user_service = BaseService(User)
+
+
+def _new_users(count, start=0):
+    return [
+        {"full_name": f"Bulk {i}", "email": f"bulk{i}@example.com", "password_hash": "x", "role": UserRole.STUDENT}
+        for i in range(start, start + count)
+    ]
+
+
+def test_bulk_create_inserts_one_statement_per_chunk(db):
+    with count_statements() as stats:
+        created = user_service.bulk_create(db, _new_users(25), chunk_size=10)
+    
+    assert stats.queries == 3
+    assert [user.email for user in created] == [f"bulk{i}@example.com" for i in range(25)]
+    assert all(user.id is not None and user.created_at is not None for user in created)
+    assert user_service.count(db) == 25
+
+
+def test_bulk_update_returns_the_rows_actually_updated(db):
+    make_users(db, 5)
+    
+    updated = user_service.bulk_update(db, [
+        {"id": 1, "full_name": "One"},
+        {"id": 2, "full_name": "Two", "is_verified": True},
+        {"id": 404, "full_name": "Missing"},
+        {"id": 3, "full_name": "Three"},
+    ], chunk_size=2)
+    
+    assert updated == 3
+    names = dict(db.execute(select(User.id, User.full_name)).all())
+    assert names == {1: "One", 2: "Two", 3: "Three", 4: "User 3", 5: "User 4"}
+    assert db.get(User, 2).is_verified is True
+
+
+def test_bulk_update_refreshes_updated_at(db):
+    user = make_users(db, 1)[0]
+    before = user.updated_at
+    
+    user_service.bulk_update(db, [{"id": user.id, "full_name": "Renamed"}])
+    
+    db.expire_all()
+    assert db.get(User, user.id).updated_at > before
+
+
+def test_bulk_upsert_inserts_and_updates_on_conflict(db):
+    user_service.bulk_create(db, _new_users(3))
+    rows = [dict(row, full_name=f"Upserted {i}") for i, row in enumerate(_new_users(5))]
+    
+    with count_statements() as stats:
+        upserted = user_service.bulk_upsert(db, rows, conflict_keys=("email",), chunk_size=2)
+    
+    assert stats.queries == 3
+    assert len(upserted) == 5
+    assert user_service.count(db) == 5
+    names = db.scalars(select(User.full_name).order_by(User.id)).all()
+    assert names == [f"Upserted {i}" for i in range(5)]
+    # Conflicting rows keep their IDs
+    assert [user.id for user in upserted[:3]] == [1, 2, 3]
+
+
+def test_bulk_upsert_on_an_unsupported_dialect_raises_database_exception(db, monkeypatch):
+    monkeypatch.setattr(engine.dialect, "name", "mysql")
+    
+    with pytest.raises(DatabaseException):
+        user_service.bulk_upsert(db, _new_users(1), conflict_keys=("email",))
+
+
+def test_get_dialect_insert_rejects_unsupported_dialects():
+    with pytest.raises(DatabaseException):
+        get_dialect_insert("mysql")
+
+
+def test_bulk_delete_returns_the_rows_actually_deleted(db):
+    make_users(db, 5)
+    
+    with count_statements() as stats:
+        deleted = user_service.bulk_delete(db, [1, 2, 404, 4], chunk_size=2)
+    
+    assert stats.queries == 2
+    assert deleted == 3
+    assert db.scalars(select(User.id)).all() == [3, 5]
@@ -0,0 +1,102 @@
+"""
+Tests for streaming exports
+"""
+import csv
+import io
+import json
+import tracemalloc
+from types import SimpleNamespace
+import pytest
+from app.models import User, UserRole
+from app.services.base_service import BaseService
+from app.services.export_service import iter_csv, iter_ndjson, stream_export
+from tests.conftest import make_users
+
+FIELDS = ("id", "email")
+
+
+def _rows(count):
+    # Generated lazily, like rows from BaseService.stream
+    return (SimpleNamespace(id=i, email=f"user{i}@example.com") for i in range(count))
+
+
+def test_iter_ndjson_yields_every_row_in_batches():
+    chunks = list(iter_ndjson(_rows(2500), FIELDS, batch_size=1000))
+    
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert len(lines) == 2500
+    assert json.loads(lines[-1]) == {"id": 2499, "email": "user2499@example.com"}
+
+
+def test_iter_csv_yields_header_and_every_row_in_batches():
+    chunks = list(iter_csv(_rows(2500), FIELDS, batch_size=1000))
+    
+    assert len(chunks) == 3
+    records = list(csv.reader(io.StringIO("".join(chunks))))
+    assert records[0] == list(FIELDS)
+    assert len(records) == 2501
+    assert records[-1] == ["2499", "user2499@example.com"]
+
+
+def test_empty_exports():
+    assert list(iter_ndjson(_rows(0), FIELDS)) == []
+    # The header is still sent when nothing matched
+    assert "".join(iter_csv(_rows(0), FIELDS)) == "id,email\r\n"
+
+
+def test_export_memory_does_not_grow_with_row_count():
+    def peak(count):
+        tracemalloc.start()
+        try:
+            for _ in iter_csv(_rows(count), FIELDS, batch_size=1000):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    small, large = peak(10_000), peak(200_000)
+    # 20x the rows (about 6 MB of CSV) must not need much more memory than one batch
+    assert large < small * 1.5
+
+
+def test_stream_export_reads_rows_from_the_database(db):
+    make_users(db, 25)
+    
+    text = "".join(stream_export(BaseService(User), FIELDS, "csv", batch_size=10))
+    
+    records = list(csv.reader(io.StringIO(text)))
+    assert records[0] == list(FIELDS)
+    assert [int(record[0]) for record in records[1:]] == list(range(1, 26))
+
+
+def _insert_users(db, start, stop, chunk=50_000):
+    table = User.__table__
+    for low in range(start, stop, chunk):
+        db.execute(table.insert(), [
+            {"full_name": f"User {i}", "email": f"user{i}@example.com", "password_hash": "x", "role": UserRole.STUDENT}
+            for i in range(low, min(low + chunk, stop))
+        ])
+    db.commit()
+
+
+@pytest.mark.slow
+def test_database_export_memory_is_constant_at_a_million_rows(db):
+    def peak():
+        tracemalloc.start()
+        try:
+            rows = 0
+            for chunk in stream_export(BaseService(User), FIELDS, "csv"):
+                rows += chunk.count("\n")
+            return rows, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    _insert_users(db, 0, 10_000)
+    small_rows, small = peak()
+    _insert_users(db, 10_000, 1_000_000)
+    large_rows, large = peak()
+    
+    # Header plus every row, read from the database in keyset pages
+    assert (small_rows, large_rows) == (10_001, 1_000_001)
+    assert large < small * 1.5
@@ -0,0 +1,48 @@
+"""
+Tests for the background database health probe
+"""
+import asyncio
+import threading
+from sqlalchemy.pool import NullPool
+from app.core.database import engine
+from app.core.health_probe import STATUS_CONNECTED, STATUS_ERROR, HealthProbe, ProbeResult, health_probe
+
+
+def test_probe_uses_its_own_unpooled_engine():
+    assert health_probe.engine is not engine
+    assert isinstance(health_probe.engine.pool, NullPool)
+    
+    result = asyncio.run(health_probe.probe())
+    
+    assert result.status == STATUS_CONNECTED
+
+
+def test_probe_is_skipped_while_a_timed_out_probe_is_still_running():
+    probe = HealthProbe(health_probe.engine, interval=60, timeout=0.05, max_age=60)
+    release = threading.Event()
+    calls = []
+    
+    def hung_query():
+        calls.append(1)
+        release.wait(5)
+        return ProbeResult(status=STATUS_CONNECTED)
+    
+    probe._query = hung_query
+    
+    async def scenario():
+        timed_out = await probe.probe()
+        skipped = await probe.probe()
+        # The hung thread was not joined by a second one
+        assert len(calls) == 1
+        release.set()
+        await probe._query_future
+        recovered = await probe.probe()
+        return timed_out, skipped, recovered
+    
+    timed_out, skipped, recovered = asyncio.run(scenario())
+    
+    assert timed_out.status == STATUS_ERROR and "timed out" in timed_out.error
+    assert skipped.status == STATUS_ERROR and "still running" in skipped.error
+    assert recovered.status == STATUS_CONNECTED
+    assert len(calls) == 2
+    assert probe.ready
@@ -0,0 +1,45 @@
+"""
+Tests for the in-process metrics
+"""
+import threading
+from app.core.metrics import CounterChild, HistogramChild
+
+
+def _in_threads(fn, count):
+    for _ in range(count):
+        thread = threading.Thread(target=fn)
+        thread.start()
+        thread.join()
+
+
+def test_exited_threads_fold_into_the_base_total():
+    counter = CounterChild()
+    counter.inc()
+    
+    _in_threads(counter.inc, 200)
+    
+    assert counter.value == 201
+    # Only the live main thread keeps a shard
+    assert len(counter._shards) == 1
+
+
+def test_new_threads_prune_exited_shards_without_a_scrape():
+    counter = CounterChild()
+    
+    _in_threads(lambda: counter.inc(2), 200)
+    
+    assert len(counter._shards) == 1
+    assert counter.value == 400
+
+
+def test_histogram_keeps_observations_from_exited_threads():
+    histogram = HistogramChild((0.1, 1.0))
+    
+    _in_threads(lambda: histogram.observe(0.5), 10)
+    histogram.observe(5.0)
+    
+    cumulative, count, total = histogram.snapshot()
+    assert cumulative == [0, 10, 11]
+    assert count == 11
+    assert total == 10.0
+    assert len(histogram._shards) == 1
@@ -0,0 +1,123 @@
+"""
+Tests for login rate limiting
+"""
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.config import settings
+from app.core import rate_limit
+from app.core.rate_limit import MemorySlidingWindowBackend, get_client_ip, login_limiter
+from app.main import app
+
+LOGIN_URL = f"{settings.API_V1_PREFIX}/auth/login"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(login_limiter, "backend", MemorySlidingWindowBackend())
+    return login_limiter
+
+
+def _hits(backend, count, key="key", limit=5, window=60):
+    return [backend.hit(key, limit, window) for _ in range(count)]
+
+
+def test_limit_applies_within_a_window(clock):
+    backend = MemorySlidingWindowBackend()
+    clock[0] = 615  # 15 s into a window
+    
+    *allowed, rejected = _hits(backend, 6)
+    
+    assert allowed == [0.0] * 5
+    # The window ends in 45 s, and then all 5 hits still count in full
+    assert rejected == 45
+    assert _hits(backend, 1, key="other") == [0.0]
+
+
+def test_previous_window_slides_out(clock):
+    backend = MemorySlidingWindowBackend()
+    clock[0] = 615
+    _hits(backend, 5)
+    
+    # 15 s into the next window the 5 earlier hits weigh 3.75
+    clock[0] = 675
+    assert _hits(backend, 3) == [0.0, 0.0, 9.0]
+    
+    # After those 9 s the weighted count is back under the limit
+    clock[0] = 684.5
+    assert _hits(backend, 1) == [0.0]
+
+
+def test_counts_expire_after_two_windows_and_on_reset(clock):
+    backend = MemorySlidingWindowBackend()
+    clock[0] = 615
+    _hits(backend, 5)
+    
+    clock[0] = 735
+    assert _hits(backend, 5) == [0.0] * 5
+    
+    backend.reset("key")
+    assert _hits(backend, 5) == [0.0] * 5
+
+
+def test_least_recently_used_keys_are_dropped():
+    backend = MemorySlidingWindowBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        backend.hit(key, 1, 60)
+    
+    assert len(backend._counters) == 2
+    # "a" was dropped, so it starts over
+    assert backend.hit("a", 1, 60) == 0.0
+
+
+def _request(peer="10.0.0.1", forwarded=None):
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded or []]
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+@pytest.mark.parametrize("trusted, forwarded, expected", [
+    (0, ["203.0.113.9"], "10.0.0.1"),
+    (1, ["203.0.113.9"], "203.0.113.9"),
+    (1, ["198.51.100.1, 203.0.113.9"], "203.0.113.9"),
+    (2, ["198.51.100.1, 203.0.113.9", "10.0.0.2"], "203.0.113.9"),
+    (2, ["203.0.113.9"], "10.0.0.1"),
+    (1, [], "10.0.0.1"),
+])
+def test_client_ip_counts_trusted_proxies_from_the_right(trusted, forwarded, expected):
+    assert get_client_ip(_request(forwarded=forwarded), trusted) == expected
+
+
+def test_repeated_logins_get_429_with_retry_after(db, limiter):
+    client = TestClient(app)
+    credentials = {"email": "nobody@example.com", "password": "password123"}
+    
+    statuses = [client.post(LOGIN_URL, json=credentials).status_code for _ in range(limiter.per_email)]
+    throttled = client.post(LOGIN_URL, json=credentials)
+    
+    assert statuses == [401] * limiter.per_email
+    assert throttled.status_code == 429
+    assert 1 <= int(throttled.headers["Retry-After"]) <= limiter.window
+
+
+def test_per_ip_limit_uses_the_forwarded_client(db, limiter, monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 1)
+    monkeypatch.setattr(limiter, "per_ip", 2)
+    client = TestClient(app)
+    
+    def login(ip, n):
+        return client.post(
+            LOGIN_URL,
+            json={"email": f"user{n}@example.com", "password": "password123"},
+            headers={"X-Forwarded-For": f"198.51.100.1, {ip}"},
+        ).status_code
+    
+    assert [login("203.0.113.1", n) for n in range(3)] == [401, 401, 429]
+    # Another client behind the same proxy has its own budget
+    assert login("203.0.113.2", 3) == 401
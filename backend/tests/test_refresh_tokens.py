@@ -0,0 +1,118 @@
+"""
+Tests for refresh token rotation and reuse detection
+"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app.config import settings
+from app.core.exceptions import AuthenticationException
+from app.models import RefreshToken
+from app.services.auth_service import AsyncAuthService, AuthService
+from app.services.token_store import spent_tokens
+from app.utils.jwt_utils import create_refresh_token
+from tests.conftest import count_statements, make_users, run_with_async_session
+
+
+def _login(db):
+    user = make_users(db, 1)[0]
+    return user, AuthService.generate_tokens(db, user)
+
+
+def _family(db):
+    return db.query(RefreshToken).order_by(RefreshToken.id).all()
+
+
+def _set_on_all(db, **values):
+    db.execute(update(RefreshToken).values(**values))
+    db.commit()
+
+
+def test_refresh_returns_a_new_pair_and_spends_the_old_token(db):
+    user, tokens = _login(db)
+    
+    rotated = AuthService.refresh_tokens(db, tokens.refresh_token)
+    
+    assert rotated.refresh_token != tokens.refresh_token
+    assert rotated.access_token != tokens.access_token
+    first, second = _family(db)
+    assert first.used_at is not None and second.used_at is None
+    assert first.family_id == second.family_id
+    # The successor works in turn
+    AuthService.refresh_tokens(db, rotated.refresh_token)
+
+
+def test_refresh_is_one_update_and_one_insert(db, monkeypatch):
+    # Statement texts are only kept while N+1 detection is on
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 10)
+    user, tokens = _login(db)
+    # Warm the user cache so the user lookup needs no query
+    AuthService.get_user_by_id(db, user.id)
+    
+    with count_statements() as stats:
+        AuthService.refresh_tokens(db, tokens.refresh_token)
+    
+    assert stats.queries == 2
+    update_sql, insert_sql = stats.statements
+    assert update_sql.startswith("UPDATE refresh_tokens") and "RETURNING" in update_sql
+    assert insert_sql.startswith("INSERT INTO refresh_tokens")
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["same-worker", "other-worker"])
+def test_replay_revokes_the_whole_family(db, cached):
+    user, tokens = _login(db)
+    rotated = AuthService.refresh_tokens(db, tokens.refresh_token)
+    if not cached:
+        # The worker that rotated the token is not the one seeing the replay
+        spent_tokens.clear()
+    
+    with pytest.raises(AuthenticationException):
+        AuthService.refresh_tokens(db, tokens.refresh_token)
+    
+    assert all(row.revoked_at is not None for row in _family(db))
+    # Including the successor the legitimate client holds
+    with pytest.raises(AuthenticationException):
+        AuthService.refresh_tokens(db, rotated.refresh_token)
+
+
+@pytest.mark.parametrize("column", ["expires_at", "revoked_at"])
+def test_expired_or_revoked_tokens_are_rejected_without_revoking_the_family(db, column):
+    user, tokens = _login(db)
+    sibling = AuthService.generate_tokens(db, user, family_id=_family(db)[0].family_id)
+    past = datetime.utcnow() - timedelta(minutes=1)
+    db.execute(update(RefreshToken).where(RefreshToken.id == _family(db)[0].id).values({column: past}))
+    db.commit()
+    
+    with pytest.raises(AuthenticationException):
+        AuthService.refresh_tokens(db, tokens.refresh_token)
+    
+    assert _family(db)[1].revoked_at is None
+    AuthService.refresh_tokens(db, sibling.refresh_token)
+
+
+def test_refresh_token_without_jti_is_rejected(db):
+    user = make_users(db, 1)[0]
+    legacy = create_refresh_token({"sub": str(user.id)})
+    
+    with count_statements() as stats:
+        with pytest.raises(AuthenticationException):
+            AuthService.refresh_tokens(db, legacy)
+    
+    assert stats.queries == 0
+
+
+def test_async_refresh_rotates_and_detects_replay(db):
+    user, tokens = _login(db)
+    
+    async def rotate_then_replay(session):
+        rotated = await AsyncAuthService.refresh_tokens(session, tokens.refresh_token)
+        with pytest.raises(AuthenticationException):
+            await AsyncAuthService.refresh_tokens(session, tokens.refresh_token)
+        return rotated
+    
+    rotated = run_with_async_session(rotate_then_replay)
+    
+    assert rotated.refresh_token != tokens.refresh_token
+    db.expire_all()
+    rows = _family(db)
+    assert len(rows) == 2
+    assert all(row.revoked_at is not None for row in rows)
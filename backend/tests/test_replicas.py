@@ -0,0 +1,131 @@
+"""
+Tests for read replica routing and failover
+"""
+import sqlite3
+import pytest
+from sqlalchemy import event, text
+from app.core import database
+from app.core.admission import admission_controllers
+from app.core.database import Base, SessionLocal, _create_replica_engine
+from app.core.db_instrumentation import TimedReplicaQueuePool
+from app.core.exceptions import DatabaseException
+from app.core.metrics import db_pool_checkout_wait
+from app.core.replicas import ReplicaSet
+from app.models import User
+from app.services.base_service import BaseService
+from tests.conftest import make_users
+
+user_service = BaseService(User)
+
+
+@pytest.fixture
+def replica_url(tmp_path):
+    return f"sqlite:///{tmp_path}/replica.db"
+
+
+def _use_replicas(monkeypatch, *engines):
+    replica_set = ReplicaSet(engines, eject_seconds=30)
+    monkeypatch.setattr(database, "replicas", replica_set)
+    return replica_set
+
+
+def _make_replica(url, email):
+    """Replica engine holding one user with the given email"""
+    replica = _create_replica_engine(0, url)
+    Base.metadata.create_all(bind=replica)
+    with replica.begin() as connection:
+        connection.execute(
+            User.__table__.insert().values(
+                full_name="Replica", email=email, password_hash="x", role="STUDENT"
+            )
+        )
+    return replica
+
+
+def test_replica_engine_uses_timed_pool(replica_url):
+    replica = _create_replica_engine(3, replica_url)
+    waits = []
+    sync_controller = admission_controllers["sync"]
+    original_record_wait = sync_controller.record_wait
+    sync_controller.record_wait = waits.append
+    try:
+        before = db_pool_checkout_wait.labels("replica-3").snapshot()[1]
+        with replica.connect():
+            pass
+    finally:
+        sync_controller.record_wait = original_record_wait
+    
+    assert isinstance(replica.pool, TimedReplicaQueuePool)
+    assert replica.pool.metrics_label == "replica-3"
+    assert db_pool_checkout_wait.labels("replica-3").snapshot()[1] == before + 1
+    # Replica waits count against the sync engine's admission budget
+    assert len(waits) == 1
+
+
+def test_reads_go_to_the_replica(db, monkeypatch, replica_url):
+    make_users(db, 1)
+    _use_replicas(monkeypatch, _make_replica(replica_url, "replica@example.com"))
+    
+    session = SessionLocal()
+    try:
+        assert user_service.get_by_id(session, 1).email == "replica@example.com"
+        # Reads outside replica_reads() stay on the primary
+        assert session.get(User, 1).email == "user0@example.com"
+    finally:
+        session.close()
+
+
+def test_unreachable_replica_falls_back_to_primary(db, monkeypatch, tmp_path):
+    make_users(db, 1)
+    replica = _create_replica_engine(0, f"sqlite:///{tmp_path}/missing/replica.db")
+    replica_set = _use_replicas(monkeypatch, replica)
+    
+    session = SessionLocal()
+    try:
+        assert user_service.get_by_id(session, 1).email == "user0@example.com"
+        assert replica_set.is_ejected(replica)
+    finally:
+        session.close()
+
+
+def test_replica_disconnect_falls_back_and_session_can_still_commit(db, monkeypatch, replica_url):
+    make_users(db, 1)
+    replica = _make_replica(replica_url, "replica@example.com")
+    
+    @event.listens_for(replica, "do_execute")
+    def fail(*args):
+        raise sqlite3.OperationalError("server closed the connection unexpectedly")
+    
+    @event.listens_for(replica, "handle_error")
+    def treat_as_disconnect(context):
+        context.is_disconnect = True
+    
+    replica_set = _use_replicas(monkeypatch, replica)
+    session = SessionLocal()
+    try:
+        # Hold a replica connection in the transaction before it fails
+        session.connection(bind_arguments={"bind": replica})
+        user = user_service.get_by_id(session, 1)
+        assert user.email == "user0@example.com"
+        assert replica_set.is_ejected(replica)
+        
+        user_service.update(session, 1, {"full_name": "Renamed"})
+    finally:
+        session.close()
+    
+    assert db.scalar(text("SELECT full_name FROM users WHERE id = 1")) == "Renamed"
+
+
+def test_statement_errors_on_a_replica_are_not_retried(db, monkeypatch, replica_url):
+    make_users(db, 1)
+    # The replica has no tables, which is not a connection failure
+    replica = _create_replica_engine(0, replica_url)
+    replica_set = _use_replicas(monkeypatch, replica)
+    
+    session = SessionLocal()
+    try:
+        with pytest.raises(DatabaseException):
+            user_service.get_by_id(session, 1)
+        assert not replica_set.is_ejected(replica)
+    finally:
+        session.close()
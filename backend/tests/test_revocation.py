@@ -0,0 +1,107 @@
+"""
+Tests for the access token revocation list
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.core.database import engine
+from app.models import RevokedToken
+from app.services.auth_service import AuthService
+from app.services.revocation import SYNC_OVERLAP, RevocationList, revocation_list
+from tests.conftest import make_users
+
+
+def _list(capacity=1000):
+    return RevocationList(engine, capacity=capacity, error_rate=0.001, sync_interval=60)
+
+
+def _expiry(minutes=15):
+    return datetime.utcnow() + timedelta(minutes=minutes)
+
+
+def test_revoked_tokens_are_rejected_here_and_after_a_load(db):
+    user = make_users(db, 1)[0]
+    revocations = _list()
+    revocations.load()
+    
+    revocations.revoke(db, "revoked-jti", user.id, _expiry())
+    
+    assert revocations.is_revoked("revoked-jti")
+    assert not revocations.is_revoked("live-jti")
+    assert not revocations.is_revoked(None)
+    # Another worker sees it from the table
+    other = _list()
+    other.load()
+    assert other.is_revoked("revoked-jti")
+
+
+def test_revoking_twice_is_a_no_op(db):
+    user = make_users(db, 1)[0]
+    revocations = _list()
+    
+    revocations.revoke(db, "revoked-jti", user.id, _expiry())
+    revocations.revoke(db, "revoked-jti", user.id, _expiry())
+    
+    assert len(revocations) == 1
+    assert db.query(RevokedToken).count() == 1
+
+
+def test_sync_picks_up_rows_committed_late_within_the_overlap(db):
+    user = make_users(db, 1)[0]
+    revocations = _list()
+    revocations.revoke(db, "first-jti", user.id, _expiry())
+    revocations.load()
+    watermark = revocations._watermark
+    
+    def insert_row(jti, created_at):
+        db.execute(insert(RevokedToken).values(
+            jti=jti, user_id=user.id, expires_at=_expiry(), created_at=created_at
+        ))
+        db.commit()
+    
+    # Created before the watermark but committed after the load, like a slow transaction
+    insert_row("late-jti", watermark - SYNC_OVERLAP / 2)
+    insert_row("stale-jti", watermark - SYNC_OVERLAP * 2)
+    insert_row("new-jti", watermark + timedelta(seconds=1))
+    revocations.sync()
+    
+    assert revocations.is_revoked("late-jti")
+    assert revocations.is_revoked("new-jti")
+    # Older than the overlap: only the next full load picks it up
+    assert not revocations.is_revoked("stale-jti")
+    assert revocations._watermark == watermark + timedelta(seconds=1)
+
+
+def test_exceeding_capacity_rebuilds_without_expired_entries():
+    revocations = _list(capacity=10)
+    past = datetime.utcnow() - timedelta(minutes=1)
+    for i in range(5):
+        revocations.add(f"expired-{i}", past)
+    for i in range(5):
+        revocations.add(f"live-{i}", _expiry())
+    filter_at_capacity = revocations.bloom
+    assert len(revocations) == 10
+    
+    revocations.add("live-5", _expiry())
+    
+    assert revocations.bloom is not filter_at_capacity
+    assert len(revocations) == 6
+    assert revocations.bloom.count == 6
+    assert not revocations.is_revoked("expired-0")
+    
+    for i in range(6, 40):
+        revocations.add(f"live-{i}", _expiry())
+    
+    # Resized for twice the live entries once they outgrow the capacity
+    assert revocations.bloom.capacity >= 40
+    assert all(revocations.is_revoked(f"live-{i}") for i in range(40))
+
+
+def test_logout_of_a_token_without_jti_revokes_nothing(db):
+    user = make_users(db, 1)[0]
+    entries = len(revocation_list)
+    payload = {"sub": str(user.id), "exp": int(_expiry().timestamp()), "type": "access"}
+    
+    AuthService.logout(db, payload)
+    
+    assert db.query(RevokedToken).count() == 0
+    assert len(revocation_list) == entries
@@ -0,0 +1,44 @@
+"""
+Tests for connection budget settings
+"""
+import pytest
+from pydantic import ValidationError
+from app.config.settings import Settings
+
+
+def _settings(**values) -> Settings:
+    return Settings(DATABASE_URL="sqlite://", **values)
+
+
+def test_pool_limits_without_budget_use_pool_settings():
+    limits = _settings(DB_POOL_SIZE=5, DB_MAX_OVERFLOW=10).db_pool_limits
+    
+    assert limits == {"sync": (5, 10), "async": (5, 10)}
+
+
+@pytest.mark.parametrize("budget, workers", [(80, 4), (100, 3), (7, 1), (2, 1), (9, 4)])
+def test_pool_limits_stay_within_budget(budget, workers):
+    limits = _settings(DB_MAX_CONNECTIONS=budget, WEB_CONCURRENCY=workers).db_pool_limits
+    
+    per_worker = sum(limits["sync"]) + sum(limits["async"])
+    assert per_worker * workers <= budget
+    assert limits["sync"][0] >= 1 and limits["async"][0] >= 1
+
+
+def test_sync_engine_gets_most_of_the_budget():
+    limits = _settings(DB_MAX_CONNECTIONS=80, WEB_CONCURRENCY=4, DB_POOL_SIZE=5, DB_MAX_OVERFLOW=10).db_pool_limits
+    
+    # 20 per worker: 4 for the async engine, 16 for the sync engine, both at a 1:2 ratio
+    assert limits == {"sync": (5, 11), "async": (1, 3)}
+
+
+@pytest.mark.parametrize("values", [
+    {"DB_MAX_CONNECTIONS": 7, "WEB_CONCURRENCY": 4},
+    {"DB_MAX_CONNECTIONS": 1, "WEB_CONCURRENCY": 1},
+    {"WEB_CONCURRENCY": 0},
+    {"DB_ASYNC_POOL_SHARE": 0},
+    {"DB_ASYNC_POOL_SHARE": 1},
+])
+def test_impossible_budget_is_rejected(values):
+    with pytest.raises(ValidationError):
+        _settings(**values)
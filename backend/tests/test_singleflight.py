@@ -0,0 +1,162 @@
+"""
+Tests for single-flight coalescing and its use in get_by_id
+"""
+import asyncio
+import threading
+import time
+import pytest
+from sqlalchemy import event
+from app.core.database import AsyncSessionLocal, SessionLocal, engine, get_async_engine
+from app.models import User
+from app.services import base_service
+from app.services.base_service import AsyncBaseService, BaseService
+from app.utils.singleflight import SingleFlight
+from tests.conftest import make_users
+
+ORIGINAL_NAME = "User 0"
+LEADER_CHANGE = "Leader's unsaved change"
+
+
+def test_do_shares_one_call_between_threads():
+    flight = SingleFlight("test_threads")
+    calls, results = [], []
+    
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+    
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fn))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 9
+    assert {result for result, _ in results} == {"value"}
+    assert flight.calls == 10 and flight.shared == 9
+
+
+def test_do_shares_the_exception_and_forgets_the_call():
+    flight = SingleFlight("test_errors")
+    
+    def fail():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    # Nothing is cached; the next call runs again
+    assert flight.do("key", lambda: 1) == (1, False)
+
+
+def test_do_async_shares_one_call_and_survives_a_cancelled_follower():
+    flight = SingleFlight("test_async")
+    calls = []
+    
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+    
+    async def main():
+        leader = asyncio.create_task(flight.do_async("key", fn))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(flight.do_async("key", fn))
+        follower = asyncio.create_task(flight.do_async("key", fn))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await leader, await follower
+    
+    assert asyncio.run(main()) == (("value", False), ("value", True))
+    assert len(calls) == 1
+
+
+class _LeaderMutatesFirst:
+    """Flight wrapper holding followers back until the leader has changed its instance"""
+    
+    def __init__(self, flight: SingleFlight):
+        self.flight = flight
+        self.leader_mutated = threading.Event()
+        self.local = threading.local()
+    
+    def do(self, key, fn):
+        result, shared = self.flight.do(key, fn)
+        self.local.leader = not shared
+        if shared:
+            assert self.leader_mutated.wait(5)
+        return result, shared
+    
+    async def do_async(self, key, fn):
+        # The leader's caller runs on before followers resume, so no wait is needed
+        return await self.flight.do_async(key, fn)
+
+
+@pytest.fixture
+def slow_queries():
+    """Slow every statement down so concurrent callers join one flight"""
+    def slow(*args):
+        time.sleep(0.1)
+    
+    event.listen(engine, "before_cursor_execute", slow)
+    yield
+    event.remove(engine, "before_cursor_execute", slow)
+
+
+def test_followers_get_their_own_clean_copy_when_the_leader_mutates(db, monkeypatch, slow_queries):
+    make_users(db, 1)
+    flight = _LeaderMutatesFirst(SingleFlight("test_get_by_id"))
+    monkeypatch.setattr(base_service, "get_by_id_flight", flight)
+    service = BaseService(User)
+    followers, errors = [], []
+    
+    def call():
+        session = SessionLocal()
+        try:
+            user = service.get_by_id(session, 1)
+            if flight.local.leader:
+                user.full_name = LEADER_CHANGE
+                flight.leader_mutated.set()
+            else:
+                followers.append((user.full_name, user in session, session.is_modified(user)))
+                user.full_name = "Follower's own change"
+                session.flush()
+        except Exception as e:
+            errors.append(e)
+            flight.leader_mutated.set()
+        finally:
+            session.close()
+    
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert flight.flight.shared == 9
+    assert followers == [(ORIGINAL_NAME, True, False)] * 9
+
+
+def test_async_followers_get_their_own_clean_copy_when_the_leader_mutates(db, monkeypatch):
+    make_users(db, 1)
+    flight = _LeaderMutatesFirst(SingleFlight("test_async_get_by_id"))
+    monkeypatch.setattr(base_service, "get_by_id_flight", flight)
+    service = AsyncBaseService(User)
+    
+    async def call():
+        async with AsyncSessionLocal() as session:
+            user = await service.get_by_id(session, 1)
+            seen = (user.full_name, user in session, session.is_modified(user))
+            # Every caller changes its instance as soon as it has it
+            user.full_name = LEADER_CHANGE
+            return seen
+    
+    async def main():
+        try:
+            return await asyncio.gather(*[call() for _ in range(10)])
+        finally:
+            await get_async_engine().dispose()
+    
+    assert asyncio.run(main()) == [(ORIGINAL_NAME, True, False)] * 10
+    assert flight.flight.shared == 9
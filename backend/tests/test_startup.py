@@ -0,0 +1,43 @@
+"""
+Tests for startup schema checks and the init-db command
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app.config import settings
+from app.core.database import Base, check_schema, engine, get_missing_tables, schema_version
+from app.core.exceptions import DatabaseException
+from app.main import app
+from app.manage import main
+
+
+@pytest.fixture
+def empty_database():
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_startup_fails_fast_without_tables(empty_database):
+    with pytest.raises(DatabaseException, match="revoked_tokens.*app.manage init-db"):
+        with TestClient(app):
+            pass
+
+
+def test_init_db_command_creates_the_tables_and_startup_succeeds(empty_database):
+    assert main(["init-db"]) == 0
+    
+    assert get_missing_tables() == []
+    assert check_schema() is True
+    with TestClient(app) as client:
+        assert client.get(f"{settings.API_V1_PREFIX}/health/live").status_code == 200
+
+
+def test_changed_models_with_existing_tables_only_warn(empty_database, caplog):
+    main(["init-db"])
+    with engine.begin() as connection:
+        connection.execute(update(schema_version).values(fingerprint="outdated"))
+    
+    assert check_schema() is False
+    assert "app.manage init-db" in caplog.text
+    
+    assert main(["init-db", "--force"]) == 0
+    assert check_schema() is True
@@ -38,7 +38,6 @@ interface FormErrors {
 const roleOptions: DropdownOption[] = [
   { label: 'Student', value: 'student' },
   { label: 'Mentor', value: 'mentor' },
-  { label: 'Admin', value: 'admin' },
 ];
 
 export default function SignUpScreen() {